@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""Microbenchmarks for individual html2latex pipeline stages.
+
+Each case builds its input once and then times a single pipeline stage so
+regressions in one stage are not hidden by the cost of the others.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import tempfile
+from base64 import b64encode
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from html2latex.adapters import parse_html
+from html2latex.api import Converter
+from html2latex.ast import HtmlDocument, HtmlElement, HtmlText
+from html2latex.latex import serialize_document
+from html2latex.pipeline import (
+    convert_document,
+    convert_incremental,
+    convert_parallel,
+    extract_assets,
+    normalize_document,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+_PRESERVE = {"pre"}
+
+_WORDS = (
+    "lorem",
+    "ipsum",
+    "dolor",
+    "sit",
+    "amet",
+    "consectetur",
+    "adipiscing",
+    "elit",
+    "sed",
+    "do",
+    "eiusmod",
+    "tempor",
+)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, math.ceil((pct / 100) * len(ordered)) - 1)
+    return ordered[index]
+
+
+def _prose(size: int) -> str:
+    words: list[str] = []
+    length = 0
+    index = 0
+    while length < size:
+        word = _WORDS[index % len(_WORDS)]
+        words.append(word)
+        length += len(word) + 1
+        index += 1
+    return " ".join(words)
+
+
+def _parse(html: str) -> HtmlDocument:
+    document, _ = parse_html(html)
+    return document
+
+
+def prose_paragraphs_html(total_bytes: int = 1_000_000, paragraphs: int = 10_000) -> str:
+    """About ``total_bytes`` of prose split into ``paragraphs`` paragraphs."""
+    sentence = _prose(total_bytes // paragraphs - len("<p></p>\n"))
+    return "".join(f"<p>{sentence}</p>\n" for _ in range(paragraphs))
+
+
+def bench_normalize_prose() -> Callable[[], object]:
+    document = _parse(prose_paragraphs_html())
+    return lambda: normalize_document(document, preserve_whitespace_tags=_PRESERVE)
+
+
+def bench_normalize_prose_messy() -> Callable[[], object]:
+    # Same corpus with editor-style indentation that actually needs collapsing.
+    html = prose_paragraphs_html().replace(" ", "  \n    ")
+    document = _parse(html)
+    return lambda: normalize_document(document, preserve_whitespace_tags=_PRESERVE)
+
+
+def wide_inline_html(spans: int = 100_000) -> str:
+    """One paragraph with ``spans`` sibling inline elements separated by whitespace."""
+    parts = [f"<span>w{index}</span>{' ' if index % 2 else chr(10)}" for index in range(spans)]
+    return f"<p>{''.join(parts)}</p>"
+
+
+def bench_normalize_wide_inline() -> Callable[[], object]:
+    document = _parse(wide_inline_html())
+    return lambda: normalize_document(document, preserve_whitespace_tags=_PRESERVE)
+
+
+_TAG_DIVERSE_BLOCK = """
+<h2>Title {index}</h2>
+<p>a <b>b</b> <i>c</i> <u>d</u> <code>e</code> <span>f</span> <small>g</small> <mark>h</mark>
+<a href="https://example.com">l</a> <q>q</q> <sup>1</sup> <kbd>k</kbd> <abbr>ab</abbr>
+<custom-tag>z</custom-tag></p>
+<ul><li>x</li><li>y</li></ul><ol><li>x</li></ol><dl><dt>t</dt><dd>d</dd></dl>
+<blockquote><p>q</p></blockquote><pre>x</pre><hr>
+<figure><img src="a.png"><figcaption>c</figcaption></figure>
+<table><tr><td>a</td><td>b</td></tr></table>
+<section><article><div>d</div></article></section><center>c</center>
+"""
+
+
+def bench_convert_tag_diverse() -> Callable[[], object]:
+    # Every block exercises ~35 distinct tags, including the generic fallback.
+    # Block text varies so no subtree repeats at the top level.
+    html = "".join(_TAG_DIVERSE_BLOCK.format(index=index) for index in range(2_000))
+    document = normalize_document(_parse(html), preserve_whitespace_tags=_PRESERVE)
+    return lambda: convert_document(document)
+
+
+_REPEATED_BLOCK = """
+<p style="text-align: center"><strong>Confidential</strong> - do not distribute</p>
+<table>
+  <tr><th>Signed</th><th>Date</th></tr>
+  <tr><td>Jane Doe, <em>Director</em></td><td align="right">2024-01-01</td></tr>
+</table>
+<h3><span style="font-weight: 700">Disclaimer</span></h3>
+<ul><li>Terms &amp; conditions apply.</li><li>See <a href="https://example.com">site</a>.</li></ul>
+"""
+
+
+def repeated_blocks_html(blocks: int = 10_000) -> str:
+    """Templated output: ``blocks`` copies of one disclaimer/signature block."""
+    return _REPEATED_BLOCK * blocks
+
+
+def bench_convert_repeated_blocks() -> Callable[[], object]:
+    document = normalize_document(
+        _parse(repeated_blocks_html()), preserve_whitespace_tags=_PRESERVE
+    )
+    return lambda: convert_document(document)
+
+
+def bench_serialize_repeated_blocks() -> Callable[[], object]:
+    document = normalize_document(
+        _parse(repeated_blocks_html()), preserve_whitespace_tags=_PRESERVE
+    )
+    latex = convert_document(document)
+    return lambda: serialize_document(latex, formatted=True)
+
+
+def bench_serialize_prose() -> Callable[[], object]:
+    document = normalize_document(
+        _parse(prose_paragraphs_html()), preserve_whitespace_tags=_PRESERVE
+    )
+    latex = convert_document(document)
+    return lambda: serialize_document(latex, formatted=True)
+
+
+def bench_serialize_prose_ascii_latex() -> Callable[[], object]:
+    # Compare with serialize/prose-...: ASCII text takes the fast path.
+    document = normalize_document(
+        _parse(prose_paragraphs_html()), preserve_whitespace_tags=_PRESERVE
+    )
+    latex = convert_document(document)
+    return lambda: serialize_document(latex, formatted=True, encoding="ascii-latex")
+
+
+def bench_end_to_end_repeated_blocks() -> Callable[[], object]:
+    html = repeated_blocks_html()
+    converter = Converter()
+    return lambda: converter.convert(html)
+
+
+_EDITOR_STYLES = (
+    "font-weight: 700;",
+    "font-style: italic;",
+    "text-decoration: underline;",
+    "font-weight: 700; font-style: italic;",
+    "text-align: center;",
+)
+
+
+def styled_spans_html(paragraphs: int = 5_000, spans: int = 20) -> str:
+    """WYSIWYG-style output: every run of text wrapped in a styled span."""
+    parts = []
+    for index in range(paragraphs):
+        runs = "".join(
+            f'<span style="{_EDITOR_STYLES[(index + run) % len(_EDITOR_STYLES)]}">w{index}.{run}</span> '
+            for run in range(spans)
+        )
+        parts.append(f'<p style="{_EDITOR_STYLES[index % len(_EDITOR_STYLES)]}">{runs}</p>')
+    return "".join(parts)
+
+
+def bench_convert_styled_spans() -> Callable[[], object]:
+    document = normalize_document(_parse(styled_spans_html()), preserve_whitespace_tags=_PRESERVE)
+    return lambda: convert_document(document)
+
+
+_QUILL_CLASSES = (
+    "ql-size-large",
+    "ql-font-serif ql-size-small",
+    "ql-align-center ql-direction-rtl",
+    "ql-indent-1 ql-font-monospace",
+    "ql-cursor",
+)
+
+
+def quill_spans_html(paragraphs: int = 5_000, spans: int = 20) -> str:
+    """Quill-style output: every run of text carries one or more ``ql-*`` classes."""
+    parts = []
+    for index in range(paragraphs):
+        runs = "".join(
+            f'<span class="{_QUILL_CLASSES[(index + run) % len(_QUILL_CLASSES)]}">'
+            f"w{index}.{run}</span> "
+            for run in range(spans)
+        )
+        parts.append(f'<p class="{_QUILL_CLASSES[index % len(_QUILL_CLASSES)]}">{runs}</p>')
+    return "".join(parts)
+
+
+def bench_convert_quill_spans() -> Callable[[], object]:
+    document = normalize_document(_parse(quill_spans_html()), preserve_whitespace_tags=_PRESERVE)
+    return lambda: convert_document(document)
+
+
+def wide_table_html(rows: int = 10_000, columns: int = 50) -> str:
+    """One table with ``rows`` x ``columns`` cells, some aligned or spanning."""
+    parts = ["<table>"]
+    for row in range(rows):
+        cells = []
+        col = 0
+        while col < columns:
+            if row % 10 == 0 and col % 10 == 0:
+                cells.append(f'<td rowspan="2" style="text-align: right">{row}.{col}</td>')
+            elif row % 7 == 0 and col == 20:
+                cells.append(f'<td colspan="2" align="center">{row}.{col}</td>')
+                col += 1
+            elif row % 10 == 1 and col % 10 == 0:
+                pass  # covered by the rowspan above
+            else:
+                cells.append(f"<td>{row}.{col}</td>")
+            col += 1
+        parts.append(f"<tr>{''.join(cells)}</tr>")
+    parts.append("</table>")
+    return "".join(parts)
+
+
+def bench_convert_wide_table() -> Callable[[], object]:
+    document = normalize_document(_parse(wide_table_html()), preserve_whitespace_tags=_PRESERVE)
+    return lambda: convert_document(document)
+
+
+def bench_parallel_prose() -> Callable[[], object]:
+    # Convert + serialize on every core; compare with workers=1 for the speedup.
+    html = prose_paragraphs_html(total_bytes=10_000_000, paragraphs=20_000)
+    document = normalize_document(_parse(html), preserve_whitespace_tags=_PRESERVE)
+    return lambda: convert_parallel(document)
+
+
+def nested_pre_document(total_bytes: int = 10_000_000, depth: int = 500) -> HtmlDocument:
+    """One ``<pre>`` with ``depth`` nested spans, text at every level."""
+    line = _prose(total_bytes // depth // 2) + "\n"
+    node = HtmlElement(tag="span", children=(HtmlText(text=line),))
+    for _ in range(depth - 1):
+        node = HtmlElement(tag="span", children=(HtmlText(text=line), node, HtmlText(text=line)))
+    return HtmlDocument(children=(HtmlElement(tag="pre", children=(node,)),))
+
+
+def bench_convert_nested_pre() -> Callable[[], object]:
+    # Built directly: the nesting is deeper than the parser is meant to handle.
+    document = nested_pre_document()
+    return lambda: convert_document(document)
+
+
+_FORMULAS = (
+    (
+        "<mi>x</mi><mo>=</mo><mfrac><mrow><mo>-</mo><mi>b</mi><mo>&pm;</mo><msqrt><msup><mi>b</mi>"
+        "<mn>2</mn></msup><mo>-</mo><mn>4</mn><mi>a</mi><mi>c</mi></msqrt></mrow><mrow><mn>2</mn>"
+        "<mi>a</mi></mrow></mfrac>"
+    ),
+    (
+        "<munderover><mo>&sum;</mo><mrow><mi>i</mi><mo>=</mo><mn>1</mn></mrow><mi>n</mi></munderover>"
+        "<msubsup><mi>x</mi><mi>i</mi><mn>{n}</mn></msubsup>"
+    ),
+    (
+        "<msup><mi>e</mi><mrow><mi>i</mi><mi>&theta;</mi></mrow></msup><mo>=</mo><mi>cos</mi>"
+        "<mi>&theta;</mi><mo>+</mo><mi>i</mi><mi>sin</mi><mi>&theta;</mi>"
+    ),
+    "<mover><mi>v</mi><mo>&rarr;</mo></mover><mo>&sdot;</mo><msub><mi>w</mi><mn>{n}</mn></msub>",
+)
+
+
+def mathml_formulas_html(paragraphs: int = 2_000, formulas: int = 10) -> str:
+    """Formula-dense output: MathML in every sentence, drawn from four shapes."""
+    parts = []
+    for index in range(paragraphs):
+        runs = "".join(
+            f"Step {index}.{run}: <math>"
+            f"{_FORMULAS[(index + run) % len(_FORMULAS)].replace('{n}', str(run % 3))}</math>. "
+            for run in range(formulas)
+        )
+        parts.append(f"<p>{runs}</p>")
+    return "".join(parts)
+
+
+def bench_convert_mathml_formulas() -> Callable[[], object]:
+    document = normalize_document(
+        _parse(mathml_formulas_html()), preserve_whitespace_tags=_PRESERVE
+    )
+    return lambda: convert_document(document)
+
+
+def bench_incremental_prose_one_edit() -> Callable[[], object]:
+    # An autosave: one paragraph of a 10k-paragraph document changed since
+    # the previous conversion. Compare with convert/... for a full re-run.
+    html = prose_paragraphs_html()
+    document = normalize_document(_parse(html), preserve_whitespace_tags=_PRESERVE)
+    previous = convert_incremental(document, formatted=True)
+    edited = normalize_document(
+        _parse(html.replace("lorem", "LOREM", 1)), preserve_whitespace_tags=_PRESERVE
+    )
+    return lambda: convert_incremental(edited, previous, formatted=True)
+
+
+def data_uri_images_html(images: int = 16, size: int = 3_000_000) -> str:
+    """Pasted screenshots: ``images`` distinct base64 images, each pasted twice."""
+    uris = ["data:image/png;base64," + b64encode(os.urandom(size)).decode() for _ in range(images)]
+    return "".join(f'<p>Figure {i}</p><img src="{uri}">' for i, uri in enumerate(uris * 2))
+
+
+def bench_assets_data_uri_images() -> Callable[[], object]:
+    document = normalize_document(
+        _parse(data_uri_images_html()), preserve_whitespace_tags=_PRESERVE
+    )
+    directory = tempfile.mkdtemp(prefix="html2latex-bench-")
+    return lambda: extract_assets((document,), directory)
+
+
+CASES: dict[str, Callable[[], Callable[[], object]]] = {
+    "normalize/prose-1mb-10k-paragraphs": bench_normalize_prose,
+    "normalize/prose-1mb-10k-paragraphs-messy": bench_normalize_prose_messy,
+    "normalize/wide-inline-100k-spans": bench_normalize_wide_inline,
+    "convert/tag-diverse-2k-blocks": bench_convert_tag_diverse,
+    "convert/repeated-10k-blocks": bench_convert_repeated_blocks,
+    "convert/table-10k-rows-50-cols": bench_convert_wide_table,
+    "convert/styled-spans-100k": bench_convert_styled_spans,
+    "convert/quill-class-spans-100k": bench_convert_quill_spans,
+    "convert/nested-pre-10mb-depth-500": bench_convert_nested_pre,
+    "convert/mathml-formulas-20k": bench_convert_mathml_formulas,
+    "assets/data-uri-16x3mb-images": bench_assets_data_uri_images,
+    "serialize/repeated-10k-blocks": bench_serialize_repeated_blocks,
+    "serialize/prose-1mb-10k-paragraphs": bench_serialize_prose,
+    "serialize/prose-1mb-10k-paragraphs-ascii-latex": bench_serialize_prose_ascii_latex,
+    "parallel/prose-10mb-20k-paragraphs": bench_parallel_prose,
+    "incremental/prose-1mb-one-edit": bench_incremental_prose_one_edit,
+    "end-to-end/repeated-10k-blocks": bench_end_to_end_repeated_blocks,
+}
+
+
+def measure(func: Callable[[], object], repeats: int) -> list[float]:
+    timings = []
+    for _ in range(repeats):
+        start = perf_counter()
+        func()
+        timings.append((perf_counter() - start) * 1000)
+    return timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--case", action="append", default=[], help="Case name prefix filter.")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for name, factory in CASES.items():
+        if args.case and not any(name.startswith(prefix) for prefix in args.case):
+            continue
+        func = factory()
+        timings = measure(func, args.repeat)
+        mean_ms = sum(timings) / len(timings)
+        record = {
+            "case": name,
+            "mean_ms": round(mean_ms, 3),
+            "p95_ms": round(percentile(timings, 95), 3),
+        }
+        print(json.dumps(record))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
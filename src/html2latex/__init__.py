@@ -20,12 +20,13 @@ from __future__ import annotations
 
 from .api import Converter, convert
 from .html2latex import html2latex, render
-from .models import ConvertOptions, LatexDocument
+from .models import ConvertOptions, LatexDocument, SplitDocument
 
 __all__ = [
     "ConvertOptions",
     "Converter",
     "LatexDocument",
+    "SplitDocument",
     "convert",
     "html2latex",
     "render",
@@ -13,46 +13,100 @@ conversion process, instantiate a Converter with ConvertOptions.
 
 from __future__ import annotations
 
+import random
 from dataclasses import replace
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING
 
 from .adapters.justhtml_adapter import parse_html
+from .ast import HtmlDocument
 from .diagnostics import diagnostic_context, enforce_strict, extend_diagnostics
+from .jinja import render_document
 from .latex import infer_packages, serialize_document
-from .models import ConvertOptions, LatexDocument
-from .pipeline import convert_document, normalize_document
+from .models import ConvertOptions, LatexDocument, SplitDocument
+from .pipeline import (
+    convert_document,
+    convert_incremental,
+    convert_parallel,
+    default_handlers,
+    extract_assets,
+    normalize_document,
+    validate_normalized,
+    write_parts,
+)
+from .styles import CLASS_PROFILES
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping, Sequence
+
+    from .pipeline import ConvertedBlock, SplitPart, TagHandler
+    from .styles import ClassProfile
 
 __all__ = [
     "Converter",
     "convert",
 ]
 
+_PRESERVE_WHITESPACE_TAGS = {"pre"}
+
 
 class Converter:
     """Stateful HTML to LaTeX converter with configurable options.
 
     The Converter class provides a reusable converter instance that maintains
     diagnostics from the last conversion. Use with_options() to create a new
-    converter with modified settings.
+    converter with modified settings, and register_handler() to add or
+    override how individual HTML tags are converted.
 
     Attributes:
         options: The ConvertOptions used for conversion.
         diagnostics: Tuple of DiagnosticEvent from the last conversion.
     """
 
-    def __init__(self, options: ConvertOptions | None = None) -> None:
+    def __init__(
+        self,
+        options: ConvertOptions | None = None,
+        *,
+        handlers: Mapping[str, TagHandler] | None = None,
+    ) -> None:
         """Initialize a new Converter with the given options.
 
         Args:
             options: Conversion options. If None, uses default ConvertOptions.
+            handlers: Optional tag handlers (tag name -> handler) that add to or
+                override the built-in ones for this converter.
         """
         self.options = options or ConvertOptions()
         self.diagnostics: tuple = ()
+        self._handlers: dict[str, TagHandler] | None = None
+        for tag, handler in (handlers or {}).items():
+            self.register_handler(tag, handler)
 
-    def convert(self, html: str | bytes) -> LatexDocument:
+    def register_handler(self, tag: str, handler: TagHandler) -> None:
+        """Register a handler for an HTML tag on this converter.
+
+        The handler is called as ``handler(node, context)`` for every element
+        with that tag and returns the LaTeX nodes to emit; use
+        ``html2latex.pipeline.convert_nodes(node.children, context)`` to convert
+        the element's children.
+        Built-in handlers for the same tag are replaced.
+
+        Args:
+            tag: HTML tag name (case-insensitive).
+            handler: Callable converting the element to LaTeX nodes.
+        """
+        if self._handlers is None:
+            self._handlers = default_handlers()
+        self._handlers[tag.lower()] = handler
+
+    def convert(self, html: str | bytes | HtmlDocument) -> LatexDocument:
         """Convert HTML to a LatexDocument.
 
         Args:
-            html: HTML content as string or bytes.
+            html: HTML content as string or bytes, or an already parsed
+                HtmlDocument (e.g. a cached tree). Documents flagged as
+                normalized skip the normalize stage.
 
         Returns:
             LatexDocument containing the converted body, preamble, packages,
@@ -61,17 +115,115 @@ class Converter:
         Raises:
             DiagnosticsError: If strict mode is enabled and errors are found.
         """
-        with diagnostic_context(enabled=True) as events:
-            document, parse_events = parse_html(
-                html,
-                fragment=self.options.fragment,
-                strict=False,
+        return self._convert(html, self._convert_body)
+
+    def convert_incremental(
+        self,
+        html: str | bytes | HtmlDocument,
+        previous: LatexDocument | None = None,
+    ) -> LatexDocument:
+        """Convert an edited version of a document, reusing unchanged blocks.
+
+        Meant for editors that re-convert on every save: top-level blocks
+        whose normalized HTML (and the document-wide styles and link targets
+        they depend on) are unchanged since ``previous`` reuse its LaTeX and
+        packages, so the conversion work tracks the size of the edit. The
+        result is the same as ``convert(html)`` and can be passed as
+        ``previous`` to the next call. Blocks are converted in the calling
+        thread whatever ``options.workers`` says.
+
+        Args:
+            html: HTML content as string or bytes, or a parsed HtmlDocument.
+            previous: The result of an earlier ``convert_incremental`` call
+                with the same options; None (or any other result) converts
+                every block.
+
+        Returns:
+            LatexDocument as returned by ``convert``, also holding the
+            per-block results later calls reuse.
+
+        Raises:
+            DiagnosticsError: If strict mode is enabled and errors are found.
+        """
+        reusable = () if previous is None else previous.blocks
+        return self._convert(html, partial(self._convert_blocks, previous=reusable))
+
+    def convert_split(
+        self,
+        html: str | bytes | HtmlDocument,
+        directory: str | Path,
+        *,
+        level: int = 1,
+        include_only: Sequence[str] | None = None,
+        master: str = "main",
+    ) -> SplitDocument:
+        r"""Convert HTML into one ``.tex`` file per part plus a master file.
+
+        Parts start at top-level headings down to ``<h{level}>`` and are
+        stream-converted straight to disk, so memory for the LaTeX output is
+        bounded by one part (see ``html2latex.pipeline.write_parts``). The
+        master file is rendered with the configured template; its preamble
+        loads the packages of every part and its body ``\include``\s the
+        parts in order.
+
+        Args:
+            html: HTML content as string or bytes, or a parsed HtmlDocument.
+            directory: Directory for the part and master files.
+            level: Deepest heading level that starts a new part.
+            include_only: Part names for an ``\includeonly`` line in the
+                master preamble, to recompile only those parts; None
+                includes every part.
+            master: File name of the master file, without ``.tex``.
+
+        Returns:
+            SplitDocument with the master path, the parts and their
+            packages, and any diagnostics emitted during conversion.
+
+        Raises:
+            DiagnosticsError: If strict mode is enabled and errors are found.
+        """
+        parts: list[SplitPart] = []
+        result = self._convert(
+            html, partial(self._write_parts, directory=directory, level=level, parts=parts)
+        )
+        preamble = result.preamble
+        if include_only is not None:
+            preamble = "\n".join(
+                filter(None, (preamble, f"\\includeonly{{{','.join(include_only)}}}"))
             )
-            extend_diagnostics(parse_events)
-            normalized = normalize_document(document, preserve_whitespace_tags={"pre"})
-            latex_ast = convert_document(normalized)
-            body = serialize_document(latex_ast, formatted=self.options.formatted)
-            packages = tuple(sorted(infer_packages(latex_ast)))
+        master_path = Path(directory) / f"{master}.tex"
+        master_path.write_text(
+            render_document(result.body, preamble=preamble, template=self.options.template),
+            encoding="utf-8",
+        )
+        return SplitDocument(
+            master=master_path,
+            parts=tuple(parts),
+            packages=result.packages,
+            diagnostics=result.diagnostics,
+        )
+
+    def _convert(
+        self,
+        html: str | bytes | HtmlDocument,
+        convert_body: Callable[
+            [HtmlDocument], tuple[str, tuple[str, ...], tuple[ConvertedBlock, ...]]
+        ],
+    ) -> LatexDocument:
+        with diagnostic_context(enabled=True) as events:
+            if isinstance(html, HtmlDocument):
+                document = html
+            else:
+                document, parse_events = parse_html(
+                    html,
+                    fragment=self.options.fragment,
+                    strict=False,
+                )
+                extend_diagnostics(parse_events)
+            normalized = self._normalize(document)
+            if self.options.asset_dir is not None:
+                (normalized,) = extract_assets((normalized,), self.options.asset_dir)
+            body, packages, blocks = convert_body(normalized)
             preamble = _build_preamble(packages, self.options.metadata)
             if self.options.strict:
                 enforce_strict(events)
@@ -80,10 +232,97 @@ class Converter:
                 preamble=preamble,
                 packages=packages,
                 diagnostics=tuple(events),
+                blocks=blocks,
             )
         self.diagnostics = result.diagnostics
         return result
 
+    def _normalize(self, document: HtmlDocument) -> HtmlDocument:
+        if not (document.normalized or self.options.assume_normalized):
+            return normalize_document(document, preserve_whitespace_tags=_PRESERVE_WHITESPACE_TAGS)
+        if __debug__ and _sampled(self.options.debug_normalize_sample):
+            return validate_normalized(document, preserve_whitespace_tags=_PRESERVE_WHITESPACE_TAGS)
+        return document
+
+    def _convert_body(
+        self, document: HtmlDocument
+    ) -> tuple[str, tuple[str, ...], tuple[ConvertedBlock, ...]]:
+        if self.options.workers > 1:
+            body, package_set = convert_parallel(
+                document,
+                handlers=self._handlers,
+                longtable_threshold=self._longtable_threshold(),
+                class_profiles=self._class_profiles(),
+                image_root=self.options.image_root,
+                encoding=self.options.output_encoding,
+                formatted=self.options.formatted,
+                workers=self.options.workers,
+            )
+            return body, tuple(sorted(package_set)), ()
+        latex_ast = convert_document(
+            document,
+            handlers=self._handlers,
+            longtable_threshold=self._longtable_threshold(),
+            class_profiles=self._class_profiles(),
+            image_root=self.options.image_root,
+        )
+        body = serialize_document(
+            latex_ast, formatted=self.options.formatted, encoding=self.options.output_encoding
+        )
+        return body, tuple(sorted(infer_packages(latex_ast))), ()
+
+    def _convert_blocks(
+        self, document: HtmlDocument, *, previous: tuple[ConvertedBlock, ...]
+    ) -> tuple[str, tuple[str, ...], tuple[ConvertedBlock, ...]]:
+        blocks = convert_incremental(
+            document,
+            previous,
+            handlers=self._handlers,
+            longtable_threshold=self._longtable_threshold(),
+            class_profiles=self._class_profiles(),
+            image_root=self.options.image_root,
+            encoding=self.options.output_encoding,
+            formatted=self.options.formatted,
+        )
+        body = "".join(block.latex for block in blocks)
+        packages: set[str] = set()
+        for block in blocks:
+            packages |= block.packages
+        return (body.rstrip() if self.options.formatted else body), tuple(sorted(packages)), blocks
+
+    def _write_parts(
+        self, document: HtmlDocument, *, directory: str | Path, level: int, parts: list[SplitPart]
+    ) -> tuple[str, tuple[str, ...], tuple[ConvertedBlock, ...]]:
+        parts.extend(
+            write_parts(
+                document,
+                directory,
+                level=level,
+                handlers=self._handlers,
+                longtable_threshold=self._longtable_threshold(),
+                class_profiles=self._class_profiles(),
+                image_root=self.options.image_root,
+                formatted=self.options.formatted,
+                encoding=self.options.output_encoding,
+            )
+        )
+        body = "\n".join(f"\\include{{{part.name}}}" for part in parts)
+        packages: set[str] = set()
+        for part in parts:
+            packages |= part.packages
+        return body, tuple(sorted(packages)), ()
+
+    def _longtable_threshold(self) -> int | None:
+        strategy = self.options.table_strategy
+        if strategy == "longtable":
+            return 0
+        if strategy == "auto":
+            return self.options.longtable_threshold
+        return None
+
+    def _class_profiles(self) -> tuple[ClassProfile, ...]:
+        return tuple(CLASS_PROFILES[name] for name in self.options.class_profiles)
+
     def with_options(self, **changes: object) -> Converter:
         """Create a new Converter with modified options.
 
@@ -91,13 +330,17 @@ class Converter:
             **changes: Option attributes to override.
 
         Returns:
-            New Converter instance with updated options.
+            New Converter instance with updated options and the same tag handlers.
         """
         options = replace(self.options, **changes)
-        return Converter(options=options)
+        return Converter(options=options, handlers=self._handlers)
 
 
-def convert(html: str | bytes, *, options: ConvertOptions | None = None) -> LatexDocument:
+def convert(
+    html: str | bytes | HtmlDocument,
+    *,
+    options: ConvertOptions | None = None,
+) -> LatexDocument:
     """Convert HTML to a LatexDocument.
 
     This is a convenience function that creates a Converter and performs the
@@ -105,7 +348,7 @@ def convert(html: str | bytes, *, options: ConvertOptions | None = None) -> Late
     prefer creating a Converter instance directly.
 
     Args:
-        html: HTML content as string or bytes.
+        html: HTML content as string or bytes, or a parsed HtmlDocument.
         options: Conversion options. If None, uses default ConvertOptions.
 
     Returns:
@@ -119,6 +362,12 @@ def convert(html: str | bytes, *, options: ConvertOptions | None = None) -> Late
     return converter.convert(html)
 
 
+def _sampled(rate: float) -> bool:
+    if rate <= 0:
+        return False
+    return rate >= 1 or random.random() < rate  # noqa: S311 - sampling, not security
+
+
 def _build_preamble(packages: tuple[str, ...], metadata: dict[str, object]) -> str:
     lines = [f"\\usepackage{{{package}}}" for package in packages]
     extra = metadata.get("preamble")
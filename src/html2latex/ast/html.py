@@ -33,10 +33,15 @@ class HtmlElement:
 
 @dataclass(config=ConfigDict(frozen=True))
 class HtmlDocument:
-    """The root document node of the HTML AST."""
+    """The root document node of the HTML AST.
+
+    ``normalized`` is set by ``normalize_document`` and travels with the tree
+    when it is cached or serialized, so trusted trees skip re-normalization.
+    """
 
     children: tuple[HtmlNode, ...]
     doctype: str | None = None
+    normalized: bool = False
 
 
 HtmlNode = HtmlElement | HtmlText
@@ -3,22 +3,43 @@ from .ast import (
     LatexDocumentAst,
     LatexEnvironment,
     LatexGroup,
+    LatexMultiColumn,
+    LatexMultiRow,
     LatexNode,
     LatexRaw,
+    LatexTableCell,
+    LatexTableRow,
+    LatexTabular,
     LatexText,
 )
-from .serialize import LatexSerializer, infer_packages, serialize_document, serialize_nodes
+from .serialize import (
+    LatexSerializer,
+    infer_packages,
+    serialize_document,
+    serialize_fragment,
+    serialize_nodes,
+    stream_tabular,
+)
+from .unicode import TRANSLITERATIONS
 
 __all__ = [
+    "TRANSLITERATIONS",
     "LatexCommand",
     "LatexDocumentAst",
     "LatexEnvironment",
     "LatexGroup",
+    "LatexMultiColumn",
+    "LatexMultiRow",
     "LatexNode",
     "LatexRaw",
     "LatexSerializer",
+    "LatexTableCell",
+    "LatexTableRow",
+    "LatexTabular",
     "LatexText",
     "infer_packages",
     "serialize_document",
+    "serialize_fragment",
     "serialize_nodes",
+    "stream_tabular",
 ]
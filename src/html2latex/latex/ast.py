@@ -12,8 +12,13 @@ __all__ = [
     "LatexDocumentAst",
     "LatexEnvironment",
     "LatexGroup",
+    "LatexMultiColumn",
+    "LatexMultiRow",
     "LatexNode",
     "LatexRaw",
+    "LatexTableCell",
+    "LatexTableRow",
+    "LatexTabular",
     "LatexText",
 ]
 
@@ -27,9 +32,10 @@ class LatexText:
 
 @dataclass(config=ConfigDict(frozen=True))
 class LatexRaw:
-    """A raw LaTeX node containing unescaped LaTeX code."""
+    """A raw LaTeX node containing unescaped LaTeX code and the packages it needs."""
 
     value: str
+    packages: tuple[str, ...] = ()
 
 
 @dataclass(config=ConfigDict(frozen=True))
@@ -58,6 +64,56 @@ class LatexEnvironment:
     options: tuple[str, ...] = ()
 
 
+@dataclass(config=ConfigDict(frozen=True))
+class LatexMultiColumn:
+    r"""A ``\multicolumn{span}{align}{...}`` cell spanning several columns."""
+
+    span: int
+    align: str = "l"
+    children: tuple[LatexNode, ...] = ()
+
+
+@dataclass(config=ConfigDict(frozen=True))
+class LatexMultiRow:
+    r"""A ``\multirow{span}{*}{...}`` cell spanning several rows (needs ``multirow``)."""
+
+    span: int
+    children: tuple[LatexNode, ...] = ()
+
+
+@dataclass(config=ConfigDict(frozen=True))
+class LatexTableCell:
+    """One cell of a table row; an empty cell is a placeholder for a spanned slot."""
+
+    children: tuple[LatexNode, ...] = ()
+
+
+@dataclass(config=ConfigDict(frozen=True))
+class LatexTableRow:
+    r"""A table row: cells joined by ``&`` and terminated by ``\\``."""
+
+    cells: tuple[LatexTableCell, ...] = ()
+
+
+@dataclass(config=ConfigDict(frozen=True))
+class LatexTabular:
+    """A tabular-style environment built from structured rows.
+
+    Attributes:
+        column_spec: Column specification, e.g. ``"lcr"``.
+        rows: Table rows in order.
+        name: Environment name.
+        header_rows: ``longtable`` only: rows repeated at the top of every page.
+        caption: ``longtable`` only: caption command placed above the header.
+    """
+
+    column_spec: str
+    rows: tuple[LatexTableRow, ...] = ()
+    name: str = "tabular"
+    header_rows: tuple[LatexTableRow, ...] = ()
+    caption: LatexCommand | None = None
+
+
 @dataclass(config=ConfigDict(frozen=True))
 class LatexDocumentAst:
     """The root document AST containing preamble and body."""
@@ -67,4 +123,15 @@ class LatexDocumentAst:
     metadata: dict[str, str] = field(default_factory=dict)
 
 
-LatexNode = LatexText | LatexRaw | LatexGroup | LatexCommand | LatexEnvironment
+LatexNode = (
+    LatexText
+    | LatexRaw
+    | LatexGroup
+    | LatexCommand
+    | LatexEnvironment
+    | LatexTabular
+    | LatexTableRow
+    | LatexTableCell
+    | LatexMultiColumn
+    | LatexMultiRow
+)
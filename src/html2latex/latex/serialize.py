@@ -2,28 +2,74 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Protocol
+from typing import TYPE_CHECKING, Literal, Protocol
 
 from .ast import (
     LatexCommand,
     LatexDocumentAst,
     LatexEnvironment,
     LatexGroup,
+    LatexMultiColumn,
+    LatexMultiRow,
     LatexNode,
     LatexRaw,
+    LatexTableCell,
+    LatexTableRow,
+    LatexTabular,
     LatexText,
 )
+from .unicode import TRANSLITERATIONS
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Callable, Iterable, Iterator, Sequence
+
+    _Escape = Callable[[str], str]
 
 __all__ = [
     "LatexSerializer",
     "infer_packages",
     "serialize_document",
+    "serialize_fragment",
     "serialize_nodes",
+    "stream_tabular",
 ]
 
+_SPECIAL_CHARACTERS = {
+    "\\": r"\textbackslash{}",
+    "&": r"\&",
+    "%": r"\%",
+    "$": r"\$",
+    "#": r"\#",
+    "_": r"\_",
+    "{": r"\{",
+    "}": r"\}",
+    "~": r"\textasciitilde{}",
+    "^": r"\textasciicircum{}",
+}
+_ESCAPE_TABLE = str.maketrans(_SPECIAL_CHARACTERS)
+# The special characters plus TRANSLITERATIONS, for ``encoding="ascii-latex"``
+_ASCII_LATEX_TABLE = str.maketrans({**TRANSLITERATIONS, **_SPECIAL_CHARACTERS})
+
+
+def _escape_text(text: str) -> str:
+    return text.translate(_ESCAPE_TABLE)
+
+
+def _escape_ascii_latex(text: str) -> str:
+    # Most text is ASCII; it needs only the small table of special characters
+    if text.isascii():
+        return text.translate(_ESCAPE_TABLE)
+    return text.translate(_ASCII_LATEX_TABLE)
+
+
+def _escaper(encoding: str) -> _Escape:
+    if encoding == "utf8":
+        return _escape_text
+    if encoding == "ascii-latex":
+        return _escape_ascii_latex
+    msg = f"encoding must be 'utf8' or 'ascii-latex', got {encoding!r}"
+    raise ValueError(msg)
+
 
 class LatexSerializer(Protocol):
     """Protocol for LaTeX document serializers."""
@@ -33,20 +79,60 @@ class LatexSerializer(Protocol):
         ...
 
 
-def serialize_document(document: LatexDocumentAst, *, formatted: bool = False) -> str:
-    """Serialize a LaTeX document AST to string.
+def serialize_document(
+    document: LatexDocumentAst,
+    *,
+    formatted: bool = False,
+    encoding: Literal["utf8", "ascii-latex"] = "utf8",
+) -> str:
+    r"""Serialize a LaTeX document AST to string.
 
     Args:
         document: The LaTeX document AST to serialize.
         formatted: If True, produce human-readable output with indentation.
+        encoding: ``"utf8"`` (default) writes non-ASCII text as is, for
+            engines and preambles that read UTF-8. ``"ascii-latex"`` spells
+            the characters in ``TRANSLITERATIONS`` (quotes, dashes, spaces,
+            accented letters, symbols) as LaTeX commands, such as ``'{e}``
+            for ``é``, for pdflatex builds without UTF-8 input.
 
     Returns:
         The serialized LaTeX string.
+
+    Raises:
+        ValueError: If ``encoding`` is not one of the above.
     """
     if formatted:
-        serializer = IndentedSerializer()
+        serializer = IndentedSerializer(encoding=encoding)
         return serializer.serialize(document)
-    return "".join(_serialize_node(node) for node in document.body)
+    return serialize_fragment(document.body, encoding=encoding)
+
+
+def serialize_fragment(
+    nodes: Sequence[LatexNode],
+    *,
+    formatted: bool = False,
+    encoding: Literal["utf8", "ascii-latex"] = "utf8",
+) -> str:
+    """Serialize a run of top-level document nodes.
+
+    Unlike ``serialize_document`` the formatted output is not right-trimmed,
+    so fragments of consecutive top-level nodes concatenate to the document
+    output (trim the joined text once when ``formatted``).
+
+    Args:
+        nodes: Consecutive top-level nodes of a document body.
+        formatted: If True, produce human-readable output with indentation.
+        encoding: As for ``serialize_document``.
+
+    Returns:
+        The serialized LaTeX string.
+    """
+    if formatted:
+        return IndentedSerializer(encoding=encoding).serialize_nodes(nodes)
+    cache = _FragmentCache()
+    escape = _escaper(encoding)
+    return "".join(_serialize_node(node, cache, escape) for node in nodes)
 
 
 # Environments that get indented content on new lines
@@ -89,18 +175,20 @@ _NEWLINE_AFTER_COMMANDS = frozenset(
 class IndentedSerializer:
     """Serializer that produces human-readable LaTeX with 2-space indentation."""
 
-    def __init__(self) -> None:
+    def __init__(self, *, encoding: Literal["utf8", "ascii-latex"] = "utf8") -> None:
+        self._escape = _escaper(encoding)
         self._indent_level = 0
         self._indent_str = "  "  # 2 spaces
+        # Reused node objects are serialized once per indent level (see _FragmentCache)
+        self._seen: set[int] = set()
+        self._fragments: dict[tuple[int, int], str] = {}
 
     def serialize(self, document: LatexDocumentAst) -> str:
         """Serialize document to formatted LaTeX string."""
-        return self._serialize_nodes(document.body).rstrip()
-
-    def _indent(self) -> str:
-        return self._indent_str * self._indent_level
+        return self.serialize_nodes(document.body).rstrip()
 
-    def _serialize_nodes(self, nodes: list[LatexNode]) -> str:
+    def serialize_nodes(self, nodes: Sequence[LatexNode]) -> str:
+        """Serialize top-level nodes without trimming trailing whitespace."""
         result: list[str] = []
         i = 0
         while i < len(nodes):
@@ -110,18 +198,41 @@ class IndentedSerializer:
             i += 1
         return "".join(result)
 
+    def _indent(self) -> str:
+        return self._indent_str * self._indent_level
+
+    def _forget(self) -> None:
+        """Drop the fragment caches, whose node ids may no longer be alive."""
+        self._seen.clear()
+        self._fragments.clear()
+
     def _serialize_node(self, node: LatexNode, siblings: list[LatexNode], index: int) -> str:
         if isinstance(node, LatexText):
-            return _escape_text(node.text)
+            return self._escape(node.text)
         if isinstance(node, LatexRaw):
             return node.value
+        node_id = id(node)
+        if node_id not in self._seen:
+            self._seen.add(node_id)
+            return self._serialize_container(node, siblings, index)
+        # Commands, environments and groups do not depend on their siblings, only
+        # on the current indentation, so one fragment serves every occurrence.
+        key = (node_id, self._indent_level)
+        fragment = self._fragments.get(key)
+        if fragment is None:
+            fragment = self._fragments[key] = self._serialize_container(node, siblings, index)
+        return fragment
+
+    def _serialize_container(self, node: LatexNode, siblings: list[LatexNode], index: int) -> str:
         if isinstance(node, LatexCommand):
             return self._serialize_command(node, siblings, index)
         if isinstance(node, LatexEnvironment):
             return self._serialize_environment(node, siblings, index)
+        if isinstance(node, LatexTabular):
+            return self._serialize_tabular(node)
         if isinstance(node, LatexGroup):  # pragma: no cover - groups are inside commands
             return self._serialize_group(node)
-        return ""  # pragma: no cover - unreachable for valid AST
+        return _serialize_table_part(node, self._serialize_cell_content)
 
     def _serialize_command(self, cmd: LatexCommand, siblings: list[LatexNode], index: int) -> str:
         options = _format_options(cmd.options)
@@ -173,6 +284,32 @@ class IndentedSerializer:
         lines.append(f"{self._indent()}\\end{{{env.name}}}")
         return "\n".join(lines)
 
+    def _serialize_tabular(self, tabular: LatexTabular) -> str:
+        return "".join(self.iter_tabular(tabular, ()))
+
+    def iter_tabular(self, tabular: LatexTabular, rows: Iterable[LatexTableRow]) -> Iterator[str]:
+        """Serialize a tabular one row at a time, as ``stream_tabular`` does."""
+        self._indent_level += 1
+        indent = self._indent()
+        head = _tabular_head(tabular, lambda node: self._serialize_node(node, (), 0).strip())
+        head.extend(self._serialize_node(row, (), 0).strip() for row in tabular.rows)
+        self._indent_level -= 1
+        lines = "".join(f"\n{indent}{line}" for line in head)
+        yield f"{self._indent()}\\begin{{{tabular.name}}}{{{tabular.column_spec}}}{lines}"
+        self._indent_level += 1
+        for row in rows:
+            yield f"\n{indent}{self._serialize_node(row, (), 0).strip()}"
+            # Streamed rows are dropped once serialized, so a later node may
+            # reuse an id; forget them.
+            self._forget()
+        self._indent_level -= 1
+        yield f"\n{self._indent()}\\end{{{tabular.name}}}"
+
+    def _serialize_cell_content(self, children: tuple[LatexNode, ...]) -> str:
+        # Strip the newline block commands such as \par emit so each row stays on one line.
+        text = "".join(self._serialize_node(child, children, i) for i, child in enumerate(children))
+        return text.strip()
+
     def _serialize_block_body(self, env: LatexEnvironment) -> list[str]:
         """Serialize body of a block environment with proper indentation."""
         lines: list[str] = []
@@ -193,8 +330,8 @@ class IndentedSerializer:
                 # Commands like \setcounter, \renewcommand, etc.
                 line = self._serialize_command_without_newline(child)
                 lines.append(f"{self._indent()}{line}")
-            elif isinstance(child, LatexEnvironment):
-                env_text = self._serialize_environment(child, children, i)
+            elif isinstance(child, (LatexEnvironment, LatexTabular)):
+                env_text = self._serialize_node(child, children, i)
                 lines.append(env_text)
             elif isinstance(child, (LatexText, LatexRaw)):
                 # Text nodes in block environments (like table rows)
@@ -218,7 +355,7 @@ class IndentedSerializer:
 
         # Collect content following this \item until next structural element
         content_parts: list[str] = []
-        nested_envs: list[tuple[int, LatexEnvironment]] = []
+        nested_envs: list[tuple[int, LatexEnvironment | LatexTabular]] = []
         j = index + 1
         while j < len(siblings):
             next_node = siblings[j]
@@ -230,7 +367,9 @@ class IndentedSerializer:
             }:
                 break
             consumed.add(j)
-            if isinstance(next_node, LatexEnvironment) and next_node.name in _BLOCK_ENVIRONMENTS:
+            if isinstance(next_node, LatexTabular) or (
+                isinstance(next_node, LatexEnvironment) and next_node.name in _BLOCK_ENVIRONMENTS
+            ):
                 nested_envs.append((j, next_node))
                 j += 1
                 continue
@@ -250,7 +389,7 @@ class IndentedSerializer:
         # Handle nested environments
         for _, nested_env in nested_envs:
             self._indent_level += 1
-            env_text = self._serialize_environment(nested_env, siblings, index)
+            env_text = self._serialize_node(nested_env, siblings, index)
             lines.append(env_text)
             self._indent_level -= 1
 
@@ -275,17 +414,100 @@ class IndentedSerializer:
         return f"{{{content}}}"
 
 
-def serialize_nodes(nodes: Iterable[LatexNode]) -> Iterable[str]:
+def serialize_nodes(
+    nodes: Iterable[LatexNode],
+    *,
+    formatted: bool = False,
+    encoding: Literal["utf8", "ascii-latex"] = "utf8",
+) -> Iterable[str]:
     """Serialize a sequence of LaTeX nodes to strings.
 
     Args:
         nodes: The LaTeX nodes to serialize.
+        formatted: If True, produce human-readable output with indentation,
+            as ``serialize_fragment`` does.
+        encoding: As for ``serialize_document``.
 
     Yields:
         Serialized string for each node.
     """
+    if formatted:
+        # A fresh serializer per node: the nodes may be produced lazily and
+        # dropped once serialized, so a later node may reuse an id that a
+        # shared serializer's fragment caches have seen.
+        for node in nodes:
+            yield IndentedSerializer(encoding=encoding).serialize_nodes((node,))
+        return
+    escape = _escaper(encoding)
     for node in nodes:
-        yield _serialize_node(node)
+        yield _serialize_node(node, None, escape)
+
+
+def stream_tabular(
+    tabular: LatexTabular,
+    rows: Iterable[LatexTableRow],
+    *,
+    formatted: bool = False,
+    encoding: Literal["utf8", "ascii-latex"] = "utf8",
+) -> Iterator[str]:
+    r"""Serialize a tabular environment one row at a time.
+
+    ``tabular`` supplies the environment name, column spec and any
+    ``longtable`` caption and header rows. Rows already on ``tabular`` are
+    emitted before ``rows``. The chunks join to the same text as
+    ``serialize_nodes`` produces for the complete table, but ``rows`` is only
+    consumed one row at a time.
+
+    Args:
+        tabular: The table head.
+        rows: Body rows, typically produced lazily.
+        formatted: If True, produce human-readable output with indentation,
+            one row per line.
+        encoding: As for ``serialize_document``.
+
+    Returns:
+        An iterator over the opening of the environment, one string per row,
+        and the closing ``\end``.
+    """
+    if formatted:
+        return IndentedSerializer(encoding=encoding).iter_tabular(tabular, rows)
+    return _iter_tabular(tabular, rows, _FragmentCache(), _escaper(encoding))
+
+
+_LONGTABLE_MARKERS = frozenset({"\\endfirsthead", "\\endhead"})
+
+
+def _iter_tabular(
+    tabular: LatexTabular,
+    rows: Iterable[LatexTableRow],
+    cache: _FragmentCache | None,
+    escape: _Escape,
+) -> Iterator[str]:
+    head = "".join(
+        f"{line}\n" if line in _LONGTABLE_MARKERS else line
+        for line in _tabular_head(tabular, lambda node: _serialize_node(node, cache, escape))
+    )
+    yield f"\\begin{{{tabular.name}}}{{{tabular.column_spec}}}{head}"
+    for row in tabular.rows:
+        yield _serialize_node(row, cache, escape)
+    # Streamed rows are dropped once serialized, so a later node may reuse an
+    # id the cache has seen; they are serialized without it.
+    for row in rows:
+        yield _serialize_node(row, None, escape)
+    yield f"\\end{{{tabular.name}}}"
+
+
+def _tabular_head(tabular: LatexTabular, serialize: Callable[[LatexNode], str]) -> list[str]:
+    """Caption and repeated header lines that open a longtable, one entry per line."""
+    header = [serialize(row) for row in tabular.header_rows]
+    lines: list[str] = []
+    if tabular.caption is not None:
+        lines.append(f"{serialize(tabular.caption)} \\\\")
+        if header:
+            lines.extend([*header, "\\endfirsthead"])
+    if header:
+        lines.extend([*header, "\\endhead"])
+    return lines
 
 
 def infer_packages(document: LatexDocumentAst) -> set[str]:
@@ -299,27 +521,43 @@ def infer_packages(document: LatexDocumentAst) -> set[str]:
     """
     packages: set[str] = set()
     for node in _walk_nodes(document.body):
-        if isinstance(node, LatexCommand) and node.name in {"href", "url"}:
-            packages.add("hyperref")
-        if isinstance(node, LatexCommand) and node.name == "includegraphics":
-            packages.add("graphicx")
-        if isinstance(node, LatexCommand) and node.name == "sout":
-            packages.add("ulem")
-        if isinstance(node, LatexCommand) and node.name in {"colorbox", "textcolor"}:
-            packages.add("xcolor")
-        if isinstance(node, LatexEnvironment) and node.name == "tabularx":
-            packages.add("tabularx")
-        if isinstance(node, LatexEnvironment) and node.name in {"tabular", "tabularx"}:
-            for group in node.args:
-                spec = _group_text(group)
-                if "\\arraybackslash" in spec or ">{\\" in spec:
-                    packages.add("array")
-        # Detect \multirow in raw LaTeX content (used in table cells)
-        if isinstance(node, LatexRaw) and "\\multirow" in node.value:
+        if isinstance(node, LatexCommand):
+            package = _COMMAND_PACKAGES.get(node.name)
+            if package is not None:
+                packages.add(package)
+        elif isinstance(node, LatexRaw):
+            packages.update(node.packages)
+        elif isinstance(node, LatexEnvironment) and node.name in {"tabular", "tabularx"}:
+            if node.name == "tabularx":
+                packages.add("tabularx")
+            if any(_needs_array_package(_group_text(group)) for group in node.args):
+                packages.add("array")
+        elif isinstance(node, LatexTabular):
+            if node.name == "longtable":
+                packages.add("longtable")
+            if _needs_array_package(node.column_spec):
+                packages.add("array")
+        elif isinstance(node, LatexMultiRow):
             packages.add("multirow")
     return packages
 
 
+_COMMAND_PACKAGES = {
+    "href": "hyperref",
+    "hyperref": "hyperref",
+    "url": "hyperref",
+    "includegraphics": "graphicx",
+    "sout": "ulem",
+    "color": "xcolor",
+    "colorbox": "xcolor",
+    "textcolor": "xcolor",
+}
+
+
+def _needs_array_package(spec: str) -> bool:
+    return "\\arraybackslash" in spec or ">{\\" in spec
+
+
 def _walk_nodes(nodes: Iterable[LatexNode]) -> Iterable[LatexNode]:
     for node in nodes:
         yield node
@@ -330,21 +568,79 @@ def _walk_nodes(nodes: Iterable[LatexNode]) -> Iterable[LatexNode]:
             yield from _walk_nodes(node.children)
             for group in node.args:
                 yield from _walk_nodes(group.children)
-        if isinstance(node, LatexGroup):
+        if isinstance(node, (LatexGroup, LatexTableCell, LatexMultiColumn, LatexMultiRow)):
             yield from _walk_nodes(node.children)
+        if isinstance(node, LatexTabular):
+            if node.caption is not None:
+                yield from _walk_nodes((node.caption,))
+            yield from _walk_nodes(node.header_rows)
+            yield from _walk_nodes(node.rows)
+        if isinstance(node, LatexTableRow):
+            yield from _walk_nodes(node.cells)
+
+
+class _FragmentCache:
+    """Serialized text of node objects that occur more than once in a tree.
+
+    The converter reuses the same node objects for repeated subtrees. A node is
+    remembered on first sight and its text is cached from the second occurrence
+    on, so trees without repeats pay one set insertion per container node.
+    """
 
+    __slots__ = ("fragments", "seen")
 
-def _serialize_node(node: LatexNode) -> str:
+    def __init__(self) -> None:
+        self.seen: set[int] = set()
+        self.fragments: dict[int, str] = {}
+
+
+def _serialize_node(
+    node: LatexNode, cache: _FragmentCache | None = None, escape: _Escape = _escape_text
+) -> str:
     if isinstance(node, LatexText):
-        return _escape_text(node.text)
+        return escape(node.text)
     if isinstance(node, LatexRaw):
         return node.value
+    if cache is None:
+        return _serialize_container(node, None, escape)
+    node_id = id(node)
+    if node_id not in cache.seen:
+        cache.seen.add(node_id)
+        return _serialize_container(node, cache, escape)
+    fragment = cache.fragments.get(node_id)
+    if fragment is None:
+        fragment = cache.fragments[node_id] = _serialize_container(node, cache, escape)
+    return fragment
+
+
+def _serialize_container(node: LatexNode, cache: _FragmentCache | None, escape: _Escape) -> str:
     if isinstance(node, LatexCommand):
-        return _serialize_command(node)
+        return _serialize_command(node, cache, escape)
     if isinstance(node, LatexEnvironment):
-        return _serialize_environment(node)
+        return _serialize_environment(node, cache, escape)
     if isinstance(node, LatexGroup):
-        return _serialize_group(node)
+        return _serialize_group(node, cache, escape)
+    if isinstance(node, LatexTabular):
+        return "".join(_iter_tabular(node, (), cache, escape))
+    return _serialize_table_part(
+        node, lambda children: "".join(_serialize_node(child, cache, escape) for child in children)
+    )
+
+
+def _serialize_table_part(
+    node: LatexNode, serialize_children: Callable[[tuple[LatexNode, ...]], str]
+) -> str:
+    """Serialize rows, cells and spanning cells; shared by both serializers."""
+    if isinstance(node, LatexTableRow):
+        row = " & ".join(serialize_children(cell.children) for cell in node.cells).rstrip()
+        return f"{row} \\\\"
+    if isinstance(node, LatexTableCell):
+        return serialize_children(node.children)
+    if isinstance(node, LatexMultiColumn):
+        content = serialize_children(node.children)
+        return f"\\multicolumn{{{node.span}}}{{{node.align}}}{{{content}}}"
+    if isinstance(node, LatexMultiRow):
+        return f"\\multirow{{{node.span}}}{{*}}{{{serialize_children(node.children)}}}"
     return ""
 
 
@@ -358,23 +654,29 @@ def _group_text(group: LatexGroup) -> str:
     return "".join(parts)
 
 
-def _serialize_command(command: LatexCommand) -> str:
+def _serialize_command(
+    command: LatexCommand, cache: _FragmentCache | None = None, escape: _Escape = _escape_text
+) -> str:
     options = _format_options(command.options)
-    args = "".join(_serialize_group(group) for group in command.args)
+    args = "".join(_serialize_group(group, cache, escape) for group in command.args)
     if args:
         return f"\\{command.name}{options}{args}"
     return f"\\{command.name}{options} "
 
 
-def _serialize_environment(env: LatexEnvironment) -> str:
+def _serialize_environment(
+    env: LatexEnvironment, cache: _FragmentCache | None = None, escape: _Escape = _escape_text
+) -> str:
     options = _format_options(env.options)
-    args = "".join(_serialize_group(group) for group in env.args)
-    body = "".join(_serialize_node(child) for child in env.children)
+    args = "".join(_serialize_group(group, cache, escape) for group in env.args)
+    body = "".join(_serialize_node(child, cache, escape) for child in env.children)
     return f"\\begin{{{env.name}}}{options}{args}{body}\\end{{{env.name}}}"
 
 
-def _serialize_group(group: LatexGroup) -> str:
-    content = "".join(_serialize_node(node) for node in group.children)
+def _serialize_group(
+    group: LatexGroup, cache: _FragmentCache | None = None, escape: _Escape = _escape_text
+) -> str:
+    content = "".join(_serialize_node(node, cache, escape) for node in group.children)
     return f"{{{content}}}"
 
 
@@ -382,19 +684,3 @@ def _format_options(options: tuple[str, ...]) -> str:
     if not options:
         return ""
     return f"[{','.join(options)}]"
-
-
-def _escape_text(text: str) -> str:
-    replacements = {
-        "\\": r"\textbackslash{}",
-        "&": r"\&",
-        "%": r"\%",
-        "$": r"\$",
-        "#": r"\#",
-        "_": r"\_",
-        "{": r"\{",
-        "}": r"\}",
-        "~": r"\textasciitilde{}",
-        "^": r"\textasciicircum{}",
-    }
-    return "".join(replacements.get(ch, ch) for ch in text)
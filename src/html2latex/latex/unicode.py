@@ -0,0 +1,302 @@
+r"""LaTeX spellings of non-ASCII characters, for pdflatex without UTF-8 input.
+
+``TRANSLITERATIONS`` maps characters of the common Unicode blocks to plain
+LaTeX: typographic punctuation and spaces, currency and other text symbols,
+accented Latin letters (``é`` becomes ``\'{e}``), the special letters of
+European languages, Greek letters and frequent mathematical symbols. Accented
+letters are derived from their canonical decomposition, so precomposed
+letters with several marks (``ǖ``) nest the accent commands. Nearly every
+command is in the LaTeX kernel, with its bundled ``textcomp`` symbols; the
+guillemets, the low quotation marks and the letters eth, thorn and
+d-with-stroke need ``\usepackage[T1]{fontenc}``. Characters outside the table
+are left as they are.
+"""
+
+from __future__ import annotations
+
+import unicodedata
+from types import MappingProxyType
+
+__all__ = ["TRANSLITERATIONS"]
+
+# Typographic punctuation, spaces and symbols, by code point.
+_SYMBOLS = {
+    "\u00a0": "~",
+    "¡": "!`",
+    "¢": r"\textcent{}",
+    "£": r"\pounds{}",
+    "¤": r"\textcurrency{}",
+    "¥": r"\textyen{}",
+    "¦": r"\textbrokenbar{}",
+    "§": r"\S{}",
+    "¨": r"\textasciidieresis{}",
+    "©": r"\textcopyright{}",
+    "ª": r"\textordfeminine{}",
+    "«": r"\guillemotleft{}",
+    "¬": r"\textlnot{}",
+    "\u00ad": r"\-",
+    "®": r"\textregistered{}",
+    "¯": r"\textasciimacron{}",
+    "°": r"\textdegree{}",
+    "±": r"\textpm{}",
+    "²": r"\texttwosuperior{}",
+    "³": r"\textthreesuperior{}",
+    "´": r"\textasciiacute{}",
+    "µ": r"\textmu{}",
+    "¶": r"\P{}",
+    "·": r"\textperiodcentered{}",
+    "¸": r"\c{ }",
+    "¹": r"\textonesuperior{}",
+    "º": r"\textordmasculine{}",
+    "»": r"\guillemotright{}",
+    "¼": r"\textonequarter{}",
+    "½": r"\textonehalf{}",
+    "¾": r"\textthreequarters{}",
+    "¿": "?`",
+    "Æ": r"\AE{}",
+    "Ð": r"\DH{}",
+    "×": r"\texttimes{}",
+    "Ø": r"\O{}",
+    "Þ": r"\TH{}",
+    "ß": r"\ss{}",
+    "æ": r"\ae{}",
+    "ð": r"\dh{}",
+    "÷": r"\textdiv{}",
+    "ø": r"\o{}",
+    "þ": r"\th{}",
+    "Đ": r"\DJ{}",
+    "đ": r"\dj{}",
+    "ı": r"\i{}",
+    "Ł": r"\L{}",
+    "ł": r"\l{}",
+    "Ŋ": r"\NG{}",
+    "ŋ": r"\ng{}",
+    "Œ": r"\OE{}",
+    "œ": r"\oe{}",
+    "ȷ": r"\j{}",
+    "ˆ": r"\textasciicircum{}",
+    "˜": r"\textasciitilde{}",
+    "\u2002": r"\enspace{}",
+    "\u2003": r"\quad{}",
+    "\u2009": r"\,",
+    "\u200a": r"\,",
+    "\u200b": "",
+    "\u200c": "{}",
+    "\u200d": "",
+    "‐": "-",
+    "‑": r"\mbox{-}",
+    "‒": "--",
+    "–": "--",
+    "—": "---",
+    "―": "---",
+    "‖": r"\textbardbl{}",
+    "‘": "`",
+    "’": "'",
+    "‚": r"\quotesinglbase{}",
+    "“": "``",
+    "”": "''",
+    "„": r"\quotedblbase{}",
+    "†": r"\dag{}",
+    "‡": r"\ddag{}",
+    "•": r"\textbullet{}",
+    "…": r"\ldots{}",
+    "\u202f": r"\,",
+    "‰": r"\textperthousand{}",
+    "′": "'",
+    "″": "''",
+    "‹": r"\guilsinglleft{}",
+    "›": r"\guilsinglright{}",
+    "⁄": r"\textfractionsolidus{}",
+    "\u2060": "",
+    "₡": r"\textcolonmonetary{}",
+    "₤": r"\textlira{}",
+    "₦": r"\textnaira{}",
+    "₩": r"\textwon{}",
+    "₫": r"\textdong{}",
+    "€": r"\texteuro{}",
+    "₱": r"\textpeso{}",
+    "℃": r"\textcelsius{}",
+    "№": r"\textnumero{}",
+    "℗": r"\textcircledP{}",
+    "℞": r"\textrecipe{}",
+    "℠": r"\textservicemark{}",
+    "™": r"\texttrademark{}",
+    "\u2126": r"\textohm{}",
+    "℧": r"\textmho{}",
+    "℮": r"\textestimated{}",
+    "←": r"\textleftarrow{}",
+    "↑": r"\textuparrow{}",
+    "→": r"\textrightarrow{}",
+    "↓": r"\textdownarrow{}",
+    "−": r"\textminus{}",
+    "√": r"\textsurd{}",
+    "␢": r"\textblank{}",
+    "◦": r"\textopenbullet{}",
+    "◯": r"\textbigcircle{}",
+    "♪": r"\textmusicalnote{}",
+    "\ufeff": "",
+}
+
+# Math-mode symbols, wrapped in \ensuremath so they work in running text.
+_MATH_SYMBOLS = {
+    "↔": r"\leftrightarrow",
+    "⇐": r"\Leftarrow",
+    "⇒": r"\Rightarrow",
+    "⇔": r"\Leftrightarrow",
+    "∀": r"\forall",
+    "∂": r"\partial",
+    "∃": r"\exists",
+    "∅": r"\emptyset",
+    "∇": r"\nabla",
+    "∈": r"\in",
+    "∉": r"\notin",
+    "∏": r"\prod",
+    "∑": r"\sum",
+    "∓": r"\mp",
+    "∗": r"\ast",
+    "∘": r"\circ",
+    "∝": r"\propto",
+    "∞": r"\infty",
+    "∧": r"\wedge",
+    "∨": r"\vee",
+    "∩": r"\cap",
+    "∪": r"\cup",
+    "∫": r"\int",
+    "∴": r"\therefore",
+    "∼": r"\sim",
+    "≅": r"\cong",
+    "≈": r"\approx",
+    "≠": r"\neq",
+    "≡": r"\equiv",
+    "≤": r"\leq",
+    "≥": r"\geq",
+    "≪": r"\ll",
+    "≫": r"\gg",
+    "⊂": r"\subset",
+    "⊃": r"\supset",
+    "⊆": r"\subseteq",
+    "⊇": r"\supseteq",
+    "⊕": r"\oplus",
+    "⊗": r"\otimes",
+    "⊥": r"\perp",
+    "⋅": r"\cdot",
+}
+
+# Greek letters with a LaTeX command; the capitals missing here (Alpha,
+# Beta, ...) look like Latin letters and are written as such.
+_GREEK = {
+    "Α": "A",
+    "Β": "B",
+    "Ε": "E",
+    "Ζ": "Z",
+    "Η": "H",
+    "Ι": "I",
+    "Κ": "K",
+    "Μ": "M",
+    "Ν": "N",
+    "Ο": "O",
+    "Ρ": "P",
+    "Τ": "T",
+    "Χ": "X",
+    "ο": "o",
+}
+_GREEK_NAMES = {
+    "Γ": "Gamma",
+    "Δ": "Delta",
+    "Θ": "Theta",
+    "Λ": "Lambda",
+    "Ξ": "Xi",
+    "Π": "Pi",
+    "Σ": "Sigma",
+    "Υ": "Upsilon",
+    "Φ": "Phi",
+    "Ψ": "Psi",
+    "Ω": "Omega",
+    "α": "alpha",
+    "β": "beta",
+    "γ": "gamma",
+    "δ": "delta",
+    "ε": "epsilon",
+    "ζ": "zeta",
+    "η": "eta",
+    "θ": "theta",
+    "ι": "iota",
+    "κ": "kappa",
+    "λ": "lambda",
+    "μ": "mu",
+    "ν": "nu",
+    "ξ": "xi",
+    "π": "pi",
+    "ρ": "rho",
+    "ς": "varsigma",
+    "σ": "sigma",
+    "τ": "tau",
+    "υ": "upsilon",
+    "φ": "phi",
+    "χ": "chi",
+    "ψ": "psi",
+    "ω": "omega",
+    "ϑ": "vartheta",
+    "ϕ": "varphi",
+    "ϖ": "varpi",
+    "ϱ": "varrho",
+    "ϵ": "epsilon",
+}
+
+# Accent commands by combining mark.
+_ACCENTS = {
+    "\u0300": "`",
+    "\u0301": "'",
+    "\u0302": "^",
+    "\u0303": "~",
+    "\u0304": "=",
+    "\u0306": "u",
+    "\u0307": ".",
+    "\u0308": '"',
+    "\u030a": "r",
+    "\u030b": "H",
+    "\u030c": "v",
+    "\u0323": "d",
+    "\u0327": "c",
+    "\u0328": "k",
+    "\u0331": "b",
+}
+# Marks drawn above the letter, which replace the dot of i and j.
+_ACCENTS_ABOVE = frozenset("\u0300\u0301\u0302\u0303\u0304\u0306\u0307\u0308\u030a\u030b\u030c")
+# Latin-1 Supplement, Latin Extended-A and B, and Latin Extended Additional.
+_LATIN_RANGES = (range(0x00C0, 0x0250), range(0x1E00, 0x1F00))
+
+
+def _accented(char: str) -> str | None:
+    """Spell a precomposed Latin letter as accent commands, or None."""
+    base, *marks = unicodedata.normalize("NFD", char)
+    if not (base.isascii() and base.isalpha() and marks):
+        return None
+    if base in "ij" and marks[0] in _ACCENTS_ABOVE:
+        base = rf"\{base}"
+    latex = base
+    for mark in marks:
+        command = _ACCENTS.get(mark)
+        if command is None:
+            return None
+        latex = rf"\{command}{{{latex}}}"
+    return latex
+
+
+def _build() -> dict[str, str]:
+    table: dict[str, str] = {}
+    for block in _LATIN_RANGES:
+        for code in block:
+            latex = _accented(chr(code))
+            if latex is not None:
+                table[chr(code)] = latex
+    table.update(_GREEK)
+    table.update(
+        {char: rf"\ensuremath{{\{name}}}" for char, name in _GREEK_NAMES.items()},
+    )
+    table.update({char: rf"\ensuremath{{{command}}}" for char, command in _MATH_SYMBOLS.items()})
+    table.update(_SYMBOLS)
+    return table
+
+
+TRANSLITERATIONS = MappingProxyType(_build())
@@ -3,22 +3,25 @@
 from __future__ import annotations
 
 from dataclasses import field
-from typing import Any
+from pathlib import Path  # noqa: TC003 - needed at runtime
+from typing import Any, Literal
 
 from pydantic import ConfigDict
 from pydantic.dataclasses import dataclass
 
 from html2latex.diagnostics import DiagnosticEvent  # noqa: TC001 - needed at runtime
+from html2latex.pipeline import ConvertedBlock, SplitPart  # noqa: TC001 - needed at runtime
 
 __all__ = [
     "ConvertOptions",
     "LatexDocument",
+    "SplitDocument",
 ]
 
 
 @dataclass(config=ConfigDict(frozen=True))
 class ConvertOptions:
-    """Configuration options for HTML to LaTeX conversion.
+    r"""Configuration options for HTML to LaTeX conversion.
 
     Attributes:
         strict: If True, raise errors on invalid HTML. If False, emit diagnostics.
@@ -26,6 +29,38 @@ class ConvertOptions:
         formatted: If True, format the output LaTeX with proper indentation.
         template: Optional Jinja2 template name for custom output formatting.
         metadata: Additional metadata to pass to the template.
+        assume_normalized: If True, trust that the input HTML is already
+            whitespace-normalized and skip the normalize stage.
+        debug_normalize_sample: Fraction (0-1) of trusted inputs that are
+            re-normalized to verify idempotence. Debugging aid only; ignored
+            when Python runs with ``-O``.
+        table_strategy: ``"tabular"`` (default) renders every table as a
+            ``tabular``; ``"longtable"`` renders every table as a page-breaking
+            ``longtable`` with ``thead`` rows repeated on each page; ``"auto"``
+            uses ``longtable`` only for tables with more than
+            ``longtable_threshold`` rows.
+        longtable_threshold: Row count above which ``"auto"`` switches to
+            ``longtable``.
+        workers: Number of processes used to convert the top-level blocks
+            of large documents in parallel. 1 (default) converts in the
+            calling thread; custom tag handlers must then be picklable.
+        class_profiles: Names of the editor class profiles (see
+            ``html2latex.styles.CLASS_PROFILES``) whose formatting classes,
+            such as Quill's ``ql-align-center``, are converted like the
+            equivalent inline styles. Empty by default, so such classes are
+            ignored unless a profile is named.
+        asset_dir: Directory to extract ``data:`` URI images into (see
+            ``html2latex.pipeline.extract_assets``), so ``\includegraphics``
+            references the written file. None keeps the URIs as they are.
+        image_root: Directory that relative image sources are resolved
+            against to size images that have no ``width`` or ``height``:
+            local PNG, JPEG and GIF files get their pixel size from the file
+            header, capped at ``\linewidth``. None disables probing.
+        output_encoding: ``"utf8"`` (default) writes non-ASCII text as is;
+            ``"ascii-latex"`` spells quotes, dashes, special spaces, accented
+            letters and common symbols as LaTeX commands, for pdflatex
+            builds without UTF-8 input (see
+            ``html2latex.latex.TRANSLITERATIONS``).
     """
 
     strict: bool = True
@@ -33,6 +68,15 @@ class ConvertOptions:
     formatted: bool = True
     template: str | None = None
     metadata: dict[str, Any] = field(default_factory=dict)
+    assume_normalized: bool = False
+    debug_normalize_sample: float = 0.0
+    table_strategy: Literal["tabular", "longtable", "auto"] = "tabular"
+    longtable_threshold: int = 200
+    workers: int = 1
+    class_profiles: tuple[Literal["quill", "ckeditor"], ...] = ()
+    asset_dir: str | None = None
+    image_root: str | None = None
+    output_encoding: Literal["utf8", "ascii-latex"] = "utf8"
 
 
 @dataclass(config=ConfigDict(frozen=True))
@@ -44,9 +88,29 @@ class LatexDocument:
         preamble: LaTeX preamble content (package imports, etc.).
         packages: Tuple of required LaTeX package names.
         diagnostics: Tuple of diagnostic events emitted during conversion.
+        blocks: Per-block results of ``Converter.convert_incremental``, for
+            the next call to reuse; empty for other conversions.
     """
 
     body: str
     preamble: str = ""
     packages: tuple[str, ...] = ()
     diagnostics: tuple[DiagnosticEvent, ...] = ()
+    blocks: tuple[ConvertedBlock, ...] = field(default=(), repr=False, compare=False)
+
+
+@dataclass(config=ConfigDict(frozen=True))
+class SplitDocument:
+    """Result of converting HTML into per-part files.
+
+    Attributes:
+        master: Path of the master file that includes every part.
+        parts: The part files, in document order, with their packages.
+        packages: Tuple of LaTeX package names required by any part.
+        diagnostics: Tuple of diagnostic events emitted during conversion.
+    """
+
+    master: Path
+    parts: tuple[SplitPart, ...] = ()
+    packages: tuple[str, ...] = ()
+    diagnostics: tuple[DiagnosticEvent, ...] = ()
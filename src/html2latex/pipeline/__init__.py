@@ -1,5 +1,40 @@
-from .convert import convert_document
-from .normalize import normalize_document
+from .assets import extract_assets
+from .convert import (
+    ConversionContext,
+    ConversionState,
+    TagHandler,
+    convert_document,
+    convert_nodes,
+    default_handlers,
+)
+from .images import clear_image_cache, probe_image_size
+from .incremental import ConvertedBlock, convert_incremental
+from .mathml import clear_mathml_cache, convert_mathml
+from .normalize import mark_normalized, normalize_document, validate_normalized
+from .parallel import convert_parallel, partition_blocks
+from .split import SplitPart, write_parts
 from .stream import stream_convert
 
-__all__ = ["convert_document", "normalize_document", "stream_convert"]
+__all__ = [
+    "ConversionContext",
+    "ConversionState",
+    "ConvertedBlock",
+    "SplitPart",
+    "TagHandler",
+    "clear_image_cache",
+    "clear_mathml_cache",
+    "convert_document",
+    "convert_incremental",
+    "convert_mathml",
+    "convert_nodes",
+    "convert_parallel",
+    "default_handlers",
+    "extract_assets",
+    "mark_normalized",
+    "normalize_document",
+    "partition_blocks",
+    "probe_image_size",
+    "stream_convert",
+    "validate_normalized",
+    "write_parts",
+]
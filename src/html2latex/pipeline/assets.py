@@ -0,0 +1,188 @@
+r"""Extraction of ``data:`` URI images into files.
+
+Editors embed pasted images as ``data:`` URIs, often megabytes of base64 that
+would otherwise be copied into ``\includegraphics`` and cannot compile. This
+stage decodes them into content-addressed files (named by a digest of the
+image bytes) and points ``src`` at the file instead. Decoding is incremental,
+one bounded chunk of the URI at a time, so memory does not grow with the
+image size; identical images, within a batch or across batches sharing a
+directory, are stored once.
+"""
+
+from __future__ import annotations
+
+import binascii
+import os
+import tempfile
+from base64 import b64decode
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from hashlib import blake2b
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import unquote_to_bytes
+
+from html2latex.ast import HtmlDocument, HtmlElement, HtmlNode
+from html2latex.diagnostics import DiagnosticEvent, emit_diagnostic
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping, Sequence
+
+__all__ = ["extract_assets"]
+
+# Characters of base64 decoded per step: a multiple of 4, about 768 KiB out.
+_CHUNK_CHARS = 1 << 20
+_DIGEST_SIZE = 16
+_EXTENSIONS = {
+    "application/pdf": ".pdf",
+    "image/bmp": ".bmp",
+    "image/gif": ".gif",
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/svg+xml": ".svg",
+    "image/webp": ".webp",
+}
+
+
+def extract_assets(
+    documents: Sequence[HtmlDocument],
+    directory: str | Path,
+    *,
+    workers: int | None = None,
+    executor: Executor | None = None,
+) -> tuple[HtmlDocument, ...]:
+    """Write the ``data:`` URI images of ``documents`` to files in ``directory``.
+
+    Every ``<img>`` whose ``src`` is a ``data:`` URI gets the path of the
+    decoded file (``directory`` joined with the digest-based file name) as
+    its new ``src``. Each distinct URI is decoded once per batch, on a
+    thread pool; files that already exist are not rewritten. Malformed URIs
+    are dropped with an ``invalid-data-uri`` warning, so the image falls
+    back to its ``alt`` text. Other nodes are shared with the input trees.
+
+    Args:
+        documents: The documents to process, typically normalized.
+        directory: Directory for the image files; created if needed.
+        workers: Number of decoding threads for the default pool; None lets
+            ``ThreadPoolExecutor`` choose. Ignored when ``executor`` is given.
+        executor: Optional executor to decode on, e.g. a shared pool.
+
+    Returns:
+        The documents with rewritten image sources, in input order.
+    """
+    uris = dict.fromkeys(uri for document in documents for uri in _data_uris(document.children))
+    if not uris:
+        return tuple(documents)
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    job = partial(_write_asset, directory=directory)
+    if len(uris) == 1:
+        paths = [job(uri) for uri in uris]
+    elif executor is not None:
+        paths = list(executor.map(job, uris))
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            paths = list(pool.map(job, uris))
+
+    sources: dict[str, str | None] = {}
+    for uri, path in zip(uris, paths, strict=True):
+        if path is None:
+            emit_diagnostic(
+                DiagnosticEvent(
+                    code="invalid-data-uri",
+                    category="assets",
+                    severity="warn",
+                    message="Image data URI could not be decoded and was dropped",
+                    source_html=uri[:64],
+                )
+            )
+        sources[uri] = None if path is None else path.as_posix()
+    return tuple(
+        HtmlDocument(
+            children=_rewrite(document.children, sources),
+            doctype=document.doctype,
+            normalized=document.normalized,
+        )
+        for document in documents
+    )
+
+
+def _data_uris(nodes: tuple[HtmlNode, ...]) -> Iterator[str]:
+    stack = list(reversed(nodes))
+    while stack:
+        node = stack.pop()
+        if not isinstance(node, HtmlElement):
+            continue
+        if node.tag.lower() == "img":
+            src = node.attrs.get("src", "")
+            if src[:5].lower() == "data:":
+                yield src
+        stack.extend(reversed(node.children))
+
+
+def _rewrite(
+    nodes: tuple[HtmlNode, ...], sources: Mapping[str, str | None]
+) -> tuple[HtmlNode, ...]:
+    """Return ``nodes`` with image sources replaced, sharing unchanged subtrees."""
+    rewritten: list[HtmlNode] = []
+    changed = False
+    for node in nodes:
+        new = node
+        if isinstance(node, HtmlElement):
+            src = node.attrs.get("src")
+            if src in sources and node.tag.lower() == "img":
+                attrs = {name: value for name, value in node.attrs.items() if name != "src"}
+                if sources[src] is not None:
+                    attrs["src"] = sources[src]
+                new = HtmlElement(tag=node.tag, attrs=attrs, children=node.children)
+            elif node.children:
+                children = _rewrite(node.children, sources)
+                if children is not node.children:
+                    new = HtmlElement(tag=node.tag, attrs=node.attrs, children=children)
+        changed = changed or new is not node
+        rewritten.append(new)
+    return tuple(rewritten) if changed else nodes
+
+
+def _write_asset(uri: str, directory: Path) -> Path | None:
+    """Decode ``uri`` into ``directory``; return the file path, or None if malformed."""
+    comma = uri.find(",")
+    if comma < 0:
+        return None
+    params = [param.strip() for param in uri[5:comma].lower().split(";")]
+    is_base64 = len(params) > 1 and params[-1] == "base64"
+    digest = blake2b(digest_size=_DIGEST_SIZE)
+    fd, temp_name = tempfile.mkstemp(dir=directory, prefix=".asset-")
+    temp_path = Path(temp_name)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            for data in _decoded_chunks(uri, comma + 1, is_base64=is_base64):
+                digest.update(data)
+                out.write(data)
+    except (binascii.Error, ValueError):
+        temp_path.unlink()
+        return None
+    path = directory / f"{digest.hexdigest()}{_EXTENSIONS.get(params[0], '.bin')}"
+    if path.exists():
+        temp_path.unlink()
+    else:
+        temp_path.replace(path)
+    return path
+
+
+def _decoded_chunks(uri: str, start: int, *, is_base64: bool) -> Iterator[bytes]:
+    if not is_base64:
+        # Percent-encoded payloads (typically small SVGs) decode in one go.
+        yield unquote_to_bytes(uri[start:])
+        return
+    carry = ""
+    for offset in range(start, len(uri), _CHUNK_CHARS):
+        # Whitespace may wrap the payload; 4-character groups straddling a
+        # chunk boundary carry over to the next chunk.
+        text = carry + "".join(uri[offset : offset + _CHUNK_CHARS].split())
+        usable = len(text) - len(text) % 4
+        carry = text[usable:]
+        yield b64decode(text[:usable], validate=True)
+    if carry:
+        msg = "Truncated base64 data"
+        raise binascii.Error(msg)
@@ -3,7 +3,13 @@
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
+from array import array
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass, replace
+from functools import cache, partial
+from pathlib import Path
+from types import MappingProxyType
+from urllib.parse import unquote
 
 from html2latex.ast import HtmlDocument, HtmlElement, HtmlNode, HtmlText
 from html2latex.latex import (
@@ -11,14 +17,42 @@ from html2latex.latex import (
     LatexDocumentAst,
     LatexEnvironment,
     LatexGroup,
+    LatexMultiColumn,
+    LatexMultiRow,
     LatexNode,
     LatexRaw,
+    LatexTableCell,
+    LatexTableRow,
+    LatexTabular,
     LatexText,
-    serialize_nodes,
+)
+from html2latex.styles import (
+    ClassProfile,
+    InlineStyle,
+    InlineWrapper,
+    StyleRule,
+    Stylesheet,
+    compile_class_profiles,
+    parse_class_attribute,
+    parse_inline_style,
+    parse_stylesheet,
 )
 from html2latex.tags import BLOCK_PASSTHROUGH, BLOCK_TAGS, INLINE_PASSTHROUGH
 
-__all__ = ["convert_document"]
+from .images import probe_image_size
+from .mathml import convert_mathml
+
+__all__ = [
+    "ConversionContext",
+    "ConversionState",
+    "TagHandler",
+    "convert_document",
+    "convert_nodes",
+    "default_handlers",
+]
+
+# A tag handler converts one element: handler(node, context).
+TagHandler = Callable[[HtmlElement, "ConversionContext"], Sequence[LatexNode]]
 
 _HEADING_COMMANDS = {
     "h1": "section",
@@ -27,6 +61,7 @@ _HEADING_COMMANDS = {
     "h4": "paragraph",
     "h5": "subparagraph",
 }
+_SECTION_COMMANDS = frozenset(_HEADING_COMMANDS.values())
 
 _INLINE_COMMANDS = {
     "strong": "textbf",
@@ -49,295 +84,796 @@ _INLINE_COMMANDS = {
 }
 
 
+# Constant nodes shared by every conversion. LaTeX nodes are immutable, so
+# one instance serves every paragraph, line break, list item and so on.
+_PAR = LatexCommand(name="par")
+_NEWLINE = LatexCommand(name="newline")
+_HRULE = LatexCommand(name="hrule")
+_ITEM = LatexCommand(name="item")
+_CENTERING = LatexCommand(name="centering")
+_SPACE = LatexText(text=" ")
+_SPACE_ONLY: tuple[LatexNode, ...] = (_SPACE,)
+_LABEL_DOT = LatexText(text=".")
+_MARK_COLOR = LatexGroup(children=(LatexText(text="yellow"),))
+_MINUS_TWO = LatexGroup(children=(LatexText(text="-2"),))
+_OUTER_QUOTES = (LatexRaw(value="``"), LatexRaw(value="''"))
+_INNER_QUOTES = (LatexRaw(value="`"), LatexRaw(value="'"))
+
+
 @dataclass(frozen=True)
 class _ColumnHint:
     align: str | None = None
     width: str | None = None
 
 
+@dataclass(frozen=True, slots=True)
+class ConversionState:
+    """Options and caches shared by every context of one conversion.
+
+    Created once per ``convert_document``/``stream_convert`` call; derived
+    contexts share it by reference, so per-conversion features add a field
+    here without touching handler signatures or the cost of deriving contexts.
+
+    Attributes:
+        handlers: Tag handler mapping (lowercase tag -> handler) in use.
+        longtable_threshold: Tables with more rows than this become
+            ``longtable`` environments; None keeps every table a ``tabular``.
+        memo: Repeated-subtree memo, or None when nothing repeats.
+        stylesheet: Rules of the class profiles and the document's
+            ``<style>`` elements, or None when there are none.
+        anchors: Targets of in-document ``#id`` links, or None when no
+            link has a target.
+        image_root: Resolved directory that relative image sources are
+            resolved against to probe the size of images without ``width``
+            or ``height``; None leaves such images at their natural size.
+    """
+
+    handlers: Mapping[str, TagHandler]
+    longtable_threshold: int | None = None
+    memo: _SubtreeMemo | None = None
+    stylesheet: Stylesheet | None = None
+    anchors: _AnchorIndex | None = None
+    image_root: Path | None = None
+
+    def style_of(self, node: HtmlElement) -> InlineStyle:
+        """Return the computed style of ``node``.
+
+        Args:
+            node: The element being converted.
+
+        Returns:
+            The element's ``style`` attribute merged over the matching
+            stylesheet rules.
+        """
+        if self.stylesheet is None:
+            return parse_inline_style(node.attrs.get("style", ""))
+        return self.stylesheet.resolve(node.tag, node.attrs)
+
+
+@dataclass(frozen=True, slots=True)
+class ConversionContext:
+    """Position of the element being converted, plus the shared state.
+
+    Tag handlers receive the context of their element and pass it (or a
+    derived one) to ``convert_nodes`` for the element's children.
+
+    Attributes:
+        state: State shared by the whole conversion.
+        list_level: Current list nesting depth.
+        quote_level: Current inline quote nesting depth.
+    """
+
+    state: ConversionState
+    list_level: int = 0
+    quote_level: int = 0
+
+    def nested_list(self) -> ConversionContext:
+        """Return the context for the items of a nested list."""
+        return ConversionContext(self.state, self.list_level + 1, 0)
+
+    def nested_quote(self) -> ConversionContext:
+        """Return the context for the content of an inline quote."""
+        return ConversionContext(self.state, self.list_level, self.quote_level + 1)
+
+    def block(self) -> ConversionContext:
+        """Return the context for block content, where quote nesting restarts."""
+        if self.quote_level == 0:
+            return self
+        return ConversionContext(self.state, self.list_level, 0)
+
+
 def convert_document(
     document: HtmlDocument,
+    *,
+    handlers: Mapping[str, TagHandler] | None = None,
+    longtable_threshold: int | None = None,
+    class_profiles: Sequence[ClassProfile] = (),
+    image_root: str | Path | None = None,
 ) -> LatexDocumentAst:
-    """Convert an HTML document AST to a LaTeX document AST.
+    r"""Convert an HTML document AST to a LaTeX document AST.
 
     Args:
         document: The HTML document to convert.
+        handlers: Optional tag handler mapping (lowercase tag -> handler) to use
+            instead of the built-in one. See ``default_handlers()``.
+        longtable_threshold: Tables with more rows than this become
+            ``longtable`` environments, with ``thead`` rows repeated on every
+            page. None keeps every table a ``tabular``.
+        class_profiles: Editor class profiles (see ``CLASS_PROFILES``) whose
+            classes are styled like stylesheet rules; the document's own
+            ``<style>`` rules win ties against them.
+        image_root: Directory to resolve relative ``<img>`` sources against.
+            Local PNG, JPEG and GIF images without ``width`` or ``height``
+            then get their pixel size from the file header, scaled down to
+            ``\linewidth`` when wider (see ``probe_image_size``). None
+            disables probing.
 
     Returns:
         A LatexDocumentAst containing the converted content.
+
+    Identical element subtrees (same tags, attributes and text) converted at
+    the same list and quote level are converted once per call; later copies
+    reuse the same LaTeX node objects.
+
+    Links to ``#id`` become ``\hyperref[id]{...}`` (``\ref{id}`` when
+    empty) and the element with that ``id`` (or ``<a name>``) gets a
+    ``\label{id}``; ids are indexed during the walk that finds repeated
+    subtrees, so no extra pass is made. Links to missing ids keep their text.
     """
-    body = _convert_nodes(document.children)
-    return LatexDocumentAst(body=body)
+    context = _root_context(
+        document, handlers, longtable_threshold, class_profiles, image_root=image_root
+    )
+    return LatexDocumentAst(body=_convert_nodes(document.children, context))
 
 
-def _convert_nodes(
+def convert_nodes(
     nodes: tuple[HtmlNode, ...],
-    list_level: int = 0,
-    quote_level: int = 0,
+    context: ConversionContext,
 ) -> tuple[LatexNode, ...]:
-    output: list[LatexNode] = []
+    """Convert HTML nodes to LaTeX nodes using the context's tag handlers.
+
+    Custom tag handlers call this to convert the children of their element.
+
+    Args:
+        nodes: The HTML nodes to convert.
+        context: The context passed to the calling handler, or one derived
+            from it.
+
+    Returns:
+        The converted LaTeX nodes.
+    """
+    return _convert_nodes(nodes, context)
+
+
+def default_handlers() -> dict[str, TagHandler]:
+    """Return a copy of the built-in tag handler mapping.
+
+    Tags that are missing from the mapping fall back to rendering their
+    children with inline styles applied.
+
+    Returns:
+        A new dict mapping lowercase tag names to handlers.
+    """
+    return dict(_TAG_HANDLERS)
+
+
+def _convert_nodes(
+    nodes: tuple[HtmlNode, ...], context: ConversionContext
+) -> tuple[LatexNode, ...]:
+    return tuple(_iter_nodes(nodes, context))
+
+
+def _iter_nodes(nodes: Iterable[HtmlNode], context: ConversionContext) -> Iterator[LatexNode]:
+    """Convert ``nodes`` lazily; each node is converted when first requested."""
     for node in nodes:
-        output.extend(_convert_node(node, list_level, quote_level))
-    return tuple(output)
+        yield from _convert_node(node, context)
 
 
-def _convert_node(node: HtmlNode, list_level: int = 0, quote_level: int = 0) -> list[LatexNode]:
+def _convert_node(node: HtmlNode, context: ConversionContext) -> Sequence[LatexNode]:
     if isinstance(node, HtmlText):
+        if node.text == " ":
+            return _SPACE_ONLY
         return [LatexText(text=node.text)]
 
     if isinstance(node, HtmlElement):
-        tag = node.tag.lower()
-        if _is_math_container(node):
-            return _convert_math(node)
-        if tag in _INLINE_COMMANDS:
-            children = _convert_nodes(node.children, list_level, quote_level)
-            group = LatexGroup(children=children)
-            return _apply_inline_styles(
-                node, [LatexCommand(name=_INLINE_COMMANDS[tag], args=(group,))]
-            )
+        memo = context.state.memo
+        if memo is not None:
+            key = memo.key(node, context)
+            if key is not None:
+                cached = memo.results.get(key)
+                if cached is None:
+                    cached = memo.results[key] = tuple(_convert_element(node, context))
+                return cached
+        return _convert_element(node, context)
 
-        if tag == "small":
-            # Font size switch: {\small ...}
-            children = _convert_nodes(node.children, list_level, quote_level)
-            return _apply_inline_styles(
-                node,
-                [LatexRaw(value=r"{\small "), *children, LatexRaw(value="}")],
-            )
+    return []
 
-        if tag == "big":
-            # Font size switch: {\large ...} (deprecated HTML tag)
-            children = _convert_nodes(node.children, list_level, quote_level)
-            return _apply_inline_styles(
-                node,
-                [LatexRaw(value=r"{\large "), *children, LatexRaw(value="}")],
-            )
 
-        if tag == "mark":
-            # Highlighted text → colorbox (requires xcolor package)
-            children = _convert_nodes(node.children, list_level, quote_level)
-            group = LatexGroup(children=children)
-            color_group = LatexGroup(children=(LatexText(text="yellow"),))
-            return _apply_inline_styles(
-                node,
-                [LatexCommand(name="colorbox", args=(color_group, group))],
+def _convert_element(node: HtmlElement, context: ConversionContext) -> Sequence[LatexNode]:
+    if _is_math_container(node):
+        return _convert_math(node)
+    handler = context.state.handlers.get(node.tag.lower(), _convert_generic)
+    nodes = handler(node, context)
+    anchors = context.state.anchors
+    if anchors is not None:
+        label = anchors.label_for(node)
+        if label is not None:
+            return _attach_label(nodes, label)
+    return nodes
+
+
+class _SubtreeMemo:
+    """Per-conversion memo of converted subtrees, keyed by structural identity.
+
+    Subtrees are hash-consed bottom-up: each distinct (tag, attrs, child ids)
+    shape gets a small integer id, so keys stay shallow and hashing the whole
+    document is linear. Only elements whose shape occurs more than once are
+    tracked.
+    """
+
+    __slots__ = ("counts", "results", "shape_ids", "shapes")
+
+    def __init__(self) -> None:
+        # structural key -> shape id, and occurrences seen per shape id
+        self.shapes: dict[object, int] = {}
+        self.counts: list[int] = []
+        # id(element) -> shape id, for repeated shapes only
+        self.shape_ids: dict[int, int] = {}
+        # (shape id, list_level, quote_level) -> converted nodes
+        self.results: dict[tuple[int, int, int], tuple[LatexNode, ...]] = {}
+
+    @classmethod
+    def build(
+        cls, nodes: tuple[HtmlNode, ...], anchors: _AnchorIndex | None = None
+    ) -> _SubtreeMemo | None:
+        """Hash-cons ``nodes``; return None when no element subtree repeats.
+
+        Elements are also added to ``anchors`` when given, in the same walk.
+        """
+        memo = cls()
+        memo.observe(nodes, anchors)
+        if not memo.shape_ids:
+            return None
+        return memo
+
+    def observe(self, nodes: tuple[HtmlNode, ...], anchors: _AnchorIndex | None = None) -> None:
+        """Hash-cons ``nodes`` and track their elements with repeated shapes.
+
+        Replaces the tracked elements, so streaming conversion can observe
+        one top-level block at a time: shapes repeat once seen twice so far,
+        and only the current block's elements are held.
+        """
+        shapes = self.shapes
+        counts = self.counts
+        elements: list[tuple[HtmlElement, int]] = []
+
+        # Post-order walk with an explicit stack, so deep nesting cannot hit
+        # the recursion limit; ``shape_stack`` holds the ids of finished nodes.
+        stack: list[tuple[HtmlNode, bool]] = [(node, False) for node in reversed(nodes)]
+        shape_stack: list[int] = []
+        while stack:
+            node, expanded = stack.pop()
+            if isinstance(node, HtmlElement):
+                if not expanded:
+                    if anchors is not None:
+                        anchors.add(node)
+                    stack.append((node, True))
+                    stack.extend((child, False) for child in reversed(node.children))
+                    continue
+                split = len(shape_stack) - len(node.children)
+                child_ids = tuple(shape_stack[split:])
+                del shape_stack[split:]
+                key: object = (node.tag, tuple(node.attrs.items()), child_ids)
+            elif isinstance(node, HtmlText):
+                key = node.text
+            else:
+                key = (id(node),)
+            shape = shapes.setdefault(key, len(counts))
+            if shape == len(counts):
+                counts.append(0)
+            counts[shape] += 1
+            if isinstance(node, HtmlElement):
+                elements.append((node, shape))
+            shape_stack.append(shape)
+        self.shape_ids = {id(node): shape for node, shape in elements if counts[shape] > 1}
+
+    def key(self, node: HtmlElement, context: ConversionContext) -> tuple[int, int, int] | None:
+        shape = self.shape_ids.get(id(node))
+        if shape is None:
+            return None
+        return (shape, context.list_level, context.quote_level)
+
+
+class _AnchorIndex:
+    r"""Targets of in-document ``#fragment`` links, for ``\label``/``\ref``.
+
+    Filled during the memo's pre-scan walk: ``targets`` maps each ``id`` (or
+    ``<a name>``) to the first element carrying it and ``references`` holds
+    the fragments that links point to. ``link()`` then fixes the anchors
+    that are both, so every later lookup is a set membership test. A
+    streaming conversion cannot look ahead, so its index is open: every
+    anchor gets a label and every fragment link is resolved.
+    """
+
+    __slots__ = ("linked", "open", "references", "targets")
+
+    def __init__(self, *, open_world: bool = False, linked: frozenset[str] = frozenset()) -> None:
+        self.open = open_world
+        self.linked = linked
+        self.targets: dict[str, HtmlElement] = {}
+        self.references: set[str] = set()
+
+    def add(self, node: HtmlElement) -> None:
+        anchor = _anchor_name(node)
+        if anchor:
+            self.targets.setdefault(anchor, node)
+        if node.tag.lower() == "a":
+            href = node.attrs.get("href", "")
+            if len(href) > 1 and href[0] == "#":
+                self.references.add(href[1:])
+
+    def link(self) -> _AnchorIndex | None:
+        """Fix the linked anchors once every node is added; None if there are none."""
+        self.linked = frozenset(self.references.intersection(self.targets))
+        return self if self.linked or self.open else None
+
+    def resolves(self, fragment: str) -> bool:
+        """Return True if a link to ``#fragment`` has a target."""
+        if self.open:
+            return bool(fragment)
+        return fragment in self.linked
+
+    def label_for(self, node: HtmlElement) -> str | None:
+        """Return the label ``node`` defines, or None if nothing links to it."""
+        anchor = _anchor_name(node)
+        if anchor and (self.open or anchor in self.linked):
+            return _label_name(anchor)
+        return None
+
+
+def _anchor_name(node: HtmlElement) -> str | None:
+    anchor = node.attrs.get("id")
+    if not anchor and node.tag.lower() == "a":
+        return node.attrs.get("name")
+    return anchor
+
+
+def _label_name(anchor: str) -> str:
+    return _LABEL_UNSAFE_RE.sub("-", anchor)
+
+
+def _attach_label(nodes: Sequence[LatexNode], label: str) -> list[LatexNode]:
+    r"""Place ``\label`` where it picks up the number of the converted element."""
+    label_node = LatexCommand(name="label", args=(_raw_group(label),))
+    if nodes:
+        first = nodes[0]
+        if isinstance(first, LatexCommand) and first.name in _SECTION_COMMANDS:
+            return [first, label_node, *nodes[1:]]
+        if isinstance(first, LatexEnvironment) and first.name in {"figure", "table"}:
+            # After the caption, whose counter the label refers to
+            children = list(first.children)
+            position = next(
+                (
+                    index + 1
+                    for index, child in enumerate(children)
+                    if isinstance(child, LatexCommand) and child.name == "caption"
+                ),
+                len(children),
             )
+            children.insert(position, label_node)
+            return [replace(first, children=tuple(children)), *nodes[1:]]
+    return [label_node, *nodes]
 
-        if tag in INLINE_PASSTHROUGH:
-            children = _convert_nodes(node.children, list_level, quote_level)
-            return _apply_inline_styles(node, list(children))
-
-        if tag in _HEADING_COMMANDS:
-            children = _convert_nodes(node.children, list_level, quote_level)
-            group = LatexGroup(children=children)
-            return [LatexCommand(name=_HEADING_COMMANDS[tag], args=(group,))]
-
-        if tag == "br":
-            return [LatexCommand(name="newline")]
-
-        if tag == "center":
-            # Deprecated <center> tag → center environment
-            children = _convert_nodes(node.children, list_level, quote_level)
-            return [LatexEnvironment(name="center", children=tuple(children))]
-
-        if tag == "q":
-            # Inline quote element - use LaTeX backtick/apostrophe quotes
-            # Outer quotes: ``...''  Nested quotes: `...'
-            children = _convert_nodes(node.children, list_level, quote_level + 1)
-            if quote_level == 0:
-                # Outer quote: double backticks and double apostrophes
-                return [LatexRaw(value="``"), *children, LatexRaw(value="''")]
-            # Nested quote: single backtick and single apostrophe
-            return [LatexRaw(value="`"), *children, LatexRaw(value="'")]
-
-        if tag in {"p", "div"}:
-            # Check for text-align style
-            style = node.attrs.get("style", "")
-            align = _parse_text_align(style)
-            children = _convert_nodes(node.children, list_level, quote_level)
-            if align == "center":
-                return [LatexEnvironment(name="center", children=tuple(children))]
-            if align == "left":
-                return [LatexEnvironment(name="flushleft", children=tuple(children))]
-            if align == "right":
-                return [LatexEnvironment(name="flushright", children=tuple(children))]
-            return [*children, LatexCommand(name="par")]
-
-        if tag == "hr":
-            return [LatexCommand(name="hrule")]
-
-        if tag == "a":
-            href = node.attrs.get("href")
-            children = _convert_nodes(node.children, list_level, quote_level)
-            if not href:
-                return _apply_inline_styles(node, list(children))
-            href_group = LatexGroup(children=(LatexText(text=href),))
-            if children:
-                label_group = LatexGroup(children=tuple(children))
-                return _apply_inline_styles(
-                    node,
-                    [LatexCommand(name="href", args=(href_group, label_group))],
-                )
-            return _apply_inline_styles(node, [LatexCommand(name="url", args=(href_group,))])
-
-        if tag == "img":
-            src = node.attrs.get("src")
-            alt = node.attrs.get("alt")
-            if not src:
-                return [LatexText(text=alt)] if alt else []
-            # Build options for width/height attributes or style overrides
-            options: list[str] = []
-            style = node.attrs.get("style", "")
-            width = _parse_image_dimension(_parse_style_width(style), node.attrs.get("width"))
-            height = _parse_image_dimension(_parse_style_height(style), node.attrs.get("height"))
-            if width:
-                options.append(f"width={width}")
-            if height:
-                options.append(f"height={height}")
-            return [
+
+def _raw_group(value: str) -> LatexGroup:
+    return LatexGroup(children=(LatexRaw(value=value),))
+
+
+def _convert_inline_command(
+    command: str, node: HtmlElement, context: ConversionContext
+) -> list[LatexNode]:
+    children = _convert_nodes(node.children, context)
+    group = LatexGroup(children=children)
+    return _apply_inline_styles(node, [LatexCommand(name=command, args=(group,))], context)
+
+
+def _convert_size_switch(
+    switch: str, node: HtmlElement, context: ConversionContext
+) -> list[LatexNode]:
+    # Font size switch: {\small ...} / {\large ...}
+    children = _convert_nodes(node.children, context)
+    return _apply_inline_styles(
+        node,
+        [_size_switch_open(switch), *children, _GROUP_CLOSE],
+        context,
+    )
+
+
+def _convert_mark(node: HtmlElement, context: ConversionContext) -> list[LatexNode]:
+    # Highlighted text → colorbox (requires xcolor package)
+    children = _convert_nodes(node.children, context)
+    group = LatexGroup(children=children)
+    return _apply_inline_styles(
+        node,
+        [LatexCommand(name="colorbox", args=(_MARK_COLOR, group))],
+        context,
+    )
+
+
+def _convert_heading(
+    command: str, node: HtmlElement, context: ConversionContext
+) -> list[LatexNode]:
+    children = _convert_nodes(node.children, context)
+    group = LatexGroup(children=children)
+    return [LatexCommand(name=command, args=(group,))]
+
+
+def _convert_line_break(node: HtmlElement, context: ConversionContext) -> list[LatexNode]:
+    return [_NEWLINE]
+
+
+def _convert_center(node: HtmlElement, context: ConversionContext) -> list[LatexNode]:
+    # Deprecated <center> tag → center environment
+    children = _convert_nodes(node.children, context)
+    return [LatexEnvironment(name="center", children=tuple(children))]
+
+
+def _convert_inline_quote(node: HtmlElement, context: ConversionContext) -> list[LatexNode]:
+    # Inline quote element - use LaTeX backtick/apostrophe quotes
+    # Outer quotes: ``...''  Nested quotes: `...'
+    children = _convert_nodes(node.children, context.nested_quote())
+    # Outer quote: double backticks and double apostrophes; nested: single
+    opening, closing = _OUTER_QUOTES if context.quote_level == 0 else _INNER_QUOTES
+    return [opening, *children, closing]
+
+
+def _convert_paragraph(node: HtmlElement, context: ConversionContext) -> list[LatexNode]:
+    # Check for text-align style
+    style = context.state.style_of(node)
+    align = style.text_align
+    children = _apply_block_styles(style, list(_convert_nodes(node.children, context)))
+    if align == "center":
+        return [LatexEnvironment(name="center", children=tuple(children))]
+    if align == "left":
+        return [LatexEnvironment(name="flushleft", children=tuple(children))]
+    if align == "right":
+        return [LatexEnvironment(name="flushright", children=tuple(children))]
+    indent = _parse_css_length(style.indent)
+    if indent:
+        # Indented paragraph: {\leftskip=3em ...\par}
+        return [_leftskip_open(indent), *children, _PAR, _GROUP_CLOSE]
+    return [*children, _PAR]
+
+
+def _convert_hrule(node: HtmlElement, context: ConversionContext) -> list[LatexNode]:
+    return [_HRULE]
+
+
+def _convert_link(node: HtmlElement, context: ConversionContext) -> list[LatexNode]:
+    href = node.attrs.get("href")
+    children = _convert_nodes(node.children, context)
+    if not href:
+        return _apply_inline_styles(node, list(children), context)
+    if href[0] == "#":
+        return _convert_internal_link(node, href[1:], children, context)
+    href_group = LatexGroup(children=(LatexText(text=href),))
+    if children:
+        label_group = LatexGroup(children=tuple(children))
+        return _apply_inline_styles(
+            node,
+            [LatexCommand(name="href", args=(href_group, label_group))],
+            context,
+        )
+    return _apply_inline_styles(node, [LatexCommand(name="url", args=(href_group,))], context)
+
+
+def _convert_internal_link(
+    node: HtmlElement,
+    fragment: str,
+    children: tuple[LatexNode, ...],
+    context: ConversionContext,
+) -> list[LatexNode]:
+    # Fragment links point into this document: \hyperref to the target's
+    # \label, or just the text when there is no such target.
+    anchors = context.state.anchors
+    if anchors is None or not anchors.resolves(fragment):
+        return _apply_inline_styles(node, list(children), context)
+    label = _label_name(fragment)
+    if not children:
+        return [LatexCommand(name="ref", args=(_raw_group(label),))]
+    link = LatexCommand(
+        name="hyperref", args=(LatexGroup(children=tuple(children)),), options=(label,)
+    )
+    return _apply_inline_styles(node, [link], context)
+
+
+def _convert_image(node: HtmlElement, context: ConversionContext) -> list[LatexNode]:
+    src = node.attrs.get("src")
+    alt = node.attrs.get("alt")
+    if not src:
+        return [LatexText(text=alt)] if alt else []
+    # Build options for width/height attributes or style overrides
+    options: list[str] = []
+    style = context.state.style_of(node)
+    width = _parse_image_dimension(style.width, node.attrs.get("width"))
+    height = _parse_image_dimension(style.height, node.attrs.get("height"))
+    if width:
+        options.append(f"width={width}")
+    if height:
+        options.append(f"height={height}")
+    if not (width or height) and context.state.image_root is not None:
+        options.extend(_probed_image_options(src, context.state.image_root))
+    return [
+        LatexCommand(
+            name="includegraphics",
+            options=tuple(options),
+            args=(LatexGroup(children=(LatexText(text=src),)),),
+        )
+    ]
+
+
+def _probed_image_options(src: str, root: Path) -> list[str]:
+    """Size options for a local image: its pixel size, capped at the line width."""
+    if _URL_SCHEME_RE.match(src):
+        return []
+    path = (root / unquote(src.partition("?")[0].partition("#")[0])).resolve()
+    # Absolute sources, '..' and symlinks must not reach files outside the root.
+    if not path.is_relative_to(root):
+        return []
+    size = probe_image_size(path)
+    if size is None:
+        return []
+    # Asking for both the line width and the natural height while keeping
+    # the aspect ratio scales by whichever is smaller: at most natural size.
+    height = _parse_css_length(f"{size[1]}px")
+    return ["width=\\linewidth", f"height={height}", "keepaspectratio"]
+
+
+def _convert_blockquote(node: HtmlElement, context: ConversionContext) -> list[LatexNode]:
+    children = _convert_nodes(node.children, context)
+    return [LatexEnvironment(name="quote", children=tuple(children))]
+
+
+def _convert_preformatted(node: HtmlElement, context: ConversionContext) -> list[LatexNode]:
+    content = _extract_text(node)
+    return [
+        LatexEnvironment(
+            name="verbatim",
+            children=(LatexRaw(value=content),),
+        )
+    ]
+
+
+def _convert_table_element(node: HtmlElement, context: ConversionContext) -> list[LatexNode]:
+    return _convert_table(node, context)
+
+
+def _convert_list(node: HtmlElement, context: ConversionContext) -> list[LatexNode]:
+    tag = node.tag.lower()
+    ordered = tag == "ol"
+    reversed_list = False
+    env = "itemize" if tag == "ul" else "enumerate"
+    item_context = context.nested_list()
+    current_level = item_context.list_level
+    items: list[LatexNode] = []
+    if ordered:
+        reversed_list = "reversed" in node.attrs
+        list_type = _parse_list_type(node.attrs.get("type"))
+        if list_type is not None:
+            label_name = _list_label_name(current_level)
+            counter_name = _list_counter_name(current_level)
+            label_spec = LatexCommand(
+                name=list_type,
+                args=(_counter_group(counter_name),),
+            )
+            items.append(
                 LatexCommand(
-                    name="includegraphics",
-                    options=tuple(options),
-                    args=(LatexGroup(children=(LatexText(text=src),)),),
-                )
-            ]
-
-        if tag == "blockquote":
-            children = _convert_nodes(node.children, list_level, quote_level)
-            return [LatexEnvironment(name="quote", children=tuple(children))]
-
-        if tag == "pre":
-            content = _extract_text(node)
-            return [
-                LatexEnvironment(
-                    name="verbatim",
-                    children=(LatexRaw(value=content),),
+                    name="renewcommand",
+                    args=(
+                        LatexGroup(
+                            children=(LatexRaw(value=f"\\{label_name}"),),
+                        ),
+                        LatexGroup(
+                            children=(label_spec, _LABEL_DOT),
+                        ),
+                    ),
                 )
-            ]
-
-        if tag == "table":
-            return _convert_table(node, list_level)
-
-        if tag in {"ul", "ol"}:
-            ordered = tag == "ol"
-            reversed_list = False
-            env = "itemize" if tag == "ul" else "enumerate"
-            current_level = list_level + 1
-            items: list[LatexNode] = []
-            if ordered:
-                reversed_list = "reversed" in node.attrs
-                list_type = _parse_list_type(node.attrs.get("type"))
-                if list_type is not None:
-                    label_name = _list_label_name(current_level)
-                    counter_name = _list_counter_name(current_level)
-                    label_spec = LatexCommand(
-                        name=list_type,
-                        args=(LatexGroup(children=(LatexText(text=counter_name),)),),
-                    )
-                    items.append(
-                        LatexCommand(
-                            name="renewcommand",
-                            args=(
-                                LatexGroup(
-                                    children=(LatexRaw(value=f"\\{label_name}"),),
-                                ),
-                                LatexGroup(
-                                    children=(label_spec, LatexText(text=".")),
-                                ),
-                            ),
-                        )
-                    )
-                raw_start = node.attrs.get("start")
-                start = _parse_list_start(raw_start) if raw_start is not None else 1
-                if reversed_list:
-                    if raw_start is None:
-                        start = _count_list_items(node)
-                    if start >= 1:
-                        counter_name = _list_counter_name(current_level)
-                        items.append(
-                            LatexCommand(
-                                name="setcounter",
-                                args=(
-                                    LatexGroup(children=(LatexText(text=counter_name),)),
-                                    LatexGroup(children=(LatexText(text=str(start + 1)),)),
-                                ),
-                            )
-                        )
-                elif start > 1:
-                    counter_name = _list_counter_name(current_level)
-                    items.append(
-                        LatexCommand(
-                            name="setcounter",
-                            args=(
-                                LatexGroup(children=(LatexText(text=counter_name),)),
-                                LatexGroup(children=(LatexText(text=str(start - 1)),)),
-                            ),
-                        )
+            )
+        raw_start = node.attrs.get("start")
+        start = _parse_list_start(raw_start) if raw_start is not None else 1
+        if reversed_list:
+            if raw_start is None:
+                start = _count_list_items(node)
+            if start >= 1:
+                counter_name = _list_counter_name(current_level)
+                items.append(
+                    LatexCommand(
+                        name="setcounter",
+                        args=(
+                            _counter_group(counter_name),
+                            LatexGroup(children=(LatexText(text=str(start + 1)),)),
+                        ),
                     )
-            for child in node.children:
-                if isinstance(child, HtmlElement) and child.tag.lower() == "li":
-                    items.extend(_convert_list_item(child, current_level, ordered, reversed_list))
-            return [LatexEnvironment(name=env, children=tuple(items))]
+                )
+        elif start > 1:
+            counter_name = _list_counter_name(current_level)
+            items.append(
+                LatexCommand(
+                    name="setcounter",
+                    args=(
+                        _counter_group(counter_name),
+                        LatexGroup(children=(LatexText(text=str(start - 1)),)),
+                    ),
+                )
+            )
+    for child in node.children:
+        if isinstance(child, HtmlElement) and child.tag.lower() == "li":
+            items.extend(_convert_list_item(child, item_context, ordered, reversed_list))
+    return [LatexEnvironment(name=env, children=tuple(items))]
+
 
-        if tag == "dl":
-            items = _convert_description_list(node.children, list_level)
-            return [LatexEnvironment(name="description", children=tuple(items))]
+def _convert_description_list_element(
+    node: HtmlElement, context: ConversionContext
+) -> list[LatexNode]:
+    items = _convert_description_list(node.children, context)
+    return [LatexEnvironment(name="description", children=tuple(items))]
 
-        if tag == "figure":
-            return _convert_figure(node, list_level)
 
-        if tag == "figcaption":
-            # figcaption outside figure - just render content
-            children = _convert_nodes(node.children, list_level, quote_level)
-            return list(children)
+def _convert_figure_element(node: HtmlElement, context: ConversionContext) -> list[LatexNode]:
+    return _convert_figure(node, context)
 
-        if tag in BLOCK_PASSTHROUGH:
-            children = _convert_nodes(node.children, list_level, quote_level)
-            return list(children)
 
-        children = _convert_nodes(node.children, list_level, quote_level)
-        return _apply_inline_styles(node, list(children))
+def _convert_passthrough(node: HtmlElement, context: ConversionContext) -> list[LatexNode]:
+    # Block containers (and figcaption outside figure) just render content
+    children = _convert_nodes(node.children, context)
+    return _apply_block_styles(context.state.style_of(node), list(children))
 
+
+def _convert_generic(node: HtmlElement, context: ConversionContext) -> list[LatexNode]:
+    # Inline passthrough tags and unknown tags keep children and inline styles
+    children = _convert_nodes(node.children, context)
+    return _apply_inline_styles(node, list(children), context)
+
+
+def _convert_style_element(node: HtmlElement, context: ConversionContext) -> list[LatexNode]:
+    # Stylesheet text is applied through ConversionState.stylesheet, not rendered
     return []
 
 
+def _build_tag_handlers() -> dict[str, TagHandler]:
+    handlers: dict[str, TagHandler] = {}
+    for tag, command in _INLINE_COMMANDS.items():
+        handlers[tag] = partial(_convert_inline_command, command)
+    for tag, command in _HEADING_COMMANDS.items():
+        handlers[tag] = partial(_convert_heading, command)
+    for tag in INLINE_PASSTHROUGH:
+        handlers[tag] = _convert_generic
+    for tag in BLOCK_PASSTHROUGH:
+        handlers[tag] = _convert_passthrough
+    handlers.update(
+        {
+            "small": partial(_convert_size_switch, "small"),
+            "big": partial(_convert_size_switch, "large"),  # deprecated HTML tag
+            "mark": _convert_mark,
+            "br": _convert_line_break,
+            "center": _convert_center,
+            "q": _convert_inline_quote,
+            "p": _convert_paragraph,
+            "div": _convert_paragraph,
+            "hr": _convert_hrule,
+            "a": _convert_link,
+            "img": _convert_image,
+            "blockquote": _convert_blockquote,
+            "pre": _convert_preformatted,
+            "table": _convert_table_element,
+            "ul": _convert_list,
+            "ol": _convert_list,
+            "dl": _convert_description_list_element,
+            "figure": _convert_figure_element,
+            "figcaption": _convert_passthrough,
+            "style": _convert_style_element,
+        }
+    )
+    return handlers
+
+
+_TAG_HANDLERS: Mapping[str, TagHandler] = MappingProxyType(_build_tag_handlers())
+
+
+def _root_context(
+    document: HtmlDocument,
+    handlers: Mapping[str, TagHandler] | None,
+    longtable_threshold: int | None,
+    class_profiles: Sequence[ClassProfile] = (),
+    *,
+    streaming: bool = False,
+    anchors: _AnchorIndex | None = None,
+    image_root: str | Path | None = None,
+) -> ConversionContext:
+    """Return the top-level context for converting ``document``.
+
+    With ``streaming`` the document is not scanned up front; each top-level
+    block must instead be passed to ``ConversionState.memo.observe`` before it
+    is converted. ``anchors`` supplies link targets found elsewhere, for
+    converting part of a document; otherwise they are found while scanning.
+    """
+    if streaming:
+        memo: _SubtreeMemo | None = _SubtreeMemo()
+        anchors = _AnchorIndex(open_world=True)
+    elif anchors is None:
+        scanned = _AnchorIndex()
+        memo = _SubtreeMemo.build(document.children, scanned)
+        anchors = scanned.link()
+    else:
+        memo = _SubtreeMemo.build(document.children)
+    state = ConversionState(
+        handlers=_TAG_HANDLERS if handlers is None else handlers,
+        longtable_threshold=longtable_threshold,
+        memo=memo,
+        anchors=anchors,
+        stylesheet=_document_stylesheet(
+            document.children, compile_class_profiles(tuple(class_profiles))
+        ),
+        image_root=None if image_root is None else Path(image_root).resolve(),
+    )
+    return ConversionContext(state=state)
+
+
+def _document_stylesheet(
+    children: tuple[HtmlNode, ...], base: tuple[StyleRule, ...]
+) -> Stylesheet | None:
+    """Index ``base`` plus the top-level ``<style>`` elements, where head styles end up.
+
+    A new stylesheet is built per conversion so its computed-style cache is
+    dropped with the conversion.
+    """
+    css = [
+        _extract_text(child)
+        for child in children
+        if isinstance(child, HtmlElement) and child.tag.lower() == "style"
+    ]
+    stylesheet = parse_stylesheet("\n".join(css), base=base) if css else Stylesheet(base)
+    return stylesheet if stylesheet.rules else None
+
+
 def _convert_list_item(
     node: HtmlElement,
-    list_level: int,
+    context: ConversionContext,
     ordered: bool,
     reversed_list: bool,
 ) -> list[LatexNode]:
     prefix: list[LatexNode] = []
     if ordered and reversed_list:
-        counter_name = _list_counter_name(list_level)
+        counter_name = _list_counter_name(context.list_level)
         prefix.append(
             LatexCommand(
                 name="addtocounter",
                 args=(
-                    LatexGroup(children=(LatexText(text=counter_name),)),
-                    LatexGroup(children=(LatexText(text="-2"),)),
+                    _counter_group(counter_name),
+                    _MINUS_TWO,
                 ),
             )
         )
     if ordered and not reversed_list:
         value = _parse_list_value(node.attrs.get("value"))
         if value is not None and value != 1:
-            counter_name = _list_counter_name(list_level)
+            counter_name = _list_counter_name(context.list_level)
             prefix.append(
                 LatexCommand(
                     name="setcounter",
                     args=(
-                        LatexGroup(children=(LatexText(text=counter_name),)),
+                        _counter_group(counter_name),
                         LatexGroup(children=(LatexText(text=str(value - 1)),)),
                     ),
                 )
             )
-    children = _convert_nodes(node.children, list_level)
-    return [*prefix, LatexCommand(name="item"), *children]
+    children = _convert_nodes(node.children, context.block())
+    return [*prefix, _ITEM, *children]
 
 
 def _convert_description_list(
     children: tuple[HtmlNode, ...],
-    list_level: int,
+    context: ConversionContext,
 ) -> list[LatexNode]:
     items: list[LatexNode] = []
     pending_label: str | None = None
@@ -351,8 +887,8 @@ def _convert_description_list(
             continue
         if tag == "dd":
             options = (pending_label,) if pending_label else ()
-            items.append(LatexCommand(name="item", options=options))
-            items.extend(_convert_nodes(child.children, list_level))
+            items.append(LatexCommand(name="item", options=options) if options else _ITEM)
+            items.extend(_convert_nodes(child.children, context.block()))
             pending_label = None
 
     if pending_label:
@@ -391,47 +927,12 @@ def _parse_list_type(value: str | None) -> str | None:
     return mapping.get(value)
 
 
-_TEXT_ALIGN_RE = re.compile(r"text-align\s*:\s*(left|center|right)", re.IGNORECASE)
-_STYLE_WIDTH_RE = re.compile(r"width\s*:\s*([^;]+)", re.IGNORECASE)
-_STYLE_HEIGHT_RE = re.compile(r"height\s*:\s*([^;]+)", re.IGNORECASE)
 _CSS_LENGTH_RE = re.compile(r"^\s*([0-9]+(?:\.[0-9]+)?)\s*([a-z%]*)\s*$", re.IGNORECASE)
 _NUMERIC_RE = re.compile(r"^\s*[0-9]+(?:\.[0-9]+)?\s*$")
-
-
-def _parse_text_align(style: str) -> str | None:
-    """Extract text-align value from CSS style string."""
-    match = _TEXT_ALIGN_RE.search(style)
-    if match:
-        return match.group(1).lower()
-    return None
-
-
-def _parse_style_width(style: str) -> str | None:
-    match = _STYLE_WIDTH_RE.search(style)
-    if not match:
-        return None
-    return match.group(1).strip()
-
-
-def _parse_style_height(style: str) -> str | None:
-    match = _STYLE_HEIGHT_RE.search(style)
-    if not match:
-        return None
-    return match.group(1).strip()
-
-
-def _parse_style_map(style: str) -> dict[str, str]:
-    parsed: dict[str, str] = {}
-    for chunk in style.split(";"):
-        if ":" not in chunk:
-            continue
-        key, value = chunk.split(":", 1)
-        key = key.strip().lower()
-        value = value.strip().lower()
-        if not key or not value:
-            continue
-        parsed[key] = value
-    return parsed
+# Two letters at least, so Windows drive letters are not taken for schemes
+_URL_SCHEME_RE = re.compile(r"^[a-z][a-z0-9+.-]+:", re.IGNORECASE)
+# Characters kept in \label names; others become '-'
+_LABEL_UNSAFE_RE = re.compile(r"[^A-Za-z0-9_:.-]")
 
 
 def _format_float(value: float) -> str:
@@ -467,43 +968,92 @@ def _parse_css_length(value: str | None) -> str | None:
     return None
 
 
-def _inline_style_commands(style: str) -> tuple[str, ...]:
-    if not style:
-        return ()
-    parsed = _parse_style_map(style)
-    commands: list[str] = []
-    weight = parsed.get("font-weight")
-    if weight and weight.isdigit() and int(weight) >= 600:
-        commands.append("textbf")
-    font_style = parsed.get("font-style")
-    if font_style in {"italic", "oblique"}:
-        commands.append("textit")
-    text_decoration = parsed.get("text-decoration")
-    if text_decoration:
-        tokens = {part for part in text_decoration.replace(",", " ").split() if part}
-        if "underline" in tokens:
-            commands.append("underline")
-        if "line-through" in tokens:
-            commands.append("sout")
-    return tuple(commands)
-
-
-def _apply_inline_styles(node: HtmlElement, nodes: list[LatexNode]) -> list[LatexNode]:
+def _apply_inline_styles(
+    node: HtmlElement, nodes: list[LatexNode], context: ConversionContext
+) -> list[LatexNode]:
     if not nodes:
         return nodes
     tag = node.tag.lower()
     if tag in BLOCK_TAGS or tag in {"br", "img"}:
         return nodes
-    commands = _inline_style_commands(node.attrs.get("style", ""))
-    if not commands:
+    return _wrap_nodes(nodes, context.state.style_of(node).wrappers)
+
+
+def _apply_block_styles(style: InlineStyle, nodes: list[LatexNode]) -> list[LatexNode]:
+    """Apply the font and color styles of a block element to its content.
+
+    Weight, shape, family, size and color become declarations in a group
+    around the content, so they carry over nested paragraphs and lists.
+    Underline, strike-through and background, which CSS does not inherit,
+    wrap the content only when it is inline.
+    """
+    if not nodes or not style.wrappers:
+        return nodes
+    declarations: list[LatexNode] = []
+    inline: list[InlineWrapper] = []
+    for wrapper in style.wrappers:
+        if wrapper.switch:
+            declarations.append(_declaration(wrapper.command))
+        elif wrapper.command in _DECLARATIONS:
+            declarations.append(_declaration(_DECLARATIONS[wrapper.command]))
+        elif wrapper.command == "textcolor":
+            declarations.append(
+                LatexCommand(name="color", args=wrapper.args, options=wrapper.options)
+            )
+        else:
+            inline.append(wrapper)
+    if inline and not any(_is_block_output(child) for child in nodes):
+        nodes = _wrap_nodes(nodes, tuple(inline))
+    if declarations:
+        nodes = [_GROUP_OPEN, *declarations, *nodes, _GROUP_CLOSE]
+    return nodes
+
+
+# Declaration forms of font commands, which may span paragraphs
+_DECLARATIONS = {"textbf": "bfseries", "textit": "itshape", "texttt": "ttfamily"}
+
+
+@cache
+def _declaration(name: str) -> LatexRaw:
+    return LatexRaw(value=f"\\{name} ")
+
+
+def _is_block_output(node: LatexNode) -> bool:
+    if isinstance(node, LatexCommand):
+        return node.name == "par" or node.name in _SECTION_COMMANDS
+    return isinstance(node, (LatexEnvironment, LatexTabular))
+
+
+def _wrap_nodes(nodes: list[LatexNode], wrappers: tuple[InlineWrapper, ...]) -> list[LatexNode]:
+    """Wrap ``nodes`` in the LaTeX forms of inline style wrappers, innermost first."""
+    if not wrappers:
         return nodes
     wrapped: list[LatexNode] = nodes
-    for command in commands:
+    for wrapper in wrappers:
+        if wrapper.switch:
+            wrapped = [_size_switch_open(wrapper.command), *wrapped, _GROUP_CLOSE]
+            continue
         group = LatexGroup(children=tuple(wrapped))
-        wrapped = [LatexCommand(name=command, args=(group,))]
+        wrapped = [
+            LatexCommand(name=wrapper.command, args=(*wrapper.args, group), options=wrapper.options)
+        ]
     return wrapped
 
 
+@cache
+def _size_switch_open(switch: str) -> LatexRaw:
+    return LatexRaw(value=f"{{\\{switch} ")
+
+
+_GROUP_OPEN = LatexRaw(value="{")
+_GROUP_CLOSE = LatexRaw(value="}")
+
+
+@cache
+def _leftskip_open(length: str) -> LatexRaw:
+    return LatexRaw(value=f"{{\\leftskip={length} ")
+
+
 def _parse_image_dimension(style_value: str | None, attr_value: str | None) -> str | None:
     if style_value:
         parsed = _parse_css_length(style_value)
@@ -522,26 +1072,26 @@ def _parse_image_dimension(style_value: str | None, attr_value: str | None) -> s
     return None
 
 
-def _parse_col_align(node: HtmlElement) -> str | None:
+def _parse_col_align(node: HtmlElement, style: InlineStyle) -> str | None:
     align_attr = node.attrs.get("align", "").lower()
     if align_attr in ("left", "center", "right"):
         return {"left": "l", "center": "c", "right": "r"}[align_attr]
-    style = node.attrs.get("style", "")
-    text_align = _parse_text_align(style)
+    text_align = style.text_align
     if text_align in ("left", "center", "right"):
         return {"left": "l", "center": "c", "right": "r"}[text_align]
     return None
 
 
-def _parse_col_width(node: HtmlElement) -> str | None:
-    style_width = _parse_style_width(node.attrs.get("style", ""))
+def _parse_col_width(node: HtmlElement, style: InlineStyle) -> str | None:
+    style_width = style.width
     raw_width = style_width or node.attrs.get("width")
     return _parse_css_length(raw_width)
 
 
-def _expand_colgroup(colgroup: HtmlElement) -> list[_ColumnHint]:
-    group_align = _parse_col_align(colgroup)
-    group_width = _parse_col_width(colgroup)
+def _expand_colgroup(colgroup: HtmlElement, state: ConversionState) -> list[_ColumnHint]:
+    style = state.style_of(colgroup)
+    group_align = _parse_col_align(colgroup, style)
+    group_width = _parse_col_width(colgroup, style)
     cols = [
         child
         for child in colgroup.children
@@ -550,31 +1100,32 @@ def _expand_colgroup(colgroup: HtmlElement) -> list[_ColumnHint]:
     if cols:
         hints: list[_ColumnHint] = []
         for col in cols:
-            hints.extend(_expand_col(col, group_align, group_width))
+            hints.extend(_expand_col(col, group_align, group_width, state))
         return hints
     span = _parse_span(colgroup.attrs.get("span"))
     return [_ColumnHint(align=group_align, width=group_width) for _ in range(span)]
 
 
 def _expand_col(
-    col: HtmlElement, group_align: str | None, group_width: str | None
+    col: HtmlElement, group_align: str | None, group_width: str | None, state: ConversionState
 ) -> list[_ColumnHint]:
-    align = _parse_col_align(col) or group_align
-    width = _parse_col_width(col) or group_width
+    style = state.style_of(col)
+    align = _parse_col_align(col, style) or group_align
+    width = _parse_col_width(col, style) or group_width
     span = _parse_span(col.attrs.get("span"))
     return [_ColumnHint(align=align, width=width) for _ in range(span)]
 
 
-def _extract_column_hints(table: HtmlElement) -> list[_ColumnHint]:
+def _extract_column_hints(table: HtmlElement, state: ConversionState) -> list[_ColumnHint]:
     hints: list[_ColumnHint] = []
     for child in table.children:
         if not isinstance(child, HtmlElement):
             continue
         tag = child.tag.lower()
         if tag == "colgroup":
-            hints.extend(_expand_colgroup(child))
+            hints.extend(_expand_colgroup(child, state))
         elif tag == "col":
-            hints.extend(_expand_col(child, None, None))
+            hints.extend(_expand_col(child, None, None, state))
     return hints
 
 
@@ -588,25 +1139,20 @@ def _column_spec_for(align: str, width: str | None) -> str:
     return f"p{{{width}}}"
 
 
-def _build_column_specs(
-    all_row_cells: list[list[HtmlElement]],
-    max_columns: int,
-    column_hints: list[_ColumnHint],
-) -> list[str]:
-    detected = _detect_column_alignments(all_row_cells, max_columns)
+def _build_column_specs(grid: _TableGrid, column_hints: list[_ColumnHint]) -> list[str]:
     specs: list[str] = []
-    for index in range(max_columns):
+    for index in range(grid.columns):
         hint = column_hints[index] if index < len(column_hints) else None
-        align = hint.align if hint and hint.align else detected[index]
+        align = hint.align if hint and hint.align else grid.alignments[index]
         width = hint.width if hint and hint.width else None
         specs.append(_column_spec_for(align, width))
     return specs
 
 
-def _parse_cell_align(node: HtmlElement) -> str:
+def _parse_cell_align(node: HtmlElement, style: InlineStyle) -> str:
     """Extract alignment for a table cell (td/th).
 
-    Checks both the legacy 'align' attribute and CSS 'style' attribute.
+    Checks both the legacy 'align' attribute and the cell's computed style.
     Returns LaTeX column spec character: 'l', 'c', or 'r'.
     Defaults to 'l' (left) if no alignment specified.
     """
@@ -615,60 +1161,25 @@ def _parse_cell_align(node: HtmlElement) -> str:
     if align_attr in ("left", "center", "right"):
         return {"left": "l", "center": "c", "right": "r"}[align_attr]
 
-    # Check CSS style attribute
-    style = node.attrs.get("style", "")
-    text_align = _parse_text_align(style)
+    # Check CSS style
+    text_align = style.text_align
     if text_align in ("left", "center", "right"):
         return {"left": "l", "center": "c", "right": "r"}[text_align]
 
     return "l"  # Default to left
 
 
-def _detect_column_alignments(
-    all_row_cells: list[list[HtmlElement]],
-    max_columns: int,
-) -> list[str]:
-    """Detect dominant alignment for each column.
-
-    Analyzes all cells in each column and returns the most common alignment.
-    Cells with colspan > 1 are excluded from the count since they use multicolumn.
-    """
-    # Count alignments per column
-    column_counts: list[dict[str, int]] = [{"l": 0, "c": 0, "r": 0} for _ in range(max_columns)]
-
-    for row_cells in all_row_cells:
-        col = 0
-        for cell in row_cells:
-            if col >= max_columns:
-                break
-            colspan = _parse_span(cell.attrs.get("colspan"))
-            # Only count single-cell alignments (colspan cells use multicolumn)
-            if colspan == 1:
-                align = _parse_cell_align(cell)
-                column_counts[col][align] += 1
-            col += colspan
-
-    # Determine dominant alignment for each column
-    alignments: list[str] = []
-    for counts in column_counts:
-        # Find the most common alignment (prefer 'l' on ties)
-        max_count = max(counts.values())
-        if counts["l"] == max_count:
-            alignments.append("l")
-        elif counts["c"] == max_count:
-            alignments.append("c")
-        else:
-            alignments.append("r")
-
-    return alignments
-
-
 def _count_list_items(node: HtmlElement) -> int:
     return sum(
         1 for child in node.children if isinstance(child, HtmlElement) and child.tag.lower() == "li"
     )
 
 
+@cache
+def _counter_group(counter_name: str) -> LatexGroup:
+    return LatexGroup(children=(LatexText(text=counter_name),))
+
+
 def _list_counter_name(level: int) -> str:
     counters = ("enumi", "enumii", "enumiii", "enumiv")
     index = min(max(level, 1), len(counters)) - 1
@@ -679,13 +1190,29 @@ def _list_label_name(level: int) -> str:
     return f"label{_list_counter_name(level)}"
 
 
-def _extract_text(node: HtmlElement) -> str:
+def _extract_text(node: HtmlElement, limit: int | None = None) -> str:
+    """Return the text of ``node``'s descendants in document order.
+
+    The subtree is walked once with an explicit stack and joined once, so
+    deep nesting neither copies text per level nor hits the recursion limit.
+    With ``limit`` the walk stops early and at most ``limit`` characters are
+    returned.
+    """
     parts: list[str] = []
-    for child in node.children:
-        if isinstance(child, HtmlText):
-            parts.append(child.text)
-        elif isinstance(child, HtmlElement):
-            parts.append(_extract_text(child))
+    size = 0
+    stack = [iter(node.children)]
+    while stack:
+        for child in stack[-1]:
+            if isinstance(child, HtmlText):
+                parts.append(child.text)
+                size += len(child.text)
+                if limit is not None and size >= limit:
+                    return "".join(parts)[:limit]
+            elif isinstance(child, HtmlElement):
+                stack.append(iter(child.children))
+                break
+        else:
+            stack.pop()
     return "".join(parts)
 
 
@@ -695,27 +1222,31 @@ def _is_math_container(node: HtmlElement) -> bool:
     attrs = node.attrs
     if "data-latex" in attrs or "data-math" in attrs:
         return True
-    classes = _class_set(attrs.get("class"))
-    return bool(classes & {"math-tex", "math-tex-block", "math-display", "math-inline"})
+    return parse_class_attribute(attrs.get("class")).math
 
 
 def _convert_math(node: HtmlElement) -> list[LatexNode]:
-    content = _extract_math_payload(node).strip()
+    payload, packages = _extract_math_payload(node)
+    content = payload.strip()
     if not content:
         return []
     content, display_override = _strip_math_delimiters(content)
     display = display_override if display_override is not None else _is_display_math(node)
     if display:
-        return [LatexRaw(value=f"\\[{content}\\]")]
-    return [LatexRaw(value=f"\\({content}\\)")]
+        return [LatexRaw(value=f"\\[{content}\\]", packages=packages)]
+    return [LatexRaw(value=f"\\({content}\\)", packages=packages)]
 
 
-def _extract_math_payload(node: HtmlElement) -> str:
+def _extract_math_payload(node: HtmlElement) -> tuple[str, tuple[str, ...]]:
     if "data-latex" in node.attrs:
-        return node.attrs["data-latex"]
+        return node.attrs["data-latex"], ()
     if "data-math" in node.attrs:
-        return node.attrs["data-math"]
-    return _extract_text(node)
+        return node.attrs["data-math"], ()
+    if node.tag.lower() == "math":
+        latex = convert_mathml(node)
+        if latex is not None:
+            return latex.value, latex.packages
+    return _extract_text(node), ()
 
 
 def _strip_math_delimiters(text: str) -> tuple[str, bool | None]:
@@ -734,18 +1265,14 @@ def _is_display_math(node: HtmlElement) -> bool:
     tag = node.tag.lower()
     if tag in {"div", "p"}:
         return True
-    classes = _class_set(node.attrs.get("class"))
-    return bool(classes & {"math-tex-block", "math-display"})
-
-
-def _class_set(value: str | None) -> set[str]:
-    if not value:
-        return set()
-    return {part for part in value.split() if part}
+    if tag == "math" and node.attrs.get("display") == "block":
+        return True
+    return parse_class_attribute(node.attrs.get("class")).display_math
 
 
-def _convert_figure(figure: HtmlElement, list_level: int) -> list[LatexNode]:
+def _convert_figure(figure: HtmlElement, context: ConversionContext) -> list[LatexNode]:
     """Convert HTML <figure> to LaTeX figure environment."""
+    context = context.block()
     content: list[LatexNode] = []
     caption: LatexCommand | None = None
 
@@ -754,13 +1281,13 @@ def _convert_figure(figure: HtmlElement, list_level: int) -> list[LatexNode]:
             continue
         tag = child.tag.lower()
         if tag == "figcaption":
-            nodes = _convert_nodes(child.children, list_level)
+            nodes = _convert_nodes(child.children, context)
             # Remove \par from caption content
             filtered: list[LatexNode] = []
             for node in nodes:
                 if isinstance(node, LatexCommand) and node.name == "par":
                     if filtered:
-                        filtered.append(LatexText(text=" "))
+                        filtered.append(_SPACE)
                 else:
                     filtered.append(node)
             while filtered and isinstance(filtered[-1], LatexText) and filtered[-1].text == " ":
@@ -768,13 +1295,13 @@ def _convert_figure(figure: HtmlElement, list_level: int) -> list[LatexNode]:
             if filtered:
                 caption = LatexCommand(name="caption", args=(LatexGroup(children=tuple(filtered)),))
         else:
-            content.extend(_convert_node(child, list_level))
+            content.extend(_convert_node(child, context))
 
     if not content and caption is None:
         return []
 
     # Add centering and caption to figure environment
-    figure_content: list[LatexNode] = [LatexCommand(name="centering")]
+    figure_content: list[LatexNode] = [_CENTERING]
     figure_content.extend(content)
     if caption:
         figure_content.append(caption)
@@ -782,121 +1309,243 @@ def _convert_figure(figure: HtmlElement, list_level: int) -> list[LatexNode]:
     return [LatexEnvironment(name="figure", children=tuple(figure_content))]
 
 
-def _convert_table(table: HtmlElement, list_level: int) -> list[LatexNode]:
-    rows = _collect_table_rows(table)
-    if not rows:
+def _convert_table(table: HtmlElement, context: ConversionContext) -> list[LatexNode]:
+    prepared = _prepare_table(table, context.block())
+    if prepared is None:
         return []
-
-    row_cells = [_extract_row_cells(row) for row in rows]
-
-    # Calculate max columns accounting for colspan
-    max_columns = max((_row_colspan(cells) for cells in row_cells), default=0)
-    if max_columns <= 0:
-        return []
-
-    # Detect column alignments from cell attributes and apply colgroup/col hints
-    column_hints = _extract_column_hints(table)
-    column_specs = _build_column_specs(row_cells, max_columns, column_hints)
-
-    # Render rows with rowspan tracking and alignment
-    rendered_rows = _render_table_rows(row_cells, max_columns, list_level)
-
-    column_spec = LatexGroup(children=(LatexRaw(value="".join(column_specs)),))
-    tabular = LatexEnvironment(
-        name="tabular",
-        args=(column_spec,),
-        children=tuple(LatexRaw(value=row) for row in rendered_rows),
+    head, body_rows, float_caption = prepared
+    tabular = LatexTabular(
+        column_spec=head.column_spec,
+        rows=tuple(body_rows),
+        name=head.name,
+        header_rows=head.header_rows,
+        caption=head.caption,
     )
-
-    caption = _extract_table_caption(table, list_level)
-    if caption is None:
+    if float_caption is None:
         return [tabular]
     return [
         LatexEnvironment(
             name="table",
-            children=(caption, tabular),
+            children=(float_caption, tabular),
         )
     ]
 
 
-def _render_table_rows(
-    all_row_cells: list[list[HtmlElement]],
-    max_columns: int,
-    list_level: int,
-) -> list[str]:
-    """Render table rows with rowspan support using multirow.
+def _prepare_table(
+    table: HtmlElement, context: ConversionContext
+) -> tuple[LatexTabular, Iterator[LatexTableRow], LatexCommand | None] | None:
+    """Lay out a table and return its head, a lazy body-row iterator and float caption.
 
-    Tracks which columns are "occupied" by cells spanning multiple rows
-    and inserts empty placeholders in subsequent rows.
+    The head carries the column spec and, for ``longtable``, the caption and
+    ``thead`` header rows. A ``tabular`` is wrapped in a ``table`` float when
+    it has a caption, returned as the third item. Returns None for a table
+    without cells.
     """
-    # occupied[col] = number of rows remaining that this column is occupied
-    occupied: dict[int, int] = {}
-    rendered_rows: list[str] = []
+    rows = _collect_table_rows(table)
+    if not rows:
+        return None
+
+    grid = _build_table_grid(rows, context.state.style_of)
+    if grid is None:
+        return None
+
+    # Apply colgroup/col hints on top of the detected column alignments
+    column_hints = _extract_column_hints(table, context.state)
+    column_spec = "".join(_build_column_specs(grid, column_hints))
+    caption = _extract_table_caption(table, context)
+
+    threshold = context.state.longtable_threshold
+    if threshold is None or len(rows) <= threshold:
+        head = LatexTabular(column_spec=column_spec)
+        return head, _iter_table_rows(grid, context), caption
+
+    header_count = _count_header_rows(table)
+    head = LatexTabular(
+        column_spec=column_spec,
+        name="longtable",
+        header_rows=tuple(_iter_table_rows(grid, context, 0, header_count)),
+        caption=caption,
+    )
+    return head, _iter_table_rows(grid, context, header_count), None
+
+
+def _stream_table(
+    node: HtmlNode, context: ConversionContext
+) -> tuple[LatexTabular, Iterator[LatexTableRow]] | None:
+    """Return the head and lazy body rows of ``node`` if it converts to a longtable.
+
+    Used by ``stream_convert`` to emit long tables row by row. Returns None
+    for anything else, including tables handled by a custom tag handler.
+    """
+    if (
+        context.state.longtable_threshold is None
+        or not isinstance(node, HtmlElement)
+        or node.tag.lower() != "table"
+        or context.state.handlers.get("table") is not _convert_table_element
+        or _is_math_container(node)
+    ):
+        return None
+    prepared = _prepare_table(node, context.block())
+    if prepared is None or prepared[0].name != "longtable":
+        return None
+    head, body_rows, _ = prepared
+    return head, body_rows
+
+
+_EMPTY_SLOT = -1
+_ALIGN_INDEX = {"l": 0, "c": 1, "r": 2}
+
+
+@dataclass(frozen=True)
+class _TableGrid:
+    """Cell placement for one table, computed in a single pass over its cells.
+
+    Cells are numbered in document order. Per-cell data lives in parallel
+    compact sequences indexed by that number; ``layout`` lists, for each row,
+    the cell number rendered in each slot, or ``_EMPTY_SLOT`` for a column
+    covered by a rowspan from above or padding at the end of a short row.
+
+    Attributes:
+        cells: Every td/th element, in document order.
+        colspans: Parsed ``colspan`` per cell.
+        rowspans: Parsed ``rowspan`` per cell.
+        aligns: One alignment character (``l``/``c``/``r``) per cell.
+        layout: Rendered slots for each row.
+        columns: Column count (widest row by colspan sum).
+        alignments: Dominant alignment character per column.
+    """
+
+    cells: tuple[HtmlElement, ...]
+    colspans: array[int]
+    rowspans: array[int]
+    aligns: str
+    layout: tuple[tuple[int, ...], ...]
+    columns: int
+    alignments: str
 
-    for row_cells in all_row_cells:
-        rendered_cells: list[str] = []
-        col = 0
-        cell_idx = 0
 
-        while col < max_columns:
-            # Check if this column is occupied by a rowspan from a previous row
-            if col in occupied and occupied[col] > 0:
-                rendered_cells.append("")  # Empty placeholder for multirow
+def _build_table_grid(
+    rows: list[HtmlElement], style_of: Callable[[HtmlElement], InlineStyle]
+) -> _TableGrid | None:
+    """Parse spans and alignment once per cell and place cells on the grid.
+
+    Returns None when the table has no cells. Runs in time linear in the number
+    of cells plus grid slots.
+    """
+    cells: list[HtmlElement] = []
+    colspans = array("I")
+    rowspans = array("I")
+    aligns: list[str] = []
+    row_bounds: list[tuple[int, int]] = []
+    columns = 0
+    for row in rows:
+        start = len(cells)
+        width = 0
+        for cell in _extract_row_cells(row):
+            attrs = cell.attrs
+            colspan = _parse_span(attrs.get("colspan"))
+            cells.append(cell)
+            colspans.append(colspan)
+            rowspans.append(_parse_span(attrs.get("rowspan")))
+            aligns.append(_parse_cell_align(cell, style_of(cell)))
+            width += colspan
+        row_bounds.append((start, len(cells)))
+        columns = max(columns, width)
+    if columns <= 0:
+        return None
+
+    # occupied[col] = rows still covered by a rowspan from an earlier row;
+    # counts[col * 3 + k] = single-column cells with alignment "lcr"[k].
+    occupied = array("I", bytes(4 * columns))
+    counts = array("I", bytes(4 * 3 * columns))
+    layout: list[tuple[int, ...]] = []
+    for start, end in row_bounds:
+        slots: list[int] = []
+        col = 0
+        index = start
+        while col < columns:
+            if occupied[col]:
                 occupied[col] -= 1
-                if occupied[col] == 0:
-                    del occupied[col]
+                slots.append(_EMPTY_SLOT)
                 col += 1
                 continue
-
-            # Get the next cell from this row
-            if cell_idx < len(row_cells):
-                cell = row_cells[cell_idx]
-                cell_idx += 1
-
-                colspan = _parse_span(cell.attrs.get("colspan"))
-                rowspan = _parse_span(cell.attrs.get("rowspan"))
-
-                content = _render_cell_content(cell, list_level)
-
-                # Get the cell's alignment
-                cell_align = _parse_cell_align(cell)
-
-                # Handle rowspan with multirow
-                if rowspan > 1:
-                    # Mark columns as occupied for subsequent rows
-                    for c in range(col, col + colspan):
-                        occupied[c] = rowspan - 1
-                    # Wrap content in multirow
-                    if colspan > 1:
-                        # multirow inside multicolumn - use cell's alignment
-                        content = f"\\multicolumn{{{colspan}}}{{{cell_align}}}{{\\multirow{{{rowspan}}}{{*}}{{{content}}}}}"
-                    else:
-                        content = f"\\multirow{{{rowspan}}}{{*}}{{{content}}}"
-                elif colspan > 1:
-                    # Use cell's alignment for multicolumn
-                    content = f"\\multicolumn{{{colspan}}}{{{cell_align}}}{{{content}}}"
-
-                rendered_cells.append(content)
-                col += colspan
-            else:
-                # No more cells in this row - fill with empty
-                rendered_cells.append("")
+            if index == end:
+                slots.append(_EMPTY_SLOT)
                 col += 1
+                continue
+            colspan = colspans[index]
+            rowspan = rowspans[index]
+            if rowspan > 1:
+                for covered in range(col, min(col + colspan, columns)):
+                    occupied[covered] = rowspan - 1
+            if colspan == 1:
+                # Only count single-cell alignments (colspan cells use multicolumn)
+                counts[col * 3 + _ALIGN_INDEX[aligns[index]]] += 1
+            slots.append(index)
+            index += 1
+            col += colspan
+        layout.append(tuple(slots))
+
+    return _TableGrid(
+        cells=tuple(cells),
+        colspans=colspans,
+        rowspans=rowspans,
+        aligns="".join(aligns),
+        layout=tuple(layout),
+        columns=columns,
+        alignments="".join(
+            _dominant_alignment(counts[col * 3], counts[col * 3 + 1], counts[col * 3 + 2])
+            for col in range(columns)
+        ),
+    )
 
-        row = " & ".join(rendered_cells).rstrip()
-        rendered_rows.append(f"{row} \\\\")
 
-    return rendered_rows
+def _dominant_alignment(left: int, center: int, right: int) -> str:
+    # Most common alignment wins; ties prefer 'l', then 'c'.
+    if left >= center and left >= right:
+        return "l"
+    if center >= right:
+        return "c"
+    return "r"
 
 
-def _render_cell_content(cell: HtmlElement, list_level: int) -> str:
-    """Render cell content, applying bold for th elements."""
-    children = _convert_nodes(cell.children, list_level)
-    tag = cell.tag.lower()
-    if tag == "th":
-        group = LatexGroup(children=tuple(children))
-        children = [LatexCommand(name="textbf", args=(group,))]
-    return "".join(serialize_nodes(children))
+def _iter_table_rows(
+    grid: _TableGrid, context: ConversionContext, start: int = 0, stop: int | None = None
+) -> Iterator[LatexTableRow]:
+    """Convert grid rows ``start:stop`` one at a time, wrapping spanning cells.
+
+    Empty slots become blank cells so ``multirow`` cells from earlier rows line
+    up with the columns they cover.
+    """
+    for slots in grid.layout[start:stop]:
+        rendered_cells: list[LatexTableCell] = []
+        for index in slots:
+            if index == _EMPTY_SLOT:
+                rendered_cells.append(_EMPTY_CELL)
+                continue
+            content = _render_cell_content(grid.cells[index], context)
+            colspan = grid.colspans[index]
+            rowspan = grid.rowspans[index]
+            if rowspan > 1:
+                content = (LatexMultiRow(span=rowspan, children=content),)
+            if colspan > 1:
+                # Use the cell's own alignment for multicolumn
+                content = (
+                    LatexMultiColumn(span=colspan, align=grid.aligns[index], children=content),
+                )
+            rendered_cells.append(LatexTableCell(children=content))
+        yield LatexTableRow(cells=tuple(rendered_cells))
+
+
+_EMPTY_CELL = LatexTableCell()
+
+
+def _render_cell_content(cell: HtmlElement, context: ConversionContext) -> tuple[LatexNode, ...]:
+    """Convert cell content, applying bold for th elements."""
+    children = _convert_nodes(cell.children, context)
+    if cell.tag.lower() == "th":
+        return (LatexCommand(name="textbf", args=(LatexGroup(children=children),)),)
+    return children
 
 
 def _collect_table_rows(table: HtmlElement) -> list[HtmlElement]:
@@ -916,23 +1565,41 @@ def _collect_table_rows(table: HtmlElement) -> list[HtmlElement]:
     return rows
 
 
+def _count_header_rows(table: HtmlElement) -> int:
+    """Count the rows of ``thead`` sections that precede every other row."""
+    count = 0
+    for child in table.children:
+        if not isinstance(child, HtmlElement):
+            continue
+        tag = child.tag.lower()
+        if tag == "thead":
+            count += sum(
+                1
+                for grandchild in child.children
+                if isinstance(grandchild, HtmlElement) and grandchild.tag.lower() == "tr"
+            )
+        elif tag in {"tbody", "tfoot", "tr"}:
+            break
+    return count
+
+
 def _extract_table_caption(
     table: HtmlElement,
-    list_level: int,
+    context: ConversionContext,
 ) -> LatexCommand | None:
     for child in table.children:
         if not isinstance(child, HtmlElement):
             continue
         if child.tag.lower() != "caption":
             continue
-        nodes = _convert_nodes(child.children, list_level)
+        nodes = _convert_nodes(child.children, context)
         # Replace \par with separating space to avoid word concatenation when
         # caption contains multiple block children (e.g., multiple <p> tags)
         new_nodes: list[LatexNode] = []
         for node in nodes:
             if isinstance(node, LatexCommand) and node.name == "par":
                 if new_nodes:
-                    new_nodes.append(LatexText(text=" "))
+                    new_nodes.append(_SPACE)
             else:
                 new_nodes.append(node)
         # Strip any trailing space added from final \par
@@ -954,10 +1621,6 @@ def _extract_row_cells(row: HtmlElement) -> list[HtmlElement]:
     ]
 
 
-def _row_colspan(cells: list[HtmlElement]) -> int:
-    return sum(_parse_span(cell.attrs.get("colspan")) for cell in cells)
-
-
 def _parse_span(value: str | None) -> int:
     if value is None:
         return 1
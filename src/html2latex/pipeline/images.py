@@ -0,0 +1,94 @@
+"""Pixel dimensions of local image files, read from their headers.
+
+Only the few header bytes that hold the size are read: the ``IHDR`` chunk of
+a PNG, the logical screen descriptor of a GIF, and the frame header of a
+JPEG (found by seeking over the preceding segments). Images are never
+decoded. Results are cached by path, modification time and file size, so
+conversions that reference the same files probe each one once, and an
+edited file is probed again.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO
+
+__all__ = ["clear_image_cache", "probe_image_size"]
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# JPEG start-of-frame markers (baseline, progressive, ...), which carry the
+# size; C4, C8 and CC share the range but are other segments.
+_JPEG_FRAME_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# Markers without a length field.
+_JPEG_STANDALONE_MARKERS = frozenset((0x01, *range(0xD0, 0xD9)))
+_JPEG_START_OF_SCAN = 0xDA
+_JPEG_END_OF_IMAGE = 0xD9
+
+
+def probe_image_size(path: str | Path) -> tuple[int, int] | None:
+    """Return the pixel ``(width, height)`` of a PNG, GIF or JPEG file.
+
+    Args:
+        path: Path of the image file.
+
+    Returns:
+        The image's width and height in pixels, or None if the file is
+        missing, unreadable, in another format or has a malformed header.
+    """
+    try:
+        stat = Path(path).stat()
+    except OSError:
+        return None
+    return _probe(os.fspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+def clear_image_cache() -> None:
+    """Forget the cached image dimensions."""
+    _probe.cache_clear()
+
+
+@lru_cache(maxsize=4096)
+def _probe(path: str, mtime_ns: int, size: int) -> tuple[int, int] | None:  # noqa: ARG001
+    # mtime_ns and size are part of the cache key only.
+    try:
+        with Path(path).open("rb") as file:
+            head = file.read(26)
+            if head.startswith(_PNG_SIGNATURE) and head[12:16] == b"IHDR":
+                width, height = struct.unpack(">II", head[16:24])
+            elif head[:6] in (b"GIF87a", b"GIF89a") and len(head) >= 10:
+                width, height = struct.unpack("<HH", head[6:10])
+            elif head.startswith(b"\xff\xd8"):
+                file.seek(2)
+                width, height = _jpeg_size(file)
+            else:
+                return None
+    except (OSError, struct.error):
+        return None
+    return (width, height) if width and height else None
+
+
+def _jpeg_size(file: BinaryIO) -> tuple[int, int]:
+    """Seek from segment to segment up to the frame header; return its size."""
+    while True:
+        byte = file.read(1)
+        if byte != b"\xff":
+            # Not at a marker: a truncated or corrupt stream
+            return 0, 0
+        marker = file.read(1)
+        while marker == b"\xff":  # fill bytes
+            marker = file.read(1)
+        if not marker:
+            return 0, 0
+        code = marker[0]
+        if code in _JPEG_STANDALONE_MARKERS:
+            continue
+        if code in (_JPEG_START_OF_SCAN, _JPEG_END_OF_IMAGE):
+            return 0, 0
+        (length,) = struct.unpack(">H", file.read(2))
+        if code in _JPEG_FRAME_MARKERS:
+            height, width = struct.unpack(">xHH", file.read(5))
+            return width, height
+        file.seek(length - 2, os.SEEK_CUR)
@@ -0,0 +1,215 @@
+"""Incremental re-conversion of edited documents.
+
+Top-level blocks convert independently (see ``convert_parallel``), so when a
+document is converted again after an edit, blocks whose normalized HTML is
+unchanged can reuse their serialized LaTeX and packages from the previous
+result. Each block is fingerprinted by a digest of its markup combined with
+the document-wide state its output depends on: the conversion settings, the
+``<style>`` rules and the set of ``#id`` link targets. Changing any of those
+re-converts every block; otherwise only blocks with new fingerprints are
+converted.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from hashlib import blake2b
+from typing import TYPE_CHECKING, Literal
+
+from html2latex.ast import HtmlDocument, HtmlElement, HtmlNode, HtmlText
+from html2latex.latex import LatexDocumentAst, infer_packages, serialize_fragment
+
+from .convert import _AnchorIndex, _convert_nodes, _root_context
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping, Sequence
+    from pathlib import Path
+
+    from html2latex.styles import ClassProfile
+
+    from .convert import TagHandler
+
+__all__ = ["ConvertedBlock", "convert_incremental"]
+
+_DIGEST_SIZE = 16
+
+
+@dataclass(frozen=True, slots=True)
+class ConvertedBlock:
+    """The conversion of one top-level block, reusable by later conversions.
+
+    Attributes:
+        fingerprint: Digest of the block's normalized HTML and of the
+            document-wide state its output depends on.
+        latex: The block's serialized LaTeX.
+        packages: LaTeX packages the block requires.
+    """
+
+    fingerprint: bytes
+    latex: str
+    packages: frozenset[str]
+
+
+def convert_incremental(
+    document: HtmlDocument,
+    previous: Iterable[ConvertedBlock] = (),
+    *,
+    handlers: Mapping[str, TagHandler] | None = None,
+    longtable_threshold: int | None = None,
+    class_profiles: Sequence[ClassProfile] = (),
+    image_root: str | Path | None = None,
+    formatted: bool = False,
+    encoding: Literal["utf8", "ascii-latex"] = "utf8",
+) -> tuple[ConvertedBlock, ...]:
+    """Convert a document's top-level blocks, reusing unchanged ones.
+
+    Concatenating the ``latex`` of the returned blocks gives the body
+    ``serialize_document(convert_document(...))`` would (right-trimmed when
+    ``formatted``), and the union of their ``packages`` the packages
+    ``infer_packages`` would. Blocks whose fingerprint appears in
+    ``previous`` are taken from it, wherever they were in the old document;
+    the others are converted together in one pass.
+
+    Args:
+        document: The normalized HTML document to convert.
+        previous: Blocks returned for an earlier version of the document.
+        handlers: Optional tag handler mapping, as for ``convert_document``.
+        longtable_threshold: As for ``convert_document``.
+        class_profiles: As for ``convert_document``.
+        image_root: As for ``convert_document``. Image files are not part
+            of the fingerprints: a block is not re-converted when only an
+            image it references changes size.
+        formatted: If True, produce human-readable output with indentation.
+        encoding: As for ``serialize_document``.
+
+    Returns:
+        One block per top-level node of ``document``, in document order.
+    """
+    anchors = _AnchorIndex()
+    digests = [_block_digest(block, anchors) for block in document.children]
+    anchors.link()
+    styles: list[HtmlElement] = []
+    style_digests: list[bytes] = []
+    for block, digest in zip(document.children, digests, strict=True):
+        if isinstance(block, HtmlElement) and block.tag.lower() == "style":
+            styles.append(block)
+            style_digests.append(digest)
+    context_digest = _context_digest(
+        digests=style_digests,
+        labels=anchors.linked,
+        handlers=handlers,
+        longtable_threshold=longtable_threshold,
+        class_profiles=class_profiles,
+        image_root=image_root,
+        formatted=formatted,
+        encoding=encoding,
+    )
+    fingerprints = [
+        blake2b(context_digest + digest, digest_size=_DIGEST_SIZE).digest() for digest in digests
+    ]
+
+    reusable = {block.fingerprint: block for block in previous}
+    # Changed blocks by fingerprint: identical new blocks convert once
+    changed = {
+        fingerprint: block
+        for block, fingerprint in zip(document.children, fingerprints, strict=True)
+        if fingerprint not in reusable
+    }
+    if changed:
+        converted = _convert_blocks(
+            list(changed.values()),
+            styles=tuple(styles),
+            labels=anchors.linked,
+            handlers=handlers,
+            longtable_threshold=longtable_threshold,
+            class_profiles=class_profiles,
+            image_root=image_root,
+            formatted=formatted,
+            encoding=encoding,
+        )
+        for fingerprint, (latex, packages) in zip(changed, converted, strict=True):
+            reusable[fingerprint] = ConvertedBlock(fingerprint, latex, packages)
+    return tuple(reusable[fingerprint] for fingerprint in fingerprints)
+
+
+def _block_digest(node: HtmlNode, anchors: _AnchorIndex) -> bytes:
+    """Digest ``node``'s markup, adding its elements to ``anchors`` on the way."""
+    # Length prefixes keep the encoding unambiguous whatever the text holds.
+    parts: list[str] = []
+    stack: list[HtmlNode | None] = [node]  # None closes an element
+    while stack:
+        current = stack.pop()
+        if current is None:
+            parts.append(">")
+        elif isinstance(current, HtmlText):
+            parts.append(f"{len(current.text)}:{current.text}")
+        else:
+            anchors.add(current)
+            parts.append(f"<{current.tag} {len(current.attrs)}")
+            parts.extend(
+                f"{len(name)}:{name}{len(value)}:{value}" for name, value in current.attrs.items()
+            )
+            stack.append(None)
+            stack.extend(reversed(current.children))
+    data = "".join(parts).encode("utf-8", "surrogatepass")
+    return blake2b(data, digest_size=_DIGEST_SIZE).digest()
+
+
+def _context_digest(
+    *,
+    digests: list[bytes],
+    labels: frozenset[str],
+    handlers: Mapping[str, TagHandler] | None,
+    longtable_threshold: int | None,
+    class_profiles: Sequence[ClassProfile],
+    image_root: str | Path | None,
+    formatted: bool,
+    encoding: str,
+) -> bytes:
+    """Digest the document-wide state every block's output depends on."""
+    settings = (
+        formatted,
+        encoding,
+        longtable_threshold,
+        tuple(class_profiles),
+        None if image_root is None else str(image_root),
+        None
+        if handlers is None
+        else sorted((tag, repr(handler)) for tag, handler in handlers.items()),
+        sorted(labels),
+    )
+    data = repr(settings).encode("utf-8", "surrogatepass") + b"".join(digests)
+    return blake2b(data, digest_size=_DIGEST_SIZE).digest()
+
+
+def _convert_blocks(
+    blocks: list[HtmlNode],
+    *,
+    styles: tuple[HtmlElement, ...],
+    labels: frozenset[str],
+    handlers: Mapping[str, TagHandler] | None,
+    longtable_threshold: int | None,
+    class_profiles: Sequence[ClassProfile],
+    image_root: str | Path | None,
+    formatted: bool,
+    encoding: Literal["utf8", "ascii-latex"],
+) -> list[tuple[str, frozenset[str]]]:
+    # As convert_parallel's chunks: one context for all changed blocks, with
+    # the whole document's styles and link targets.
+    document = HtmlDocument(children=(*styles, *blocks))
+    context = _root_context(
+        document,
+        handlers,
+        longtable_threshold,
+        class_profiles,
+        anchors=_AnchorIndex(linked=labels) if labels else None,
+        image_root=image_root,
+    )
+    results = []
+    for block in blocks:
+        nodes = _convert_nodes((block,), context)
+        packages = infer_packages(LatexDocumentAst(body=nodes))
+        results.append(
+            (serialize_fragment(nodes, formatted=formatted, encoding=encoding), frozenset(packages))
+        )
+    return results
@@ -0,0 +1,776 @@
+r"""Conversion of MathML ``<math>`` elements to LaTeX math.
+
+A ``<math>`` subtree is first reduced to a structural key: nested tuples of
+tag, output-relevant attributes and children, with token elements (``<mi>``,
+``<mo>``, ...) reduced to their text. Keys are rendered through a bounded,
+process-wide cache at every level, so a formula repeated across a document
+(or across documents) is rendered once, and so is every sub-expression two
+formulas share, such as ``<msup><mi>x</mi><mn>2</mn></msup>``.
+
+Characters are mapped through one precompiled ``str.translate`` table that
+covers Greek letters, operators, relations, arrows and the LaTeX special
+characters, so token text is converted in a single pass. The rendered
+formula is scanned once for commands defined by ``amsmath`` or ``amssymb``,
+which are reported with it so the preamble can load them.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from html2latex.ast import HtmlElement, HtmlText
+from html2latex.latex import LatexRaw, LatexText, serialize_fragment
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+
+__all__ = ["clear_mathml_cache", "convert_mathml"]
+
+MATHML_CACHE_SIZE = 4096
+
+# Deeper formulas fall back to their text; rendering recurses once per level.
+_MAX_DEPTH = 100
+
+# (tag, output-relevant attributes, child keys or token text)
+_Expr = tuple[str, tuple[tuple[str, str], ...], "tuple[_Expr, ...] | str"]
+
+_TOKEN_TAGS = frozenset({"mi", "mn", "mo", "mtext", "ms", "annotation"})
+# Attributes that change the rendering; the rest (ids, classes) would only
+# split cache entries.
+_ATTRIBUTES = frozenset(
+    {
+        "close",
+        "displaystyle",
+        "encoding",
+        "linethickness",
+        "lquote",
+        "mathvariant",
+        "notation",
+        "open",
+        "rquote",
+        "separators",
+        "width",
+    }
+)
+_TEX_ENCODINGS = frozenset({"application/x-tex", "tex", "latex", "text/x-latex"})
+
+_SYMBOLS = {
+    # LaTeX special characters
+    "\\": r"\backslash",
+    "{": r"\{",
+    "}": r"\}",
+    "#": r"\#",
+    "$": r"\$",
+    "%": r"\%",
+    "&": r"\&",
+    "_": r"\_",
+    "~": r"\sim",
+    "^": r"\hat{}",
+    # Greek letters
+    "α": r"\alpha",
+    "β": r"\beta",
+    "γ": r"\gamma",
+    "δ": r"\delta",
+    "ε": r"\varepsilon",
+    "ϵ": r"\epsilon",
+    "ζ": r"\zeta",
+    "η": r"\eta",
+    "θ": r"\theta",
+    "ϑ": r"\vartheta",
+    "ι": r"\iota",
+    "κ": r"\kappa",
+    "λ": r"\lambda",
+    "μ": r"\mu",
+    "ν": r"\nu",
+    "ξ": r"\xi",
+    "ο": "o",
+    "π": r"\pi",
+    "ϖ": r"\varpi",
+    "ρ": r"\rho",
+    "ϱ": r"\varrho",
+    "σ": r"\sigma",
+    "ς": r"\varsigma",
+    "τ": r"\tau",
+    "υ": r"\upsilon",
+    "φ": r"\varphi",
+    "ϕ": r"\phi",
+    "χ": r"\chi",
+    "ψ": r"\psi",
+    "ω": r"\omega",
+    "Γ": r"\Gamma",
+    "Δ": r"\Delta",
+    "Θ": r"\Theta",
+    "Λ": r"\Lambda",
+    "Ξ": r"\Xi",
+    "Π": r"\Pi",
+    "Σ": r"\Sigma",
+    "Υ": r"\Upsilon",
+    "Φ": r"\Phi",
+    "Ψ": r"\Psi",
+    "Ω": r"\Omega",
+    # Binary operators
+    "−": "-",
+    "±": r"\pm",
+    "∓": r"\mp",
+    "×": r"\times",
+    "÷": r"\div",
+    "·": r"\cdot",
+    "⋅": r"\cdot",
+    "∗": "*",
+    "∘": r"\circ",
+    "•": r"\bullet",
+    "⊕": r"\oplus",
+    "⊗": r"\otimes",
+    "∧": r"\wedge",
+    "∨": r"\vee",
+    "¬": r"\neg",
+    "∩": r"\cap",
+    "∪": r"\cup",
+    "∖": r"\setminus",
+    # Relations
+    "≤": r"\leq",
+    "≥": r"\geq",
+    "≠": r"\neq",
+    "≈": r"\approx",
+    "≡": r"\equiv",
+    "∼": r"\sim",
+    "≃": r"\simeq",
+    "≅": r"\cong",
+    "∝": r"\propto",
+    "≪": r"\ll",
+    "≫": r"\gg",
+    "∈": r"\in",
+    "∉": r"\notin",
+    "∋": r"\ni",
+    "⊂": r"\subset",
+    "⊃": r"\supset",
+    "⊆": r"\subseteq",
+    "⊇": r"\supseteq",
+    "⊥": r"\perp",
+    "∥": r"\parallel",
+    "∣": r"\mid",
+    "≺": r"\prec",
+    "≻": r"\succ",
+    "⊢": r"\vdash",
+    "≔": ":=",
+    # Arrows
+    "→": r"\to",
+    "←": r"\leftarrow",
+    "↔": r"\leftrightarrow",
+    "⇒": r"\Rightarrow",
+    "⇐": r"\Leftarrow",
+    "⇔": r"\Leftrightarrow",
+    "↦": r"\mapsto",
+    "↑": r"\uparrow",
+    "↓": r"\downarrow",
+    "⟶": r"\longrightarrow",
+    "⟹": r"\Longrightarrow",
+    # Large operators
+    "∑": r"\sum",
+    "∏": r"\prod",
+    "∐": r"\coprod",
+    "∫": r"\int",
+    "∬": r"\iint",
+    "∭": r"\iiint",
+    "∮": r"\oint",
+    "⋂": r"\bigcap",
+    "⋃": r"\bigcup",
+    "⨁": r"\bigoplus",
+    # Miscellaneous symbols
+    "∞": r"\infty",
+    "∂": r"\partial",
+    "∇": r"\nabla",
+    "∀": r"\forall",
+    "∃": r"\exists",
+    "∄": r"\nexists",
+    "∅": r"\emptyset",
+    "ℝ": r"\mathbb{R}",
+    "ℕ": r"\mathbb{N}",
+    "ℤ": r"\mathbb{Z}",
+    "ℚ": r"\mathbb{Q}",
+    "ℂ": r"\mathbb{C}",
+    "ℏ": r"\hbar",
+    "ℓ": r"\ell",
+    "ℵ": r"\aleph",
+    "′": "'",
+    "″": "''",
+    "‴": "'''",
+    "…": r"\ldots",
+    "⋯": r"\cdots",
+    "⋮": r"\vdots",
+    "⋱": r"\ddots",
+    "°": r"^\circ",
+    "∠": r"\angle",
+    "△": r"\triangle",
+    "⟨": r"\langle",
+    "⟩": r"\rangle",
+    "⌈": r"\lceil",
+    "⌉": r"\rceil",
+    "⌊": r"\lfloor",
+    "⌋": r"\rfloor",
+    "‖": r"\|",
+    "\u00a0": " ",
+    # Invisible function application, times, separator and plus
+    "\u2061": "",
+    "\u2062": "",
+    "\u2063": "",
+    "\u2064": "",
+}
+# Control words get a trailing space so a following letter cannot run into
+# them; ``_math_text`` strips the one left at the end.
+_SYMBOL_TABLE = str.maketrans(
+    {char: f"{latex} " if latex[-1:].isalpha() else latex for char, latex in _SYMBOLS.items()}
+)
+
+_FUNCTIONS = frozenset(
+    {
+        "arccos",
+        "arcsin",
+        "arctan",
+        "arg",
+        "cos",
+        "cosh",
+        "cot",
+        "coth",
+        "csc",
+        "deg",
+        "det",
+        "dim",
+        "exp",
+        "gcd",
+        "inf",
+        "ker",
+        "lg",
+        "lim",
+        "liminf",
+        "limsup",
+        "ln",
+        "log",
+        "max",
+        "min",
+        "Pr",
+        "sec",
+        "sin",
+        "sinh",
+        "sup",
+        "tan",
+        "tanh",
+    }
+)
+# Operators whose under/over scripts are limits rather than stacked symbols
+_LIMIT_OPERATORS = frozenset(
+    {
+        r"\sum",
+        r"\prod",
+        r"\coprod",
+        r"\int",
+        r"\iint",
+        r"\iiint",
+        r"\oint",
+        r"\bigcap",
+        r"\bigcup",
+        r"\bigoplus",
+        r"\lim",
+        r"\liminf",
+        r"\limsup",
+        r"\max",
+        r"\min",
+        r"\sup",
+        r"\inf",
+    }
+)
+_VARIANT_COMMANDS = {
+    "normal": "mathrm",
+    "bold": "mathbf",
+    "italic": "mathit",
+    "bold-italic": "boldsymbol",
+    "double-struck": "mathbb",
+    "script": "mathcal",
+    "bold-script": "mathcal",
+    "fraktur": "mathfrak",
+    "bold-fraktur": "mathfrak",
+    "sans-serif": "mathsf",
+    "monospace": "mathtt",
+}
+_OVER_ACCENTS = {
+    "^": "hat",
+    "ˆ": "hat",
+    "~": "tilde",
+    "˜": "tilde",
+    "¯": "overline",
+    "‾": "overline",
+    "→": "vec",
+    "⃗": "vec",
+    "˙": "dot",
+    "¨": "ddot",
+    "ˇ": "check",
+    "˘": "breve",
+    "⏞": "overbrace",
+}
+_UNDER_ACCENTS = {
+    "_": "underline",
+    "¯": "underline",
+    "‾": "underline",
+    "⏟": "underbrace",
+}
+_FENCES = {"": ".", "{": r"\{", "}": r"\}", "‖": r"\|", "⟨": r"\langle", "⟩": r"\rangle"}
+_ZERO_THICKNESS = frozenset({"0", "0pt", "0px", "0em", "0ex"})
+
+# Commands and environments the renderer (or a TeX annotation) may emit that
+# are not in the LaTeX kernel.
+_PACKAGE_COMMANDS = {
+    "binom": "amsmath",
+    "bmatrix": "amsmath",
+    "boldsymbol": "amsmath",
+    "boxed": "amsmath",
+    "cases": "amsmath",
+    "dfrac": "amsmath",
+    "genfrac": "amsmath",
+    "iiint": "amsmath",
+    "iint": "amsmath",
+    "matrix": "amsmath",
+    "operatorname": "amsmath",
+    "overset": "amsmath",
+    "pmatrix": "amsmath",
+    "text": "amsmath",
+    "tfrac": "amsmath",
+    "underset": "amsmath",
+    "vmatrix": "amsmath",
+    "mathbb": "amssymb",
+    "mathfrak": "amssymb",
+    "nexists": "amssymb",
+    "therefore": "amssymb",
+    "varnothing": "amssymb",
+}
+# MathML named spaces, in ems
+_NAMED_SPACES = {
+    "veryverythinmathspace": 1 / 18,
+    "verythinmathspace": 2 / 18,
+    "thinmathspace": 3 / 18,
+    "mediummathspace": 4 / 18,
+    "thickmathspace": 5 / 18,
+    "verythickmathspace": 6 / 18,
+    "veryverythickmathspace": 7 / 18,
+}
+_SPACE_UNITS = frozenset({"em", "ex", "pt", "pc", "in", "cm", "mm"})
+
+_CONTROL_WORD_END_RE = re.compile(r"\\[A-Za-z]+$")
+_COMMAND_NAME_RE = re.compile(r"\\(?:begin\{)?([A-Za-z]+)")
+_SPACE_RE = re.compile(r"(-?(?:[0-9]+(?:\.[0-9]*)?|\.[0-9]+))\s*([a-z]+)")
+_ATOM_RE = re.compile(r".|\\[A-Za-z]+(?:\{[^{}]*\})?|\\.", re.DOTALL)
+
+
+def convert_mathml(node: HtmlElement) -> LatexRaw | None:
+    r"""Convert a MathML element to LaTeX math, without delimiters.
+
+    Args:
+        node: A ``<math>`` element, or any MathML element within one.
+
+    Returns:
+        The LaTeX source, e.g. ``\frac{1}{2}``, with the packages it needs
+        (``amsmath``, ``amssymb``); None when ``node`` holds no MathML
+        elements (only text) or nests deeper than the converter supports, in
+        which case callers should fall back to its text.
+    """
+    if not any(isinstance(child, HtmlElement) for child in node.children):
+        return None
+    expr = _expression_key(node)
+    if expr is None:
+        return None
+    latex = _render(expr)
+    return LatexRaw(value=latex, packages=_required_packages(latex))
+
+
+def clear_mathml_cache() -> None:
+    """Empty the process-wide cache of rendered MathML expressions."""
+    _render.cache_clear()
+    _required_packages.cache_clear()
+
+
+@lru_cache(maxsize=MATHML_CACHE_SIZE)
+def _required_packages(latex: str) -> tuple[str, ...]:
+    names = _COMMAND_NAME_RE.findall(latex)
+    return tuple(sorted({_PACKAGE_COMMANDS[name] for name in names if name in _PACKAGE_COMMANDS}))
+
+
+def _expression_key(root: HtmlElement) -> _Expr | None:
+    """Return the structural key of ``root``, or None if it nests too deep."""
+    keys: list[_Expr] = []
+    # (node, depth, child count once expanded, else -1)
+    stack: list[tuple[HtmlElement | HtmlText, int, int]] = [(root, 0, -1)]
+    while stack:
+        node, depth, count = stack.pop()
+        if isinstance(node, HtmlText):
+            keys.append(("#text", (), node.text))
+            continue
+        tag = node.tag.lower()
+        if count < 0:
+            if tag in _TOKEN_TAGS:
+                keys.append((tag, _key_attributes(node), _token_text(node)))
+                continue
+            if depth >= _MAX_DEPTH:
+                return None
+            children = [
+                child
+                for child in node.children
+                if isinstance(child, HtmlElement)
+                or (isinstance(child, HtmlText) and child.text.strip())
+            ]
+            stack.append((node, depth, len(children)))
+            stack.extend((child, depth + 1, -1) for child in reversed(children))
+            continue
+        split = len(keys) - count
+        content = tuple(keys[split:])
+        del keys[split:]
+        keys.append((tag, _key_attributes(node), content))
+    return keys[0]
+
+
+def _key_attributes(node: HtmlElement) -> tuple[tuple[str, str], ...]:
+    if not node.attrs:
+        return ()
+    return tuple((name, value) for name, value in node.attrs.items() if name in _ATTRIBUTES)
+
+
+def _token_text(node: HtmlElement) -> str:
+    parts: list[str] = []
+    stack = [iter(node.children)]
+    while stack:
+        for child in stack[-1]:
+            if isinstance(child, HtmlText):
+                parts.append(child.text)
+            elif isinstance(child, HtmlElement):
+                stack.append(iter(child.children))
+                break
+        else:
+            stack.pop()
+    return "".join(parts)
+
+
+@lru_cache(maxsize=MATHML_CACHE_SIZE)
+def _render(expr: _Expr) -> str:
+    tag, attrs, content = expr
+    if isinstance(content, str):
+        return _TOKENS.get(tag, _render_mo)(dict(attrs), content)
+    return _LAYOUTS.get(tag, _render_row)(dict(attrs), content)
+
+
+def _math_text(text: str) -> str:
+    return text.strip().translate(_SYMBOL_TABLE).rstrip(" ")
+
+
+def _join(parts: list[str]) -> str:
+    """Concatenate rendered parts, spacing control words from letters."""
+    out: list[str] = []
+    for part in parts:
+        if not part:
+            continue
+        if out and part[0].isalpha() and _CONTROL_WORD_END_RE.search(out[-1]):
+            out.append(" ")
+        out.append(part)
+    return "".join(out)
+
+
+def _braced(latex: str) -> str:
+    """Return ``latex`` as a single atom, for use as a script base."""
+    if _ATOM_RE.fullmatch(latex):
+        return latex
+    return f"{{{latex}}}"
+
+
+# Token elements: renderer(attrs, text)
+
+
+def _render_mi(attrs: Mapping[str, str], text: str) -> str:
+    name = text.strip()
+    if name in _FUNCTIONS:
+        return f"\\{name}"
+    latex = _math_text(name)
+    command = _VARIANT_COMMANDS.get(attrs.get("mathvariant", ""))
+    if command is None and len(name) > 1:
+        command = "mathrm"
+    if command is None or not latex:
+        return latex
+    return f"\\{command}{{{latex}}}"
+
+
+def _render_mo(attrs: Mapping[str, str], text: str) -> str:
+    return _math_text(text)
+
+
+def _render_mtext(attrs: Mapping[str, str], text: str) -> str:
+    if not text:
+        return ""
+    if not text.strip():
+        return r"\ "
+    return f"\\text{{{_escape_text(text)}}}"
+
+
+def _render_ms(attrs: Mapping[str, str], text: str) -> str:
+    lquote = attrs.get("lquote", '"')
+    rquote = attrs.get("rquote", '"')
+    return f"\\text{{{_escape_text(lquote + text + rquote)}}}"
+
+
+def _render_annotation(attrs: Mapping[str, str], text: str) -> str:
+    return ""
+
+
+def _escape_text(text: str) -> str:
+    return serialize_fragment((LatexText(text=text),))
+
+
+_TOKENS: dict[str, Callable[[Mapping[str, str], str], str]] = {
+    "mi": _render_mi,
+    "mn": _render_mo,
+    "mo": _render_mo,
+    "#text": _render_mo,
+    "mtext": _render_mtext,
+    "ms": _render_ms,
+    "annotation": _render_annotation,
+}
+
+
+# Layout elements: renderer(attrs, child keys)
+
+
+def _render_row(attrs: Mapping[str, str], children: tuple[_Expr, ...]) -> str:
+    return _join([_render(child) for child in children])
+
+
+def _render_style(attrs: Mapping[str, str], children: tuple[_Expr, ...]) -> str:
+    row = _render_row(attrs, children)
+    if attrs.get("displaystyle") == "true":
+        return f"{{\\displaystyle {row}}}"
+    return row
+
+
+def _render_frac(attrs: Mapping[str, str], children: tuple[_Expr, ...]) -> str:
+    if len(children) != 2:
+        return _render_row(attrs, children)
+    numerator, denominator = (_render(child) for child in children)
+    if attrs.get("linethickness", "").strip() in _ZERO_THICKNESS:
+        return f"\\genfrac{{}}{{}}{{0pt}}{{}}{{{numerator}}}{{{denominator}}}"
+    return f"\\frac{{{numerator}}}{{{denominator}}}"
+
+
+def _render_sqrt(attrs: Mapping[str, str], children: tuple[_Expr, ...]) -> str:
+    return f"\\sqrt{{{_render_row(attrs, children)}}}"
+
+
+def _render_root(attrs: Mapping[str, str], children: tuple[_Expr, ...]) -> str:
+    if len(children) != 2:
+        return _render_sqrt(attrs, children)
+    base, index = (_render(child) for child in children)
+    return f"\\sqrt[{index}]{{{base}}}"
+
+
+def _scripts(base: str, sub: str | None, sup: str | None) -> str:
+    parts = [base]
+    if sub:
+        parts.append(f"_{{{sub}}}")
+    if sup:
+        # Primes attach directly: x' rather than x^{'}
+        parts.append(sup if sup.strip("'") == "" else f"^{{{sup}}}")
+    return "".join(parts)
+
+
+def _render_sub(attrs: Mapping[str, str], children: tuple[_Expr, ...]) -> str:
+    if len(children) != 2:
+        return _render_row(attrs, children)
+    base, sub = (_render(child) for child in children)
+    return _scripts(_braced(base), sub, None)
+
+
+def _render_sup(attrs: Mapping[str, str], children: tuple[_Expr, ...]) -> str:
+    if len(children) != 2:
+        return _render_row(attrs, children)
+    base, sup = (_render(child) for child in children)
+    return _scripts(_braced(base), None, sup)
+
+
+def _render_subsup(attrs: Mapping[str, str], children: tuple[_Expr, ...]) -> str:
+    if len(children) != 3:
+        return _render_row(attrs, children)
+    base, sub, sup = (_render(child) for child in children)
+    return _scripts(_braced(base), sub, sup)
+
+
+def _accent(expr: _Expr, accents: Mapping[str, str]) -> str | None:
+    tag, _, content = expr
+    if tag != "mo" or not isinstance(content, str):
+        return None
+    return accents.get(content.strip())
+
+
+def _render_under(attrs: Mapping[str, str], children: tuple[_Expr, ...]) -> str:
+    if len(children) != 2:
+        return _render_row(attrs, children)
+    base = _render(children[0])
+    if base in _LIMIT_OPERATORS:
+        return _scripts(base, _render(children[1]), None)
+    accent = _accent(children[1], _UNDER_ACCENTS)
+    if accent is not None:
+        return f"\\{accent}{{{base}}}"
+    return f"\\underset{{{_render(children[1])}}}{{{base}}}"
+
+
+def _render_over(attrs: Mapping[str, str], children: tuple[_Expr, ...]) -> str:
+    if len(children) != 2:
+        return _render_row(attrs, children)
+    base = _render(children[0])
+    if base in _LIMIT_OPERATORS:
+        return _scripts(base, None, _render(children[1]))
+    accent = _accent(children[1], _OVER_ACCENTS)
+    if accent is not None:
+        return f"\\{accent}{{{base}}}"
+    return f"\\overset{{{_render(children[1])}}}{{{base}}}"
+
+
+def _render_underover(attrs: Mapping[str, str], children: tuple[_Expr, ...]) -> str:
+    if len(children) != 3:
+        return _render_row(attrs, children)
+    base, under, over = (_render(child) for child in children)
+    if base in _LIMIT_OPERATORS:
+        return _scripts(base, under, over)
+    return f"\\overset{{{over}}}{{\\underset{{{under}}}{{{base}}}}}"
+
+
+def _render_multiscripts(attrs: Mapping[str, str], children: tuple[_Expr, ...]) -> str:
+    if not children:
+        return ""
+    rendered = [_render(child) for child in children[1:]]
+    tags = [child[0] for child in children[1:]]
+    if "mprescripts" in tags:
+        split = tags.index("mprescripts")
+        post, pre = rendered[:split], rendered[split + 1 :]
+    else:
+        post, pre = rendered, []
+    prefix = "".join(
+        _scripts("{}", sub, sup) for sub, sup in zip(pre[::2], pre[1::2], strict=False)
+    )
+    suffix = "".join(
+        _scripts("", sub, sup) for sub, sup in zip(post[::2], post[1::2], strict=False)
+    )
+    return f"{prefix}{_braced(_render(children[0]))}{suffix}"
+
+
+def _fence(delimiter: str) -> str:
+    delimiter = delimiter.strip()
+    return _FENCES.get(delimiter) or _math_text(delimiter)
+
+
+def _render_fenced(attrs: Mapping[str, str], children: tuple[_Expr, ...]) -> str:
+    separators = "".join(attrs.get("separators", ",").split())
+    parts: list[str] = []
+    for index, child in enumerate(children):
+        if index and separators:
+            parts.append(_math_text(separators[min(index, len(separators)) - 1]))
+        parts.append(_render(child))
+    opening = _fence(attrs.get("open", "("))
+    closing = _fence(attrs.get("close", ")"))
+    return f"\\left{opening}{_join(parts)}\\right{closing}"
+
+
+def _render_table(attrs: Mapping[str, str], children: tuple[_Expr, ...]) -> str:
+    rows = r" \\ ".join(_render_table_row(child) for child in children)
+    return f"\\begin{{matrix}}{rows}\\end{{matrix}}"
+
+
+def _render_table_row(expr: _Expr) -> str:
+    tag, _, content = expr
+    if tag not in {"mtr", "mlabeledtr"} or isinstance(content, str):
+        return _render(expr)
+    if tag == "mlabeledtr":
+        content = content[1:]  # The first cell is the equation label
+    return " & ".join(_render(cell) for cell in content)
+
+
+def _render_enclose(attrs: Mapping[str, str], children: tuple[_Expr, ...]) -> str:
+    row = _render_row(attrs, children)
+    notation = attrs.get("notation", "longdiv").split()
+    if "box" in notation or "roundedbox" in notation:
+        return f"\\boxed{{{row}}}"
+    if "top" in notation:
+        return f"\\overline{{{row}}}"
+    if "bottom" in notation:
+        return f"\\underline{{{row}}}"
+    return row
+
+
+def _render_space(attrs: Mapping[str, str], children: tuple[_Expr, ...]) -> str:
+    if "width" not in attrs:
+        return r"\,"
+    width = _space_length(attrs["width"])
+    return f"\\hspace{{{width}}}" if width else ""
+
+
+def _space_length(value: str) -> str | None:
+    """Return a MathML length as a LaTeX length, or None if it is not one."""
+    value = value.strip().lower()
+    negative = value.startswith("negative")
+    named = _NAMED_SPACES.get(value.removeprefix("negative"))
+    if named is not None:
+        number, unit = -named if negative else named, "em"
+    else:
+        match = _SPACE_RE.fullmatch(value)
+        if match is None:
+            return None
+        number, unit = float(match.group(1)), match.group(2)
+        if unit == "px":
+            number, unit = number * 72.27 / 96, "pt"
+        elif unit not in _SPACE_UNITS:
+            return None
+    if not number:
+        return None
+    return f"{number:.4f}".rstrip("0").rstrip(".") + unit
+
+
+def _render_phantom(attrs: Mapping[str, str], children: tuple[_Expr, ...]) -> str:
+    return f"\\phantom{{{_render_row(attrs, children)}}}"
+
+
+def _render_semantics(attrs: Mapping[str, str], children: tuple[_Expr, ...]) -> str:
+    for tag, child_attrs, content in children[1:]:
+        if (
+            tag == "annotation"
+            and isinstance(content, str)
+            and dict(child_attrs).get("encoding", "").lower() in _TEX_ENCODINGS
+        ):
+            return content.strip()
+    return _render(children[0]) if children else ""
+
+
+def _render_first(attrs: Mapping[str, str], children: tuple[_Expr, ...]) -> str:
+    return _render(children[0]) if children else ""
+
+
+def _render_nothing(attrs: Mapping[str, str], children: tuple[_Expr, ...]) -> str:
+    return ""
+
+
+_LAYOUTS: dict[str, Callable[[Mapping[str, str], tuple[_Expr, ...]], str]] = {
+    "mstyle": _render_style,
+    "mfrac": _render_frac,
+    "msqrt": _render_sqrt,
+    "mroot": _render_root,
+    "msub": _render_sub,
+    "msup": _render_sup,
+    "msubsup": _render_subsup,
+    "munder": _render_under,
+    "mover": _render_over,
+    "munderover": _render_underover,
+    "mmultiscripts": _render_multiscripts,
+    "mfenced": _render_fenced,
+    "mtable": _render_table,
+    "menclose": _render_enclose,
+    "mspace": _render_space,
+    "mphantom": _render_phantom,
+    "semantics": _render_semantics,
+    "maction": _render_first,
+    "annotation-xml": _render_nothing,
+    "mprescripts": _render_nothing,
+    "none": _render_nothing,
+}
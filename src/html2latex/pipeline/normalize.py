@@ -5,11 +5,29 @@ from __future__ import annotations
 import re
 
 from html2latex.ast import HtmlDocument, HtmlElement, HtmlNode, HtmlText
+from html2latex.diagnostics import DiagnosticEvent, emit_diagnostic
 from html2latex.tags import BLOCK_TAGS
 
-__all__ = ["normalize_document"]
+__all__ = ["mark_normalized", "normalize_document", "validate_normalized"]
 
 _WHITESPACE_RE = re.compile(r"\s+")
+# Matches only where collapsing would change the text: a whitespace run longer
+# than one character, or a single whitespace character other than a plain space.
+_COLLAPSIBLE_RE = re.compile(r"\s\s|[^\S ]")
+
+# Sibling kind flags computed once per child list by _classify_children.
+_NONE = 0
+_TEXT = 1
+_ELEMENT = 2
+_BLOCK = 4
+_INLINE = 8
+_LINE_BREAK = 16
+_PRESERVE = 32
+_BLOCK_KIND = _ELEMENT | _BLOCK
+_INLINE_KIND = _ELEMENT | _INLINE
+
+# Shared node for the most common collapsed text: a single separating space.
+_SPACE = HtmlText(text=" ")
 
 
 def normalize_document(
@@ -27,11 +45,63 @@ def normalize_document(
         preserve_whitespace_tags: Set of tag names whose whitespace should be preserved.
 
     Returns:
-        A new HtmlDocument with normalized whitespace.
+        A new HtmlDocument with normalized whitespace, flagged as normalized.
     """
     preserve = {tag.lower() for tag in preserve_whitespace_tags or set()}
     children = _normalize_children(document.children, preserve, parent_is_block=True)
-    return HtmlDocument(children=children, doctype=document.doctype)
+    return HtmlDocument(children=children, doctype=document.doctype, normalized=True)
+
+
+def mark_normalized(document: HtmlDocument) -> HtmlDocument:
+    """Flag a document as already normalized without re-normalizing it.
+
+    Use this for trees that are known to come from an earlier
+    ``normalize_document`` pass (e.g. loaded from storage). The converter
+    trusts the flag and skips the normalize stage.
+
+    Args:
+        document: The HTML document to flag.
+
+    Returns:
+        The same document if already flagged, otherwise a flagged copy.
+    """
+    if document.normalized:
+        return document
+    return HtmlDocument(children=document.children, doctype=document.doctype, normalized=True)
+
+
+def validate_normalized(
+    document: HtmlDocument,
+    *,
+    preserve_whitespace_tags: set[str] | None = None,
+) -> HtmlDocument:
+    """Check that a trusted document is a fixed point of ``normalize_document``.
+
+    This is a debugging aid for the trusted-input mode: it re-runs the
+    normalize stage and emits a ``normalize-not-idempotent`` warning when the
+    result differs from the input.
+
+    Args:
+        document: The document claimed to be normalized.
+        preserve_whitespace_tags: Set of tag names whose whitespace should be preserved.
+
+    Returns:
+        The input document if it was already normalized, otherwise the
+        re-normalized document.
+    """
+    normalized = normalize_document(document, preserve_whitespace_tags=preserve_whitespace_tags)
+    # Unchanged subtrees are reused, so this is mostly identity checks.
+    if normalized.children == document.children:
+        return document
+    emit_diagnostic(
+        DiagnosticEvent(
+            code="normalize-not-idempotent",
+            category="normalize",
+            severity="warn",
+            message="Document marked as normalized changed when normalized again",
+        )
+    )
+    return normalized
 
 
 def _normalize_children(
@@ -39,134 +109,195 @@ def _normalize_children(
     preserve: set[str],
     parent_is_block: bool,
 ) -> tuple[HtmlNode, ...]:
+    kinds = _classify_children(children, preserve)
     normalized: list[HtmlNode] = []
-    buffer: list[str] = []
+    normalized_kinds: list[int] = []
+    # Pending text run as (collapsed text, reusable original node or None).
+    pending: list[tuple[str, HtmlText | None]] = []
 
-    def flush_text() -> None:
-        if not buffer:
-            return
-        text = "".join(buffer)
-        if text.strip():
-            normalized.append(HtmlText(text=text))
-        buffer.clear()
-
-    def flush_text_with_whitespace() -> None:
-        """Flush buffer preserving significant whitespace between inline elements."""
-        if not buffer:
+    def flush_text(*, keep_whitespace: bool = False) -> None:
+        """Flush the pending run, keeping whitespace-only text if requested."""
+        if not pending:
             return
-        text = "".join(buffer)
-        if text:
-            normalized.append(HtmlText(text=text))
-        buffer.clear()
+        text, original = pending.pop()
+        if text.strip() or (keep_whitespace and text):
+            normalized.append(original or HtmlText(text=text))
+            normalized_kinds.append(_TEXT)
 
-    for index, child in enumerate(children):
-        if isinstance(child, HtmlText):
-            collapsed = _collapse_whitespace(child.text)
-            if not collapsed.strip():
-                # Whitespace-only text: preserve if between inline elements
-                if collapsed and not parent_is_block:
-                    # Inside inline context, keep whitespace
-                    buffer.append(collapsed)
-                elif collapsed and normalized and index < len(children) - 1:
-                    # Check if between two inline elements
-                    prev_is_inline = isinstance(normalized[-1], HtmlElement) and not _is_block_tag(
-                        normalized[-1].tag
-                    )
-                    next_child = children[index + 1]
-                    next_is_inline = isinstance(next_child, HtmlElement) and not _is_block_tag(
-                        next_child.tag
-                    )
-                    if prev_is_inline and next_is_inline:
-                        buffer.append(collapsed)
-                continue
-            buffer.append(collapsed)
+    index = 0
+    count = len(children)
+    while index < count:
+        child = children[index]
+        kind = kinds[index]
+        if kind & _TEXT:
+            # Collapse the whole run of sibling text nodes in one pass.
+            end = index + 1
+            while end < count and kinds[end] & _TEXT:
+                end += 1
+            collapsed, original = _collapse_text_run(children, index, end)
+            next_kind = kinds[end] if end < count else _NONE
+            index = end
+            # Whitespace-only text is kept only when it separates inline content
+            if collapsed.strip() or _keeps_whitespace(
+                collapsed,
+                normalized_kinds[-1] if normalized_kinds else _NONE,
+                next_kind,
+                parent_is_block,
+            ):
+                pending.append((collapsed, original))
             continue
 
-        if isinstance(child, HtmlElement) and child.tag.lower() in preserve:
-            flush_text_with_whitespace()
+        index += 1
+        if kind & _PRESERVE:
+            flush_text(keep_whitespace=True)
             normalized.append(child)
+            normalized_kinds.append(kind)
             continue
 
-        if isinstance(child, HtmlElement):
-            if _is_block_tag(child.tag):
+        if kind & _ELEMENT:
+            is_block = bool(kind & _BLOCK)
+            if is_block:
                 flush_text()  # Strip whitespace before block
             else:
-                flush_text_with_whitespace()  # Keep whitespace before inline
+                flush_text(keep_whitespace=True)  # Keep whitespace before inline
             normalized_children = _normalize_children(
                 child.children,
                 preserve,
-                parent_is_block=_is_block_tag(child.tag),
-            )
-            normalized.append(
-                HtmlElement(tag=child.tag, attrs=child.attrs, children=normalized_children)
+                parent_is_block=is_block,
             )
+            if _same_nodes(normalized_children, child.children):
+                normalized.append(child)
+            else:
+                normalized.append(
+                    HtmlElement(tag=child.tag, attrs=child.attrs, children=normalized_children)
+                )
+            normalized_kinds.append(kind)
             continue
 
         flush_text()
         normalized.append(child)
+        normalized_kinds.append(kind)
 
     flush_text()
-    return _trim_boundary_whitespace(tuple(normalized), parent_is_block)
+    return _trim_boundary_whitespace(tuple(normalized), normalized_kinds, parent_is_block)
+
+
+def _classify_children(children: tuple[HtmlNode, ...], preserve: set[str]) -> list[int]:
+    """Compute the kind flags of every sibling once, up front.
+
+    Every later whitespace decision (trim, keep between inline elements, drop
+    boundary breaks) is a bit test against this list instead of re-lowering
+    and re-looking-up neighbor tags.
+    """
+    kinds: list[int] = []
+    for child in children:
+        if isinstance(child, HtmlText):
+            kinds.append(_TEXT)
+        elif isinstance(child, HtmlElement):
+            kinds.append(_element_kind(child.tag.lower(), preserve))
+        else:
+            kinds.append(_NONE)
+    return kinds
+
+
+def _element_kind(tag: str, preserve: set[str]) -> int:
+    kind = _BLOCK_KIND if tag in BLOCK_TAGS else _INLINE_KIND
+    if tag == "br":
+        kind |= _LINE_BREAK
+    if tag in preserve:
+        kind |= _PRESERVE
+    return kind
 
 
 def _trim_boundary_whitespace(
     children: tuple[HtmlNode, ...],
+    kinds: list[int],
     parent_is_block: bool,
 ) -> tuple[HtmlNode, ...]:
     if not children or not parent_is_block:
         return children
     trimmed: list[HtmlNode] = []
+    trimmed_kinds: list[int] = []
     last_index = len(children) - 1
     for index, child in enumerate(children):
-        if not isinstance(child, HtmlText):
+        kind = kinds[index]
+        if not kind & _TEXT:
             trimmed.append(child)
+            trimmed_kinds.append(kind)
             continue
         text = child.text
-        prev_child = children[index - 1] if index > 0 else None
-        next_child = children[index + 1] if index < last_index else None
-        if index == 0 or (prev_child is not None and _is_block_element(prev_child)):
+        prev_kind = kinds[index - 1] if index > 0 else _NONE
+        next_kind = kinds[index + 1] if index < last_index else _NONE
+        if index == 0 or prev_kind & _BLOCK:
             text = text.lstrip()
-        if index == last_index or (next_child is not None and _is_block_element(next_child)):
+        if index == last_index or next_kind & _BLOCK:
             text = text.rstrip()
-        # Keep whitespace-only text if between two inline elements
-        if text.strip():
-            trimmed.append(HtmlText(text=text))
-        elif text and prev_child is not None and next_child is not None:
-            # Whitespace between two elements - check if both are inline
-            prev_is_inline = isinstance(prev_child, HtmlElement) and not _is_block_tag(
-                prev_child.tag
-            )
-            next_is_inline = isinstance(next_child, HtmlElement) and not _is_block_tag(
-                next_child.tag
-            )
-            if prev_is_inline and next_is_inline:
-                trimmed.append(HtmlText(text=text))
-    return _trim_boundary_breaks(tuple(trimmed))
+        # Keep whitespace-only text only if between two inline elements
+        if text.strip() or (text and prev_kind & _INLINE and next_kind & _INLINE):
+            trimmed.append(child if text == child.text else HtmlText(text=text))
+            trimmed_kinds.append(kind)
+    return _trim_boundary_breaks(tuple(trimmed), trimmed_kinds)
 
 
-def _trim_boundary_breaks(children: tuple[HtmlNode, ...]) -> tuple[HtmlNode, ...]:
+def _keeps_whitespace(
+    text: str,
+    prev_kind: int,
+    next_kind: int,
+    parent_is_block: bool,
+) -> bool:
+    if not text:
+        return False
+    if not parent_is_block:
+        # Inside inline context, keep whitespace
+        return True
+    # Check if between two inline elements
+    return bool(prev_kind & _INLINE and next_kind & _INLINE)
+
+
+def _trim_boundary_breaks(
+    children: tuple[HtmlNode, ...],
+    kinds: list[int],
+) -> tuple[HtmlNode, ...]:
     if not children:
         return children
     start = 0
     end = len(children)
-    while start < end and _is_line_break(children[start]):
+    while start < end and kinds[start] & _LINE_BREAK:
         start += 1
-    while end > start and _is_line_break(children[end - 1]):
+    while end > start and kinds[end - 1] & _LINE_BREAK:
         end -= 1
+    if start == 0 and end == len(children):
+        return children
     return children[start:end]
 
 
-def _is_line_break(node: HtmlNode) -> bool:
-    return isinstance(node, HtmlElement) and node.tag.lower() == "br"
-
+def _collapse_whitespace(text: str) -> str:
+    if _COLLAPSIBLE_RE.search(text) is None:
+        return text
+    return _WHITESPACE_RE.sub(" ", text)
 
-def _is_block_element(node: HtmlNode) -> bool:
-    return isinstance(node, HtmlElement) and node.tag.lower() in BLOCK_TAGS
 
+def _collapse_text_run(
+    children: tuple[HtmlNode, ...],
+    start: int,
+    end: int,
+) -> tuple[str, HtmlText | None]:
+    """Collapse whitespace across ``children[start:end]`` (all text nodes).
 
-def _is_block_tag(tag: str) -> bool:
-    return tag.lower() in BLOCK_TAGS
+    Returns the collapsed text and, when the run is a single node whose text is
+    already normalized, that node so callers can reuse it instead of allocating.
+    """
+    if end - start == 1:
+        node = children[start]
+        collapsed = _collapse_whitespace(node.text)
+        if collapsed is node.text:
+            return collapsed, node
+    else:
+        collapsed = _collapse_whitespace("".join(node.text for node in children[start:end]))
+    if collapsed == " ":
+        return collapsed, _SPACE
+    return collapsed, None
 
 
-def _collapse_whitespace(text: str) -> str:
-    return _WHITESPACE_RE.sub(" ", text)
+def _same_nodes(left: tuple[HtmlNode, ...], right: tuple[HtmlNode, ...]) -> bool:
+    return len(left) == len(right) and all(a is b for a, b in zip(left, right, strict=True))
@@ -0,0 +1,192 @@
+"""Parallel conversion of the top-level blocks of one document."""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, Literal
+
+from html2latex.ast import HtmlDocument, HtmlElement, HtmlNode, HtmlText
+from html2latex.latex import LatexDocumentAst, infer_packages, serialize_fragment
+
+from .convert import _AnchorIndex, _convert_nodes, _root_context
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+    from pathlib import Path
+
+    from html2latex.styles import ClassProfile
+
+    from .convert import TagHandler
+
+__all__ = ["convert_parallel", "partition_blocks"]
+
+# Chunks smaller than this (in weight units, roughly bytes of text) are not
+# worth the cost of shipping them to a worker.
+_MIN_CHUNK_WEIGHT = 64 * 1024
+# Chunks per worker, so one slow chunk does not leave the other workers idle.
+_CHUNKS_PER_WORKER = 4
+# Weight of an element on top of its text, for markup-heavy blocks.
+_ELEMENT_WEIGHT = 16
+
+
+def convert_parallel(
+    document: HtmlDocument,
+    *,
+    handlers: Mapping[str, TagHandler] | None = None,
+    longtable_threshold: int | None = None,
+    class_profiles: Sequence[ClassProfile] = (),
+    image_root: str | Path | None = None,
+    formatted: bool = False,
+    encoding: Literal["utf8", "ascii-latex"] = "utf8",
+    workers: int | None = None,
+    executor: Executor | None = None,
+) -> tuple[str, set[str]]:
+    """Convert and serialize a document's top-level blocks in parallel.
+
+    Top-level blocks are independent (quote and list nesting start from zero
+    at the top), so they are split into size-balanced runs of consecutive
+    blocks that are converted and serialized concurrently and joined in
+    order. The body matches ``serialize_document(convert_document(...))``.
+    Top-level ``<style>`` elements are sent with every run, so stylesheet
+    rules apply throughout the document, and ``#id`` links are indexed
+    while the blocks are weighed, so they resolve across runs.
+
+    Args:
+        document: The HTML document to convert.
+        handlers: Optional tag handler mapping, as for ``convert_document``.
+            With the default process pool, handlers must be picklable
+            (module-level functions or ``functools.partial`` of them).
+        longtable_threshold: As for ``convert_document``.
+        class_profiles: As for ``convert_document``.
+        image_root: As for ``convert_document``.
+        formatted: If True, produce human-readable output with indentation.
+        encoding: As for ``serialize_document``.
+        workers: Number of worker processes for the default pool; None uses
+            the number of CPUs. Ignored when ``executor`` is given.
+        executor: Optional executor to run chunks on, e.g. a
+            ``ThreadPoolExecutor`` or a long-lived process pool.
+
+    Returns:
+        The serialized body and the set of LaTeX packages it requires.
+    """
+    parts = (workers or os.cpu_count() or 1) * _CHUNKS_PER_WORKER
+    anchors = _AnchorIndex()
+    chunks = _partition(document.children, parts, _MIN_CHUNK_WEIGHT, anchors)
+    anchors.link()
+    styles = tuple(
+        block
+        for block in document.children
+        if isinstance(block, HtmlElement) and block.tag.lower() == "style"
+    )
+    job = partial(
+        _convert_chunk,
+        styles=styles,
+        labels=anchors.linked,
+        handlers=None if handlers is None else dict(handlers),
+        longtable_threshold=longtable_threshold,
+        class_profiles=tuple(class_profiles),
+        image_root=image_root,
+        formatted=formatted,
+        encoding=encoding,
+    )
+    if len(chunks) <= 1:
+        results = [job(chunk) for chunk in chunks]
+    elif executor is not None:
+        results = list(executor.map(job, chunks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(job, chunks))
+
+    body = "".join(text for text, _ in results)
+    packages: set[str] = set()
+    for _, chunk_packages in results:
+        packages |= chunk_packages
+    return (body.rstrip() if formatted else body), packages
+
+
+def partition_blocks(
+    blocks: tuple[HtmlNode, ...], parts: int, *, min_weight: int = 0
+) -> list[tuple[HtmlNode, ...]]:
+    """Split ``blocks`` into at most ``parts`` runs of similar total size.
+
+    Runs keep document order and are never split inside a block, so a single
+    huge block forms its own run.
+
+    Args:
+        blocks: Top-level document children.
+        parts: Maximum number of runs.
+        min_weight: Smallest run worth creating, in text bytes; fewer runs
+            are returned for small documents.
+
+    Returns:
+        Consecutive, non-empty runs covering ``blocks``.
+    """
+    return _partition(blocks, parts, min_weight, None)
+
+
+def _partition(
+    blocks: tuple[HtmlNode, ...], parts: int, min_weight: int, anchors: _AnchorIndex | None
+) -> list[tuple[HtmlNode, ...]]:
+    if not blocks:
+        return []
+    weights = [_block_weight(block, anchors) for block in blocks]
+    total = sum(weights)
+    target = max(total / max(parts, 1), min_weight, 1)
+    chunks: list[tuple[HtmlNode, ...]] = []
+    start = 0
+    filled = 0
+    for index, weight in enumerate(weights):
+        filled += weight
+        # Every closed run weighs at least ``target``, which bounds the count.
+        if filled >= target:
+            chunks.append(blocks[start : index + 1])
+            start = index + 1
+            filled = 0
+    if start < len(blocks):
+        chunks.append(blocks[start:])
+    return chunks
+
+
+def _block_weight(node: HtmlNode, anchors: _AnchorIndex | None) -> int:
+    weight = 0
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, HtmlText):
+            weight += len(current.text)
+        elif isinstance(current, HtmlElement):
+            weight += _ELEMENT_WEIGHT
+            if anchors is not None:
+                anchors.add(current)
+            stack.extend(current.children)
+    return weight
+
+
+def _convert_chunk(
+    blocks: tuple[HtmlNode, ...],
+    *,
+    styles: tuple[HtmlElement, ...],
+    labels: frozenset[str],
+    handlers: Mapping[str, TagHandler] | None,
+    longtable_threshold: int | None,
+    class_profiles: tuple[ClassProfile, ...],
+    image_root: str | Path | None,
+    formatted: bool,
+    encoding: Literal["utf8", "ascii-latex"],
+) -> tuple[str, set[str]]:
+    # As convert_document, with link targets from the whole document
+    document = HtmlDocument(children=(*styles, *blocks))
+    context = _root_context(
+        document,
+        handlers,
+        longtable_threshold,
+        class_profiles,
+        anchors=_AnchorIndex(linked=labels) if labels else None,
+        image_root=image_root,
+    )
+    latex = LatexDocumentAst(body=_convert_nodes(document.children, context))
+    return serialize_fragment(latex.body, formatted=formatted, encoding=encoding), infer_packages(
+        latex
+    )
@@ -0,0 +1,137 @@
+r"""Conversion of long documents into one ``.tex`` file per part.
+
+The top-level blocks are grouped into parts at top-level headings, and each
+part is stream-converted straight into its own file, so the LaTeX held in
+memory at any time is bounded by one block rather than the whole book. A
+master file pulls the parts in with ``\include``, so LaTeX can recompile a
+subset of them with ``\includeonly``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal
+
+from html2latex.ast import HtmlElement, HtmlText
+
+from .convert import _root_context
+from .stream import _stream_block
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping, Sequence
+
+    from html2latex.ast import HtmlDocument, HtmlNode
+    from html2latex.styles import ClassProfile
+
+    from .convert import TagHandler
+
+__all__ = ["SplitPart", "write_parts"]
+
+
+@dataclass(frozen=True, slots=True)
+class SplitPart:
+    r"""One part file written by ``write_parts``.
+
+    Attributes:
+        name: File name without the ``.tex`` suffix, as ``\include`` and
+            ``\includeonly`` take it.
+        path: Path of the written file.
+        packages: LaTeX packages the part requires.
+    """
+
+    name: str
+    path: Path
+    packages: frozenset[str]
+
+
+def write_parts(
+    document: HtmlDocument,
+    directory: str | Path,
+    *,
+    level: int = 1,
+    prefix: str = "part",
+    handlers: Mapping[str, TagHandler] | None = None,
+    longtable_threshold: int | None = None,
+    class_profiles: Sequence[ClassProfile] = (),
+    image_root: str | Path | None = None,
+    formatted: bool = False,
+    encoding: Literal["utf8", "ascii-latex"] = "utf8",
+) -> tuple[SplitPart, ...]:
+    r"""Stream-convert ``document`` into one file per part.
+
+    A new part starts at every top-level heading from ``<h1>`` down to
+    ``<h{level}>``; content before the first such heading forms a part of
+    its own unless it is blank. Parts are named ``{prefix}-001`` and so on.
+    Conversion is as in ``stream_convert``: every anchor gets a
+    ``\label``, so ``#id`` links resolve across parts.
+
+    Args:
+        document: The HTML document to convert.
+        directory: Directory to write the parts to; created if missing.
+        level: Deepest heading level that starts a new part.
+        prefix: File name prefix of the parts.
+        handlers: Optional tag handler mapping, as for ``convert_document``.
+        longtable_threshold: As for ``stream_convert``.
+        class_profiles: Editor class profiles, as for ``convert_document``.
+        image_root: As for ``convert_document``.
+        formatted: If True, write human-readable output with indentation,
+            as ``stream_convert`` does.
+        encoding: As for ``serialize_document``.
+
+    Returns:
+        The written parts, in document order.
+
+    Raises:
+        ValueError: If ``level`` is not between 1 and 6.
+    """
+    if not 1 <= level <= 6:
+        msg = f"level must be between 1 and 6, got {level}"
+        raise ValueError(msg)
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    breaks = frozenset(f"h{depth}" for depth in range(1, level + 1))
+    context = _root_context(
+        document,
+        handlers,
+        longtable_threshold,
+        class_profiles,
+        streaming=True,
+        image_root=image_root,
+    )
+    parts: list[SplitPart] = []
+    for blocks in _group_blocks(document.children, breaks):
+        name = f"{prefix}-{len(parts) + 1:03d}"
+        path = directory / f"{name}.tex"
+        packages: set[str] = set()
+        with path.open("w", encoding="utf-8") as out:
+            for block in blocks:
+                out.writelines(
+                    _stream_block(block, context, packages, formatted=formatted, encoding=encoding)
+                )
+            out.write("\n")
+        parts.append(SplitPart(name=name, path=path, packages=frozenset(packages)))
+    return tuple(parts)
+
+
+def _group_blocks(
+    children: tuple[HtmlNode, ...], breaks: frozenset[str]
+) -> Iterator[tuple[HtmlNode, ...]]:
+    """Yield runs of top-level blocks, each starting at a breaking heading."""
+    start = 0
+    for index, child in enumerate(children):
+        if isinstance(child, HtmlElement) and child.tag.lower() in breaks and index > start:
+            if start or not _is_blank(children[start:index]):
+                yield children[start:index]
+            start = index
+    if start < len(children) and (start or not _is_blank(children[start:])):
+        yield children[start:]
+
+
+def _is_blank(blocks: tuple[HtmlNode, ...]) -> bool:
+    """Return True for front matter that produces no text: whitespace and styles."""
+    return all(
+        (isinstance(block, HtmlText) and not block.text.strip())
+        or (isinstance(block, HtmlElement) and block.tag.lower() == "style")
+        for block in blocks
+    )
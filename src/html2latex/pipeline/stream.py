@@ -2,28 +2,106 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Literal
 
-from html2latex.latex import serialize_nodes
+from html2latex.latex import LatexDocumentAst, infer_packages, serialize_nodes, stream_tabular
 
-from .convert import convert_document
+from .convert import _convert_nodes, _iter_nodes, _root_context, _stream_table
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Iterable, Iterator, Mapping, Sequence
+    from pathlib import Path
 
-    from html2latex.ast import HtmlDocument
+    from html2latex.ast import HtmlDocument, HtmlNode
+    from html2latex.latex import LatexTableRow
+    from html2latex.styles import ClassProfile
+
+    from .convert import ConversionContext, TagHandler
 
 __all__ = ["stream_convert"]
 
 
-def stream_convert(document: HtmlDocument) -> Iterable[str]:
+def stream_convert(
+    document: HtmlDocument,
+    *,
+    handlers: Mapping[str, TagHandler] | None = None,
+    longtable_threshold: int | None = None,
+    class_profiles: Sequence[ClassProfile] = (),
+    image_root: str | Path | None = None,
+    formatted: bool = False,
+    encoding: Literal["utf8", "ascii-latex"] = "utf8",
+) -> Iterator[str]:
     """Stream-convert an HTML document to LaTeX strings.
 
+    Each top-level block is converted, serialized and yielded before the
+    next one is visited, so the first chunk is available immediately and
+    memory stays proportional to the largest block rather than the document.
+    Top-level tables that become ``longtable`` are converted and emitted one
+    row at a time, so memory for them stays proportional to a single row.
+
     Args:
         document: The HTML document to convert.
+        handlers: Optional tag handler mapping, as for ``convert_document``.
+        longtable_threshold: Tables with more rows than this become
+            ``longtable`` environments. None keeps every table a ``tabular``.
+        class_profiles: Editor class profiles, as for ``convert_document``.
+        image_root: As for ``convert_document``.
+        formatted: If True, produce human-readable output with indentation;
+            the chunks join to the ``serialize_fragment`` output.
+        encoding: How non-ASCII text is written, as for
+            ``serialize_document``.
 
     Yields:
         LaTeX string fragments.
     """
-    ast = convert_document(document)
-    yield from serialize_nodes(ast.body)
+    context = _root_context(
+        document,
+        handlers,
+        longtable_threshold,
+        class_profiles,
+        streaming=True,
+        image_root=image_root,
+    )
+    for child in document.children:
+        yield from _stream_block(child, context, formatted=formatted, encoding=encoding)
+
+
+def _stream_block(
+    child: HtmlNode,
+    context: ConversionContext,
+    packages: set[str] | None = None,
+    *,
+    formatted: bool = False,
+    encoding: Literal["utf8", "ascii-latex"] = "utf8",
+) -> Iterator[str]:
+    """Convert and serialize one top-level block of a streaming conversion.
+
+    With ``packages``, the packages the block requires are added to it as
+    its nodes are produced; streamed longtable rows are still serialized one
+    at a time.
+    """
+    memo = context.state.memo
+    if memo is not None:
+        memo.observe((child,))
+    table = _stream_table(child, context)
+    if table is None:
+        if packages is None:
+            yield from serialize_nodes(
+                _iter_nodes((child,), context), formatted=formatted, encoding=encoding
+            )
+            return
+        nodes = _convert_nodes((child,), context)
+        packages |= infer_packages(LatexDocumentAst(body=nodes))
+        yield from serialize_nodes(nodes, formatted=formatted, encoding=encoding)
+        return
+    head, body_rows = table
+    if packages is not None:
+        packages |= infer_packages(LatexDocumentAst(body=(head,)))
+        body_rows = _collect_packages(body_rows, packages)
+    yield from stream_tabular(head, body_rows, formatted=formatted, encoding=encoding)
+
+
+def _collect_packages(rows: Iterable[LatexTableRow], packages: set[str]) -> Iterator[LatexTableRow]:
+    for row in rows:
+        packages |= infer_packages(LatexDocumentAst(body=(row,)))
+        yield row
@@ -1 +1,49 @@
-# Styles module - placeholder for future style configurations
+"""CSS style and class handling for the html2latex pipeline."""
+
+from .classes import (
+    DISPLAY_MATH_CLASSES,
+    EMPTY_CLASSES,
+    MATH_CLASSES,
+    ClassList,
+    parse_class_attribute,
+)
+from .inline import (
+    EMPTY_STYLE,
+    InlineStyle,
+    InlineWrapper,
+    StyleCacheInfo,
+    clear_style_cache,
+    parse_inline_style,
+    style_cache_info,
+)
+from .profiles import (
+    CKEDITOR_PROFILE,
+    CLASS_PROFILES,
+    QUILL_PROFILE,
+    ClassProfile,
+    compile_class_profiles,
+)
+from .stylesheet import StyleRule, Stylesheet, parse_stylesheet
+
+__all__ = [
+    "CKEDITOR_PROFILE",
+    "CLASS_PROFILES",
+    "DISPLAY_MATH_CLASSES",
+    "EMPTY_CLASSES",
+    "EMPTY_STYLE",
+    "MATH_CLASSES",
+    "QUILL_PROFILE",
+    "ClassList",
+    "ClassProfile",
+    "InlineStyle",
+    "InlineWrapper",
+    "StyleCacheInfo",
+    "StyleRule",
+    "Stylesheet",
+    "clear_style_cache",
+    "compile_class_profiles",
+    "parse_class_attribute",
+    "parse_inline_style",
+    "parse_stylesheet",
+    "style_cache_info",
+]
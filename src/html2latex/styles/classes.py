@@ -0,0 +1,73 @@
+"""Tokenizing of ``class`` attributes.
+
+Editor output repeats the same ``class`` strings on thousands of elements
+(Quill puts ``ql-*`` classes on every run), so each distinct string is split
+once into an interned token set, with the class-based checks the converter
+needs answered up front, and kept in a bounded, process-wide cache.
+"""
+
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+
+__all__ = [
+    "DISPLAY_MATH_CLASSES",
+    "EMPTY_CLASSES",
+    "MATH_CLASSES",
+    "ClassList",
+    "parse_class_attribute",
+]
+
+CLASS_CACHE_SIZE = 4096
+
+# Classes marking an element whose text is a LaTeX formula
+MATH_CLASSES = frozenset({"math-tex", "math-tex-block", "math-display", "math-inline"})
+# Math classes that request display (rather than inline) math
+DISPLAY_MATH_CLASSES = frozenset({"math-tex-block", "math-display"})
+
+
+@dataclass(frozen=True, slots=True)
+class ClassList:
+    """A tokenized ``class`` attribute.
+
+    Attributes:
+        tokens: The distinct class names, interned.
+        math: True if any token is in ``MATH_CLASSES``.
+        display_math: True if any token is in ``DISPLAY_MATH_CLASSES``.
+    """
+
+    tokens: frozenset[str] = frozenset()
+    math: bool = False
+    display_math: bool = False
+
+
+EMPTY_CLASSES = ClassList()
+
+
+def parse_class_attribute(value: str | None) -> ClassList:
+    """Return the tokenized form of a ``class`` attribute value.
+
+    Args:
+        value: The raw attribute value, or None when the attribute is absent.
+
+    Returns:
+        The cached ``ClassList`` for ``value``; ``EMPTY_CLASSES`` when there
+        are no classes.
+    """
+    if not value:
+        return EMPTY_CLASSES
+    return _parse_cached(value)
+
+
+@lru_cache(maxsize=CLASS_CACHE_SIZE)
+def _parse_cached(value: str) -> ClassList:
+    tokens = frozenset(sys.intern(token) for token in value.split())
+    if not tokens:
+        return EMPTY_CLASSES
+    return ClassList(
+        tokens=tokens,
+        math=not tokens.isdisjoint(MATH_CLASSES),
+        display_math=not tokens.isdisjoint(DISPLAY_MATH_CLASSES),
+    )
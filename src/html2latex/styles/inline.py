@@ -0,0 +1,342 @@
+"""Parsing of inline CSS ``style`` attributes.
+
+Editor output repeats a handful of style strings thousands of times, so each
+distinct string is parsed once into an immutable ``InlineStyle`` record and
+kept in a bounded, process-wide cache.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+
+from html2latex.latex import LatexGroup, LatexText
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+
+__all__ = [
+    "EMPTY_STYLE",
+    "InlineStyle",
+    "InlineWrapper",
+    "StyleCacheInfo",
+    "clear_style_cache",
+    "parse_inline_style",
+    "style_cache_info",
+]
+
+STYLE_CACHE_SIZE = 4096
+
+_TEXT_ALIGNMENTS = frozenset(("left", "center", "right"))
+
+
+@dataclass(frozen=True, slots=True)
+class InlineWrapper:
+    r"""One LaTeX wrapper around styled inline content.
+
+    Attributes:
+        command: Command name (``textcolor``) or, for switches, the size
+            declaration (``large``).
+        args: Arguments placed before the content group, built once per style.
+        options: Optional arguments, e.g. ``("HTML",)`` for hex colors.
+        switch: True for declarations written as ``{\large ...}`` rather than
+            ``\command{...}``.
+    """
+
+    command: str
+    args: tuple[LatexGroup, ...] = ()
+    options: tuple[str, ...] = ()
+    switch: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class InlineStyle:
+    """A parsed ``style`` attribute.
+
+    Attributes:
+        declarations: Lowercased ``property -> value`` pairs; later
+            declarations of a property win.
+        text_align: ``"left"``, ``"center"`` or ``"right"`` if set.
+        width: Raw CSS ``width`` value, if any.
+        height: Raw CSS ``height`` value, if any.
+        indent: Raw CSS ``padding-left`` (else ``margin-left``) value, if any.
+        wrappers: LaTeX wrappers for inline content, innermost first.
+    """
+
+    declarations: Mapping[str, str]
+    text_align: str | None = None
+    width: str | None = None
+    height: str | None = None
+    indent: str | None = None
+    wrappers: tuple[InlineWrapper, ...] = ()
+
+
+EMPTY_STYLE = InlineStyle(declarations=MappingProxyType({}))
+
+
+@dataclass(frozen=True, slots=True)
+class StyleCacheInfo:
+    """Counters for the shared style cache.
+
+    Attributes:
+        hits: Lookups answered from the cache.
+        misses: Lookups that parsed a new style string.
+        size: Distinct style strings currently cached.
+        max_size: Cache capacity; least recently used entries are evicted.
+    """
+
+    hits: int
+    misses: int
+    size: int
+    max_size: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache (0.0 when unused)."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def parse_inline_style(style: str) -> InlineStyle:
+    """Return the parsed form of a ``style`` attribute value.
+
+    Args:
+        style: The raw attribute value.
+
+    Returns:
+        The cached ``InlineStyle`` for ``style``; ``EMPTY_STYLE`` for an empty
+        string.
+    """
+    if not style:
+        return EMPTY_STYLE
+    return _parse_cached(style)
+
+
+def style_cache_info() -> StyleCacheInfo:
+    """Return hit/miss counters for the process-wide style cache."""
+    info = _parse_cached.cache_info()
+    return StyleCacheInfo(
+        hits=info.hits,
+        misses=info.misses,
+        size=info.currsize,
+        max_size=info.maxsize or 0,
+    )
+
+
+def clear_style_cache() -> None:
+    """Empty the process-wide style cache and reset its counters."""
+    _parse_cached.cache_clear()
+
+
+@lru_cache(maxsize=STYLE_CACHE_SIZE)
+def _parse_cached(style: str) -> InlineStyle:
+    return _build_style(_parse_declarations(style))
+
+
+def _build_style(declarations: dict[str, str]) -> InlineStyle:
+    """Build the style record for parsed declarations, read by exact property name."""
+    align = declarations.get("text-align", "").partition(" ")[0]
+    return InlineStyle(
+        declarations=MappingProxyType(declarations),
+        text_align=align if align in _TEXT_ALIGNMENTS else None,
+        width=declarations.get("width"),
+        height=declarations.get("height"),
+        indent=declarations.get("padding-left") or declarations.get("margin-left"),
+        wrappers=_compile_wrappers(declarations),
+    )
+
+
+def _parse_declarations(style: str) -> dict[str, str]:
+    parsed: dict[str, str] = {}
+    for chunk in style.split(";"):
+        if ":" not in chunk:
+            continue
+        key, value = chunk.split(":", 1)
+        key = key.strip().lower()
+        value = value.strip().lower()
+        if not key or not value:
+            continue
+        parsed[key] = value
+    return parsed
+
+
+def _compile_wrappers(declarations: Mapping[str, str]) -> tuple[InlineWrapper, ...]:
+    wrappers: list[InlineWrapper] = []
+    for prop, compile_property in _PROPERTY_COMPILERS:
+        value = declarations.get(prop)
+        if value:
+            wrappers.extend(compile_property(value))
+    return tuple(wrappers)
+
+
+def _font_weight(value: str) -> tuple[InlineWrapper, ...]:
+    if value in {"bold", "bolder"} or (value.isdigit() and int(value) >= 600):
+        return (_TEXTBF,)
+    return ()
+
+
+def _font_style(value: str) -> tuple[InlineWrapper, ...]:
+    if value in {"italic", "oblique"}:
+        return (_TEXTIT,)
+    return ()
+
+
+def _text_decoration(value: str) -> tuple[InlineWrapper, ...]:
+    tokens = {part for part in value.replace(",", " ").split() if part}
+    wrappers: list[InlineWrapper] = []
+    if "underline" in tokens:
+        wrappers.append(_UNDERLINE)
+    if "line-through" in tokens:
+        wrappers.append(_SOUT)
+    return tuple(wrappers)
+
+
+def _font_family(value: str) -> tuple[InlineWrapper, ...]:
+    families = {family.strip().strip("'\"") for family in value.split(",")}
+    if families & _MONOSPACE_FAMILIES:
+        return (_TEXTTT,)
+    return ()
+
+
+def _font_size(value: str) -> tuple[InlineWrapper, ...]:
+    if value in _FONT_SIZE_KEYWORDS:
+        switch = _FONT_SIZE_KEYWORDS[value]
+    else:
+        match = _FONT_SIZE_RE.fullmatch(value)
+        if not match:
+            return ()
+        number = float(match.group(1))
+        if number <= 0:
+            return ()
+        # Size relative to the 16px (12pt) browser default, mapped onto the
+        # LaTeX sizes of a 10pt document and snapped to the nearest one.
+        relative = number / _FONT_SIZE_UNITS[match.group(2)]
+        target = math.log(relative * 10.0)
+        switch = min(_FONT_SIZE_STEPS, key=lambda step: abs(math.log(step[0]) - target))[1]
+    if switch is None:
+        return ()
+    return (InlineWrapper(command=switch, switch=True),)
+
+
+def _color(command: str) -> Callable[[str], tuple[InlineWrapper, ...]]:
+    def compile_color(value: str) -> tuple[InlineWrapper, ...]:
+        parsed = _parse_color(value)
+        if parsed is None:
+            return ()
+        options, color = parsed
+        group = LatexGroup(children=(LatexText(text=color),))
+        return (InlineWrapper(command=command, args=(group,), options=options),)
+
+    return compile_color
+
+
+def _parse_color(value: str) -> tuple[tuple[str, ...], str] | None:
+    """Return ``(xcolor model options, color)`` for a CSS color, or None."""
+    if value in _XCOLOR_NAMES:
+        return (), value
+    hex_value = _CSS_NAMED_COLORS.get(value)
+    if hex_value is not None:
+        return ("HTML",), hex_value
+    match = _HEX_COLOR_RE.fullmatch(value)
+    if match:
+        digits = match.group(1)
+        if len(digits) == 3:
+            digits = "".join(digit * 2 for digit in digits)
+        return ("HTML",), digits.upper()
+    match = _RGB_COLOR_RE.fullmatch(value)
+    if match:
+        red, green, blue, alpha = match.groups()
+        if alpha is not None and float(alpha) == 0:
+            return None
+        channels = (min(int(channel), 255) for channel in (red, green, blue))
+        return ("RGB",), ",".join(str(channel) for channel in channels)
+    return None
+
+
+_TEXTBF = InlineWrapper(command="textbf")
+_TEXTIT = InlineWrapper(command="textit")
+_UNDERLINE = InlineWrapper(command="underline")
+_SOUT = InlineWrapper(command="sout")
+_TEXTTT = InlineWrapper(command="texttt")
+
+_MONOSPACE_FAMILIES = frozenset(
+    {
+        "monospace",
+        "ui-monospace",
+        "courier",
+        "courier new",
+        "consolas",
+        "menlo",
+        "monaco",
+        "lucida console",
+        "source code pro",
+        "dejavu sans mono",
+        "liberation mono",
+    }
+)
+
+_FONT_SIZE_RE = re.compile(r"([0-9]+(?:\.[0-9]+)?)\s*(px|pt|em|rem|%)")
+# Amount of each unit that equals the browser default font size
+_FONT_SIZE_UNITS = {"px": 16.0, "pt": 12.0, "em": 1.0, "rem": 1.0, "%": 100.0}
+_FONT_SIZE_KEYWORDS: dict[str, str | None] = {
+    "xx-small": "tiny",
+    "x-small": "scriptsize",
+    "small": "small",
+    "medium": None,
+    "large": "large",
+    "x-large": "Large",
+    "xx-large": "LARGE",
+    "xxx-large": "huge",
+    "smaller": "small",
+    "larger": "large",
+}
+# LaTeX size switches and their point size in a 10pt document; None is \normalsize
+_FONT_SIZE_STEPS: tuple[tuple[float, str | None], ...] = (
+    (5.0, "tiny"),
+    (7.0, "scriptsize"),
+    (8.0, "footnotesize"),
+    (9.0, "small"),
+    (10.0, None),
+    (12.0, "large"),
+    (14.4, "Large"),
+    (17.28, "LARGE"),
+    (20.74, "huge"),
+    (24.88, "Huge"),
+)
+
+# CSS names that xcolor defines with the same color
+_XCOLOR_NAMES = frozenset({"black", "white", "red", "blue", "yellow", "cyan", "magenta"})
+_CSS_NAMED_COLORS = {
+    "aqua": "00FFFF",
+    "fuchsia": "FF00FF",
+    "gray": "808080",
+    "grey": "808080",
+    "green": "008000",
+    "lime": "00FF00",
+    "maroon": "800000",
+    "navy": "000080",
+    "olive": "808000",
+    "orange": "FFA500",
+    "purple": "800080",
+    "silver": "C0C0C0",
+    "teal": "008080",
+}
+_HEX_COLOR_RE = re.compile(r"#([0-9a-f]{3}|[0-9a-f]{6})")
+_RGB_COLOR_RE = re.compile(
+    r"rgba?\(\s*(\d{1,3})\s*,\s*(\d{1,3})\s*,\s*(\d{1,3})\s*(?:,\s*(\d*\.?\d+)\s*)?\)"
+)
+
+# Property -> compiler, in wrapping order (innermost first)
+_PROPERTY_COMPILERS: tuple[tuple[str, Callable[[str], tuple[InlineWrapper, ...]]], ...] = (
+    ("font-family", _font_family),
+    ("font-weight", _font_weight),
+    ("font-style", _font_style),
+    ("text-decoration", _text_decoration),
+    ("font-size", _font_size),
+    ("color", _color("textcolor")),
+    ("background-color", _color("colorbox")),
+)
@@ -0,0 +1,116 @@
+"""Class-to-style mapping profiles for WYSIWYG editor output.
+
+Some editors encode formatting in classes backed by their own stylesheet
+(Quill writes ``ql-align-center``, CKEditor 5 writes ``text-big``) rather than
+in ``style`` attributes. A profile declares, per editor, the CSS each class
+stands for. The selected profiles are compiled once into single-class rules;
+each conversion files them in a ``Stylesheet`` whose class index is the
+class-token lookup table consulted for every element, so an unknown class
+costs a single dict miss.
+"""
+
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+
+from .inline import _parse_declarations
+from .stylesheet import StyleRule
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+__all__ = [
+    "CKEDITOR_PROFILE",
+    "CLASS_PROFILES",
+    "QUILL_PROFILE",
+    "ClassProfile",
+    "compile_class_profiles",
+]
+
+
+@dataclass(frozen=True, eq=False)
+class ClassProfile:
+    """Styles an editor attaches to its formatting classes.
+
+    Profiles compare and hash by identity, so a profile object is compiled
+    once however many conversions use it.
+
+    Attributes:
+        name: Editor name, e.g. ``"quill"``.
+        classes: Class name -> CSS declarations it applies, e.g.
+            ``{"ql-align-center": "text-align: center"}``.
+    """
+
+    name: str
+    classes: Mapping[str, str]
+
+
+# Values follow the editors' own content stylesheets.
+QUILL_PROFILE = ClassProfile(
+    name="quill",
+    classes={
+        "ql-align-center": "text-align: center",
+        "ql-align-right": "text-align: right",
+        "ql-size-small": "font-size: 0.75em",
+        "ql-size-large": "font-size: 1.5em",
+        "ql-size-huge": "font-size: 2.5em",
+        "ql-font-monospace": "font-family: monospace",
+        **{f"ql-indent-{level}": f"padding-left: {3 * level}em" for level in range(1, 9)},
+    },
+)
+
+CKEDITOR_PROFILE = ClassProfile(
+    name="ckeditor",
+    classes={
+        "text-tiny": "font-size: 0.7em",
+        "text-small": "font-size: 0.85em",
+        "text-big": "font-size: 1.4em",
+        "text-huge": "font-size: 1.8em",
+        "marker-yellow": "background-color: #fdfd77",
+        "marker-green": "background-color: #62f962",
+        "marker-pink": "background-color: #fc7899",
+        "marker-blue": "background-color: #72ccfd",
+        "pen-red": "color: #e71313",
+        "pen-green": "color: #128a00",
+    },
+)
+
+# Built-in profiles by name, as accepted by ``ConvertOptions.class_profiles``
+CLASS_PROFILES: Mapping[str, ClassProfile] = MappingProxyType(
+    {profile.name: profile for profile in (QUILL_PROFILE, CKEDITOR_PROFILE)}
+)
+
+
+@lru_cache(maxsize=32)
+def compile_class_profiles(profiles: tuple[ClassProfile, ...]) -> tuple[StyleRule, ...]:
+    """Compile profiles into single-class stylesheet rules.
+
+    Args:
+        profiles: Profiles to apply; a class declared by several profiles
+            takes the styles of the last one.
+
+    Returns:
+        The rules, in profile order, ready for ``Stylesheet`` or
+        ``parse_stylesheet(..., base=...)``.
+    """
+    rules: list[StyleRule] = []
+    for profile in profiles:
+        for name, css in profile.classes.items():
+            declarations = _parse_declarations(css)
+            if not declarations:
+                continue
+            rules.append(
+                StyleRule(
+                    tag=None,
+                    classes=frozenset({sys.intern(name)}),
+                    element_id=None,
+                    declarations=MappingProxyType(declarations),
+                    specificity=(0, 1, 0),
+                    order=len(rules),
+                )
+            )
+    return tuple(rules)
@@ -0,0 +1,258 @@
+"""Parsing and matching of ``<style>`` stylesheets.
+
+Full HTML exports keep their formatting in ``<style>`` blocks and refer to it
+through classes. A stylesheet is parsed once per document into rules indexed
+by id, class and tag, so matching an element takes a few dict lookups rather
+than a scan of every selector. The matched rules are merged with the
+element's ``style`` attribute into the same ``InlineStyle`` record the
+inline-style path uses.
+
+Only simple selectors are supported: a tag (or ``*``) followed by any number
+of ``.class`` and ``#id`` parts, in comma-separated lists. Rules using
+combinators, attribute selectors or pseudo-classes, and everything inside
+at-rules such as ``@media``, are ignored.
+"""
+
+from __future__ import annotations
+
+import re
+import sys
+from dataclasses import dataclass
+from operator import attrgetter
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+
+from .classes import parse_class_attribute
+from .inline import _build_style, _parse_declarations, parse_inline_style
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping
+
+    from .inline import InlineStyle
+
+__all__ = ["StyleRule", "Stylesheet", "parse_stylesheet"]
+
+# CSS comments, plus the HTML comment markers legacy pages wrap CSS in
+_COMMENT_RE = re.compile(r"/\*.*?\*/|<!--|-->", re.DOTALL)
+_BRACE_RE = re.compile(r"[{}]")
+_SELECTOR_RE = re.compile(r"(\*|[a-z][a-z0-9-]*)?((?:[.#][_a-z0-9-]+)*)", re.IGNORECASE)
+_SELECTOR_PART_RE = re.compile(r"([.#])([_a-z0-9-]+)", re.IGNORECASE)
+_IMPORTANT_RE = re.compile(r"\s*!\s*important$")
+
+
+@dataclass(frozen=True, slots=True)
+class StyleRule:
+    """One simple selector of a stylesheet rule, with the rule's declarations.
+
+    Attributes:
+        tag: Lowercase tag the element must have, or None for any tag.
+        classes: Classes the element must all have.
+        element_id: Id the element must have, or None.
+        declarations: Lowercased ``property -> value`` pairs.
+        specificity: ``(ids, classes, tags)``; higher wins.
+        order: Position in the stylesheet; later rules win ties.
+    """
+
+    tag: str | None
+    classes: frozenset[str]
+    element_id: str | None
+    declarations: Mapping[str, str]
+    specificity: tuple[int, int, int]
+    order: int
+
+    def matches(self, tag: str, classes: frozenset[str], element_id: str | None) -> bool:
+        """Return True if an element with these properties matches the selector."""
+        return (
+            (self.tag is None or self.tag == tag)
+            and (self.element_id is None or self.element_id == element_id)
+            and self.classes <= classes
+        )
+
+
+_CASCADE_ORDER = attrgetter("specificity", "order")
+
+
+class Stylesheet:
+    """The rules of a document's stylesheets, indexed for matching.
+
+    Each rule is filed under its most selective part (its id, else one of its
+    classes, else its tag), so only rules that can possibly match an element
+    are looked at. Computed styles are cached per distinct combination of
+    tag, ``class``, ``style`` and (only when some rule names it) ``id``, so
+    repeated elements cost a single dict lookup.
+
+    Attributes:
+        rules: The rules in stylesheet order.
+    """
+
+    __slots__ = (
+        "_by_class",
+        "_by_id",
+        "_by_tag",
+        "_merged",
+        "_resolved",
+        "_universal",
+        "rules",
+    )
+
+    def __init__(self, rules: Iterable[StyleRule] = ()) -> None:
+        self.rules = tuple(rules)
+        self._by_id: dict[str, list[StyleRule]] = {}
+        self._by_class: dict[str, list[StyleRule]] = {}
+        self._by_tag: dict[str, list[StyleRule]] = {}
+        self._universal: list[StyleRule] = []
+        self._resolved: dict[tuple[str, str | None, str | None, str], InlineStyle] = {}
+        # Elements whose merged declarations are equal share one record.
+        self._merged: dict[tuple[tuple[str, str], ...], InlineStyle] = {}
+        for rule in self.rules:
+            if rule.element_id is not None:
+                bucket = self._by_id.setdefault(rule.element_id, [])
+            elif rule.classes:
+                bucket = self._by_class.setdefault(min(rule.classes), [])
+            elif rule.tag is not None:
+                bucket = self._by_tag.setdefault(rule.tag, [])
+            else:
+                bucket = self._universal
+            bucket.append(rule)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def match(self, tag: str, attrs: Mapping[str, str]) -> tuple[StyleRule, ...]:
+        """Return the rules matching an element, lowest priority first.
+
+        Args:
+            tag: The element's tag name.
+            attrs: The element's attributes.
+
+        Returns:
+            Matching rules ordered by specificity, then stylesheet order.
+        """
+        tag = tag.lower()
+        classes = parse_class_attribute(attrs.get("class")).tokens
+        element_id = attrs.get("id")
+        candidates = list(self._universal)
+        if element_id:
+            candidates.extend(self._by_id.get(element_id, ()))
+        for name in classes:
+            candidates.extend(self._by_class.get(name, ()))
+        candidates.extend(self._by_tag.get(tag, ()))
+        matched = [rule for rule in candidates if rule.matches(tag, classes, element_id)]
+        matched.sort(key=_CASCADE_ORDER)
+        return tuple(matched)
+
+    def resolve(self, tag: str, attrs: Mapping[str, str]) -> InlineStyle:
+        """Return an element's computed style.
+
+        Declarations of matching rules are applied in cascade order, and the
+        element's ``style`` attribute is applied last.
+
+        Args:
+            tag: The element's tag name.
+            attrs: The element's attributes.
+
+        Returns:
+            The computed style; the parsed ``style`` attribute alone when no
+            rule matches.
+        """
+        inline = attrs.get("style", "")
+        element_id = attrs.get("id")
+        # Unique ids would defeat the cache; ids no rule names cannot matter.
+        key = (tag, attrs.get("class"), element_id if element_id in self._by_id else None, inline)
+        style = self._resolved.get(key)
+        if style is None:
+            style = self._resolved[key] = self._compute(tag, attrs, inline)
+        return style
+
+    def _compute(self, tag: str, attrs: Mapping[str, str], inline: str) -> InlineStyle:
+        rules = self.match(tag, attrs)
+        if not rules:
+            return parse_inline_style(inline)
+        declarations: dict[str, str] = {}
+        for rule in rules:
+            declarations.update(rule.declarations)
+        declarations.update(parse_inline_style(inline).declarations)
+        key = tuple(declarations.items())
+        style = self._merged.get(key)
+        if style is None:
+            style = self._merged[key] = _build_style(declarations)
+        return style
+
+
+def parse_stylesheet(css: str, *, base: Iterable[StyleRule] = ()) -> Stylesheet:
+    """Parse the text of one or more ``<style>`` blocks.
+
+    Args:
+        css: Stylesheet source.
+        base: Rules placed before those parsed from ``css``, which win ties
+            against them.
+
+    Returns:
+        The indexed stylesheet; unsupported selectors and at-rules are
+        skipped.
+    """
+    rules = list(base)
+    for selectors, body in _iter_rule_blocks(css):
+        declarations = MappingProxyType(
+            {
+                prop: _IMPORTANT_RE.sub("", value)
+                for prop, value in _parse_declarations(body).items()
+            }
+        )
+        if not declarations:
+            continue
+        for selector in selectors.split(","):
+            rule = _compile_selector(selector.strip(), declarations, len(rules))
+            if rule is not None:
+                rules.append(rule)
+    return Stylesheet(rules)
+
+
+def _iter_rule_blocks(css: str) -> Iterator[tuple[str, str]]:
+    """Yield ``(selector list, declaration block)`` for each top-level rule."""
+    css = _COMMENT_RE.sub("", css)
+    depth = 0
+    start = 0
+    prelude = ""
+    for match in _BRACE_RE.finditer(css):
+        if match.group() == "{":
+            if depth == 0:
+                prelude = css[start : match.start()]
+                start = match.end()
+            depth += 1
+        elif depth:
+            depth -= 1
+            if depth == 0:
+                # Statements such as @import end with ';' before the selector;
+                # block at-rules (@media, @font-face) are skipped whole.
+                selectors = prelude.rsplit(";", 1)[-1].strip()
+                if not selectors.startswith("@"):
+                    yield selectors, css[start : match.start()]
+                start = match.end()
+
+
+def _compile_selector(
+    selector: str, declarations: Mapping[str, str], order: int
+) -> StyleRule | None:
+    match = _SELECTOR_RE.fullmatch(selector)
+    if not selector or match is None:
+        return None
+    tag_part, rest = match.groups()
+    tag = None if tag_part in (None, "*") else tag_part.lower()
+    classes: set[str] = set()
+    element_id: str | None = None
+    for kind, name in _SELECTOR_PART_RE.findall(rest):
+        if kind == ".":
+            classes.add(sys.intern(name))
+        elif element_id in (None, name):
+            element_id = name
+        else:
+            return None  # An element has a single id
+    return StyleRule(
+        tag=tag,
+        classes=frozenset(classes),
+        element_id=element_id,
+        declarations=declarations,
+        specificity=(int(element_id is not None), len(classes), int(tag is not None)),
+        order=order,
+    )
@@ -0,0 +1,46 @@
+import tracemalloc
+
+from html2latex.ast import HtmlDocument, HtmlElement, HtmlText
+from html2latex.pipeline import stream_convert
+
+_PARAGRAPHS = 10_000
+_PARAGRAPH_BYTES = 10_000
+_WORDS = "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+
+
+def _paragraph_text(index: int) -> str:
+    # A fresh string per paragraph, each a different window of the word
+    # cycle, so neither the input nor any cache can share paragraph text.
+    offset = index % len(_WORDS)
+    cycle = _WORDS * (_PARAGRAPH_BYTES // len(_WORDS) + 2)
+    return f"{index} {cycle[offset : offset + _PARAGRAPH_BYTES]}"
+
+
+def _large_document() -> HtmlDocument:
+    # ~100 MB of distinct paragraph text.
+    return HtmlDocument(
+        children=tuple(
+            HtmlElement(tag="p", children=(HtmlText(text=_paragraph_text(index)),))
+            for index in range(_PARAGRAPHS)
+        )
+    )
+
+
+def test_stream_convert_memory_is_bounded_on_100mb_input():
+    document = _large_document()
+    input_bytes = sum(len(block.children[0].text) for block in document.children)
+    assert input_bytes > _PARAGRAPHS * _PARAGRAPH_BYTES
+    # Tracing starts after the input is built, so the peak counts only what
+    # the conversion allocates.
+    tracemalloc.start()
+    try:
+        total = 0
+        for chunk in stream_convert(document):
+            total += len(chunk)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert total > input_bytes
+    # Peak memory tracks one paragraph plus per-block bookkeeping, not the
+    # input or the output.
+    assert peak < input_bytes // 20
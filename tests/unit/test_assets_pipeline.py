@@ -0,0 +1,80 @@
+import base64
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from html2latex.adapters import parse_html
+from html2latex.ast import HtmlElement
+from html2latex.diagnostics import diagnostic_context
+from html2latex.pipeline import assets, extract_assets
+
+PNG = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 4
+PNG_URI = "data:image/png;base64," + base64.b64encode(PNG).decode()
+
+
+def _document(html: str):
+    document, _ = parse_html(html)
+    return document
+
+
+def _images(document) -> list[HtmlElement]:
+    stack, found = list(document.children), []
+    while stack:
+        node = stack.pop(0)
+        if isinstance(node, HtmlElement):
+            if node.tag == "img":
+                found.append(node)
+            stack.extend(node.children)
+    return found
+
+
+def test_extract_assets_writes_each_image_once(tmp_path):
+    first = _document(f'<p>Intro</p><p><b><img src="{PNG_URI}"></b></p><p>End</p>')
+    second = _document(f'<img src="{PNG_URI}"><img src="/static/a.png">')
+    rewritten = extract_assets((first, second), tmp_path / "img", workers=2)
+    (path,) = (tmp_path / "img").iterdir()
+    assert path.suffix == ".png"
+    assert path.read_bytes() == PNG
+    assert [image.attrs["src"] for document in rewritten for image in _images(document)] == [
+        path.as_posix(),
+        path.as_posix(),
+        "/static/a.png",
+    ]
+    # Only the path to the image is rebuilt
+    assert rewritten[0].children[0] is first.children[0]
+    assert rewritten[0].children[2] is first.children[2]
+
+
+def test_extract_assets_decodes_in_chunks_across_whitespace(tmp_path, monkeypatch):
+    monkeypatch.setattr(assets, "_CHUNK_CHARS", 7)
+    encoded = base64.b64encode(PNG).decode()
+    wrapped = "\n".join(encoded[i : i + 76] for i in range(0, len(encoded), 76))
+    svg = "data:image/svg+xml,%3Csvg%2F%3E"
+    documents = (_document(f'<img src="data:image/png;base64,{wrapped}"><img src="{svg}">'),)
+    with ThreadPoolExecutor(2) as pool:
+        (rewritten,) = extract_assets(documents, tmp_path, executor=pool)
+    png, svg_path = (image.attrs["src"] for image in _images(rewritten))
+    assert Path(png).read_bytes() == PNG
+    assert svg_path.endswith(".svg")
+    assert Path(svg_path).read_bytes() == b"<svg/>"
+    # Re-extracting finds the existing files and leaves no temporary files
+    extract_assets(documents, tmp_path)
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_extract_assets_drops_malformed_uris(tmp_path):
+    bad = ("data:image/png;base64,abc!", "data:image/png;base64,abcde", "data:nocomma")
+    html = "".join(f'<img src="{uri}" alt="alt{i}">' for i, uri in enumerate(bad))
+    html += '<img src="data:application/x-thing;base64,AAAA">'
+    with diagnostic_context(enabled=True) as events:
+        (rewritten,) = extract_assets((_document(html),), tmp_path)
+    images = _images(rewritten)
+    assert [image.attrs for image in images[:3]] == [{"alt": f"alt{i}"} for i in range(3)]
+    assert images[3].attrs["src"].endswith(".bin")
+    assert [event.code for event in events] == ["invalid-data-uri"] * 3
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_extract_assets_without_data_uris_returns_documents(tmp_path):
+    document = _document('<img src="a.png">')
+    assert extract_assets([document], tmp_path / "unused")[0] is document
+    assert not (tmp_path / "unused").exists()
@@ -1,28 +1,41 @@
 from html2latex.ast import HtmlDocument, HtmlElement, HtmlText
-from html2latex.latex import LatexCommand, LatexEnvironment, LatexRaw, LatexText
-from html2latex.pipeline import convert_document
+from html2latex.latex import (
+    LatexCommand,
+    LatexEnvironment,
+    LatexMultiColumn,
+    LatexMultiRow,
+    LatexRaw,
+    LatexTableCell,
+    LatexTableRow,
+    LatexTabular,
+    LatexText,
+    serialize_nodes,
+)
+from html2latex.pipeline import (
+    ConversionContext,
+    ConversionState,
+    convert_document,
+    convert_nodes,
+    default_handlers,
+)
 from html2latex.pipeline.convert import (
     _apply_inline_styles,
+    _build_table_grid,
     _column_spec_for,
     _convert_node,
     _extract_column_hints,
-    _inline_style_commands,
+    _extract_text,
     _parse_css_length,
+    _SubtreeMemo,
 )
+from html2latex.styles import parse_inline_style
 
+_STATE = ConversionState(handlers=default_handlers())
+_CONTEXT = ConversionContext(state=_STATE)
 
-def _column_spec(env: LatexEnvironment) -> str:
-    if not env.args:
-        return ""
-    group = env.args[0]
-    if not group.children:
-        return ""
-    child = group.children[0]
-    if isinstance(child, LatexRaw):
-        return child.value
-    if isinstance(child, LatexText):
-        return child.text
-    return ""
+
+def _row_text(row: LatexTableRow) -> str:
+    return "".join(serialize_nodes([row]))
 
 
 def test_convert_paragraph_and_inline():
@@ -66,7 +79,7 @@ def test_extract_column_hints_from_colgroup_span():
             HtmlElement(tag="colgroup", attrs={"span": "2", "align": "center", "width": "10px"}),
         ),
     )
-    hints = _extract_column_hints(table)
+    hints = _extract_column_hints(table, _STATE)
     assert len(hints) == 2
     assert hints[0].align == "c"
     assert hints[0].width == _parse_css_length("10px")
@@ -77,7 +90,7 @@ def test_extract_column_hints_from_col():
         tag="table",
         children=(HtmlElement(tag="col", attrs={"align": "right", "span": "2"}),),
     )
-    hints = _extract_column_hints(table)
+    hints = _extract_column_hints(table, _STATE)
     assert len(hints) == 2
     assert hints[0].align == "r"
 
@@ -326,17 +339,17 @@ def test_convert_span_style_multiple_decorations():
 
 
 def test_inline_style_commands_ignores_empty_entries():
-    assert _inline_style_commands("font-weight:; : bold;") == ()
+    assert parse_inline_style("font-weight:; : bold;").wrappers == ()
 
 
 def test_apply_inline_styles_ignores_empty_nodes():
     node = HtmlElement(tag="span", attrs={"style": "font-style: italic"})
-    assert _apply_inline_styles(node, []) == []
+    assert _apply_inline_styles(node, [], _CONTEXT) == []
 
 
 def test_apply_inline_styles_skips_block_tags():
     node = HtmlElement(tag="p", attrs={"style": "font-style: italic"})
-    result = _apply_inline_styles(node, [LatexText(text="Block")])
+    result = _apply_inline_styles(node, [LatexText(text="Block")], _CONTEXT)
     assert result[0].text == "Block"
 
 
@@ -372,6 +385,32 @@ def test_convert_preformatted_block():
     assert env.children[0].value == "line1\nline2"
 
 
+def _nested_text(depth: int) -> HtmlElement:
+    node = HtmlElement(tag="span", children=(HtmlText(text=f"{depth}"),))
+    for level in reversed(range(depth)):
+        node = HtmlElement(
+            tag="span", children=(HtmlText(text=f"{level}<"), node, HtmlText(text=">"))
+        )
+    return HtmlElement(tag="pre", children=(node,))
+
+
+def test_extract_text_keeps_document_order():
+    assert _extract_text(_nested_text(2)) == "0<1<2>>"
+    doc = HtmlDocument(children=(_nested_text(3),))
+    assert convert_document(doc).body[0].children[0].value == "0<1<2<3>>>"
+
+
+def test_extract_text_handles_deep_nesting_and_limit():
+    deep = _nested_text(5_000)
+    text = _extract_text(deep)
+    assert text.startswith("0<1<2<")
+    assert text.endswith("4999<5000" + ">" * 5_000)
+    assert _extract_text(deep, limit=5) == "0<1<2"
+    assert _extract_text(deep, limit=10_000_000) == text
+    # The subtree memo walks the same tree without recursing either.
+    assert convert_document(HtmlDocument(children=(deep,))).body[0].children[0].value == text
+
+
 def test_convert_inline_math_tex():
     doc = HtmlDocument(
         children=(
@@ -466,12 +505,11 @@ def test_convert_table_basic():
     )
     latex = convert_document(doc)
     env = latex.body[0]
-    assert isinstance(env, LatexEnvironment)
+    assert isinstance(env, LatexTabular)
     assert env.name == "tabular"
-    assert _column_spec(env) == "ll"
-    assert isinstance(env.children[0], LatexRaw)
-    assert env.children[0].value == "A & B \\\\"
-    assert env.children[1].value == "C & D \\\\"
+    assert env.column_spec == "ll"
+    assert _row_text(env.rows[0]) == "A & B \\\\"
+    assert _row_text(env.rows[1]) == "C & D \\\\"
 
 
 def test_convert_table_with_colspan_and_headers():
@@ -504,9 +542,9 @@ def test_convert_table_with_colspan_and_headers():
     )
     latex = convert_document(doc)
     env = latex.body[0]
-    assert _column_spec(env) == "lll"
-    assert env.children[0].value == "\\textbf{Head} & \\textbf{Right} & \\\\"
-    assert env.children[1].value == "\\multicolumn{2}{l}{Wide} & Tail \\\\"
+    assert env.column_spec == "lll"
+    assert _row_text(env.rows[0]) == "\\textbf{Head} & \\textbf{Right} & \\\\"
+    assert _row_text(env.rows[1]) == "\\multicolumn{2}{l}{Wide} & Tail \\\\"
 
 
 def test_convert_table_skips_non_rows():
@@ -545,8 +583,8 @@ def test_convert_table_with_invalid_colspan_defaults_to_one():
     )
     latex = convert_document(doc)
     env = latex.body[0]
-    assert _column_spec(env) == "ll"
-    assert env.children[0].value == "A & B \\\\"
+    assert env.column_spec == "ll"
+    assert _row_text(env.rows[0]) == "A & B \\\\"
 
 
 def test_convert_table_caption_skips_non_element_children():
@@ -608,7 +646,7 @@ def test_convert_table_cell_alignment():
     latex = convert_document(doc)
     env = latex.body[0]
     # Column spec should be 'cr' (center, right)
-    assert _column_spec(env) == "cr"
+    assert env.column_spec == "cr"
 
 
 def test_convert_table_cell_alignment_via_style():
@@ -635,7 +673,7 @@ def test_convert_table_cell_alignment_via_style():
     latex = convert_document(doc)
     env = latex.body[0]
     # Column spec should be 'r' (right)
-    assert _column_spec(env) == "r"
+    assert env.column_spec == "r"
 
 
 def test_convert_table_colspan_uses_cell_alignment():
@@ -669,31 +707,128 @@ def test_convert_table_colspan_uses_cell_alignment():
     latex = convert_document(doc)
     env = latex.body[0]
     # First row should have centered multicolumn
-    assert "\\multicolumn{2}{c}{Wide}" in env.children[0].value
+    assert "\\multicolumn{2}{c}{Wide}" in _row_text(env.rows[0])
 
 
 def test_convert_table_alignment_detection_handles_extra_cells():
     """Test that alignment detection handles rows with extra cells gracefully.
 
-    This tests the edge case where a row has more cells than max_columns.
+    This tests the edge case where a rowspan pushes a row's last cell past the
+    last column: the overflowing cell is neither placed nor counted.
     """
-    from html2latex.pipeline.convert import _detect_column_alignments
+    row1 = HtmlElement(
+        tag="tr",
+        children=(
+            HtmlElement(tag="td", attrs={"align": "center", "rowspan": "2"}, children=()),
+            HtmlElement(tag="td", attrs={"align": "right"}, children=()),
+        ),
+    )
+    row2 = HtmlElement(
+        tag="tr",
+        children=(
+            HtmlElement(tag="td", attrs={"align": "right"}, children=()),
+            HtmlElement(tag="td", attrs={"align": "left"}, children=()),  # Extra cell
+        ),
+    )
+    grid = _build_table_grid([row1, row2], _STATE.style_of)
+    assert grid.columns == 2
+    assert grid.layout == ((0, 1), (-1, 2))
+    assert grid.alignments == "cr"
+
+
+def _cell(tag: str = "td", **attrs: str) -> HtmlElement:
+    return HtmlElement(tag=tag, attrs=attrs, children=(HtmlText(text="x"),))
 
-    # Create a list of cells where the last row has more cells than expected
-    row1 = [HtmlElement(tag="td", attrs={"align": "center"}, children=())]
-    row2 = [
-        HtmlElement(tag="td", attrs={"align": "right"}, children=()),
-        HtmlElement(tag="td", attrs={"align": "left"}, children=()),  # Extra cell
+
+def test_table_grid_places_rowspans_and_pads_short_rows():
+    rows = [
+        HtmlElement(tag="tr", children=(_cell(rowspan="2", colspan="2"), _cell())),
+        HtmlElement(tag="tr", children=(_cell(align="right"),)),
+        HtmlElement(tag="tr", children=(_cell(),)),
+    ]
+    grid = _build_table_grid(rows, _STATE.style_of)
+    assert grid.columns == 3
+    assert list(grid.colspans) == [2, 1, 1, 1]
+    assert list(grid.rowspans) == [2, 1, 1, 1]
+    assert grid.aligns == "llrl"
+    assert grid.layout == ((0, 1), (-1, -1, 2), (3, -1, -1))
+    # Column 2 has one 'l' and one 'r' cell; ties prefer 'l'.
+    assert grid.alignments == "lll"
+
+
+def test_table_grid_counts_alignment_at_placed_column():
+    rows = [
+        HtmlElement(tag="tr", children=(_cell(rowspan="3"), _cell(align="right"))),
+        HtmlElement(tag="tr", children=(_cell(align="right"),)),
+        HtmlElement(tag="tr", children=(_cell(style="text-align: center"),)),
     ]
-    # max_columns = 1, but row2 has 2 cells - this triggers the break
-    alignments = _detect_column_alignments([row1, row2], 1)
-    # Only the first column is considered here; with counts l:0, c:1, r:1 the
-    # implementation correctly selects 'c' for this column.
-    assert alignments == ["c"]
+    grid = _build_table_grid(rows, _STATE.style_of)
+    assert grid.alignments == "lr"
+
+
+def test_table_grid_without_cells_is_none():
+    assert _build_table_grid([HtmlElement(tag="tr", children=())], _STATE.style_of) is None
+
+
+def test_convert_table_rowspan_with_colspan_wraps_multirow_in_multicolumn():
+    table = HtmlElement(
+        tag="table",
+        children=(
+            HtmlElement(tag="tr", children=(_cell(rowspan="2", colspan="2", align="center"),)),
+            HtmlElement(tag="tr", children=()),
+        ),
+    )
+    env = convert_document(HtmlDocument(children=(table,))).body[0]
+    assert env.rows[0] == LatexTableRow(
+        cells=(
+            LatexTableCell(
+                children=(
+                    LatexMultiColumn(
+                        span=2,
+                        align="c",
+                        children=(LatexMultiRow(span=2, children=(LatexText(text="x"),)),),
+                    ),
+                ),
+            ),
+        )
+    )
+    assert env.rows[1] == LatexTableRow(cells=(LatexTableCell(), LatexTableCell()))
+    assert _row_text(env.rows[0]) == "\\multicolumn{2}{c}{\\multirow{2}{*}{x}} \\\\"
+    assert _row_text(env.rows[1]) == " & \\\\"
 
 
 def test_convert_node_ignores_unknown_type():
-    assert _convert_node(object()) == []
+    context = ConversionContext(state=ConversionState(handlers=default_handlers()))
+    assert _convert_node(object(), context) == []
+
+
+def test_conversion_context_derivation_shares_state():
+    state = ConversionState(handlers=default_handlers())
+    root = ConversionContext(state=state)
+    quoted = root.nested_quote().nested_quote()
+    assert (quoted.list_level, quoted.quote_level) == (0, 2)
+    item = quoted.nested_list()
+    assert (item.list_level, item.quote_level) == (1, 0)
+    assert quoted.block() == ConversionContext(state=state)
+    assert root.block() is root
+    assert item.state is state
+
+
+def test_handlers_receive_nesting_context():
+    seen: list[tuple[int, int]] = []
+
+    def marker(node, context):
+        seen.append((context.list_level, context.quote_level))
+        return []
+
+    handlers = default_handlers()
+    handlers["kbd"] = marker
+    kbd = HtmlElement(tag="kbd")
+    item = HtmlElement(tag="li", children=(HtmlElement(tag="q", children=(kbd,)),))
+    inner = HtmlElement(tag="ul", children=(item,))
+    outer = HtmlElement(tag="ul", children=(HtmlElement(tag="li", children=(inner,)),))
+    convert_document(HtmlDocument(children=(outer,)), handlers=handlers)
+    assert seen == [(2, 1)]
 
 
 def test_convert_empty_figure():
@@ -847,3 +982,190 @@ def test_convert_big_tag():
     assert latex.body[0].value == r"{\large "
     assert latex.body[1].text == "large"
     assert latex.body[2].value == "}"
+
+
+def test_default_handlers_returns_independent_copy():
+    handlers = default_handlers()
+    assert "table" in handlers
+    assert "p" in handlers
+    handlers.pop("table")
+    assert "table" in default_handlers()
+
+
+def test_convert_document_uses_custom_handlers():
+    def aside_handler(node, context):
+        children = convert_nodes(node.children, context)
+        return [LatexEnvironment(name="quote", children=children)]
+
+    handlers = {**default_handlers(), "aside": aside_handler}
+    doc = HtmlDocument(
+        children=(
+            HtmlElement(
+                tag="ASIDE",
+                children=(HtmlElement(tag="strong", children=(HtmlText(text="Note"),)),),
+            ),
+        )
+    )
+    latex = convert_document(doc, handlers=handlers)
+    assert latex.body[0].name == "quote"
+    assert latex.body[0].children[0].name == "textbf"
+    # Custom handlers are scoped to the call
+    assert convert_document(doc).body[0].name == "textbf"
+
+
+def test_convert_document_unknown_tag_uses_generic_handler():
+    doc = HtmlDocument(children=(HtmlElement(tag="widget", children=(HtmlText(text="x"),)),))
+    latex = convert_document(doc, handlers={})
+    assert latex.body[0].text == "x"
+
+
+def _disclaimer():
+    return HtmlElement(
+        tag="p",
+        attrs={"class": "disclaimer"},
+        children=(
+            HtmlElement(tag="strong", children=(HtmlText(text="Note:"),)),
+            HtmlText(text=" terms apply"),
+        ),
+    )
+
+
+def test_convert_document_shares_nodes_for_identical_subtrees():
+    doc = HtmlDocument(children=(_disclaimer(), _disclaimer()))
+    latex = convert_document(doc)
+    assert len(latex.body) == 6
+    assert latex.body[0] is latex.body[3]
+    assert latex.body[2] is latex.body[5]
+
+
+def test_convert_document_memo_respects_quote_level():
+    inner = HtmlElement(tag="q", children=(HtmlText(text="x"),))
+    doc = HtmlDocument(
+        children=(
+            HtmlElement(tag="q", children=(inner,)),
+            HtmlElement(tag="q", children=(HtmlText(text="x"),)),
+        )
+    )
+    latex = convert_document(doc)
+    values = [node.value for node in latex.body if isinstance(node, LatexRaw)]
+    assert values == ["``", "`", "'", "''", "``", "''"]
+
+
+def test_convert_document_memo_distinguishes_attributes():
+    doc = HtmlDocument(
+        children=(
+            HtmlElement(tag="span", attrs={"style": "font-weight: bold"}, children=()),
+            HtmlElement(tag="a", attrs={"href": "a"}, children=(HtmlText(text="x"),)),
+            HtmlElement(tag="a", attrs={"href": "b"}, children=(HtmlText(text="x"),)),
+        )
+    )
+    latex = convert_document(doc)
+    assert [node.args[0].children[0].text for node in latex.body] == ["a", "b"]
+
+
+def test_subtree_memo_skips_unique_and_unknown_nodes():
+    sentinel = object()
+    assert _SubtreeMemo.build((sentinel, sentinel, HtmlElement(tag="p"))) is None
+    memo = _SubtreeMemo.build((HtmlElement(tag="p"), HtmlElement(tag="p"), sentinel))
+    assert memo is not None
+    assert len(memo.shape_ids) == 2
+
+
+def test_constant_nodes_are_shared_across_elements():
+    def paragraph(text: str) -> HtmlElement:
+        return HtmlElement(
+            tag="p",
+            children=(
+                HtmlText(text=text),
+                HtmlElement(tag="br"),
+                HtmlText(text=" "),
+                HtmlElement(tag="mark", children=(HtmlText(text=text),)),
+            ),
+        )
+
+    first, second = (
+        convert_document(HtmlDocument(children=(paragraph(text),))).body for text in "ab"
+    )
+    # text, \newline, space, \colorbox, \par
+    for index in (1, 2, 4):
+        assert first[index] is second[index]
+    assert first[3].args[0] is second[3].args[0]
+    assert first[3] is not second[3]
+
+
+def test_convert_paragraph_indent_uses_leftskip_unless_aligned():
+    def paragraph(style: str) -> HtmlElement:
+        return HtmlElement(tag="p", attrs={"style": style}, children=(HtmlText(text="x"),))
+
+    doc = HtmlDocument(
+        children=(
+            paragraph("padding-left: 40px"),
+            paragraph("margin-left: 2em"),
+            paragraph("margin-left: 2em; text-align: right"),
+            paragraph("padding-left: auto"),
+        )
+    )
+    assert "".join(serialize_nodes(convert_document(doc).body)) == (
+        "{\\leftskip=30.1125pt x\\par }{\\leftskip=2em x\\par }"
+        "\\begin{flushright}x\\end{flushright}x\\par "
+    )
+
+
+def _link(fragment: str, text: str = "") -> HtmlElement:
+    children = (HtmlText(text=text),) if text else ()
+    return HtmlElement(tag="a", attrs={"href": f"#{fragment}"}, children=children)
+
+
+def test_internal_links_resolve_to_labels():
+    heading = HtmlElement(tag="h2", attrs={"id": "sec 2"}, children=(HtmlText(text="Two"),))
+    figure = HtmlElement(
+        tag="figure",
+        attrs={"id": "fig"},
+        children=(
+            HtmlElement(tag="img", attrs={"src": "a.png"}),
+            HtmlElement(tag="figcaption", children=(HtmlText(text="Cap"),)),
+        ),
+    )
+    doc = HtmlDocument(
+        children=(
+            HtmlElement(
+                tag="p",
+                children=(_link("sec 2", "see"), _link("fig"), _link("gone", "lost"), _link("")),
+            ),
+            heading,
+            figure,
+            HtmlElement(tag="a", attrs={"name": "end"}),
+            HtmlElement(tag="p", attrs={"id": "unlinked"}, children=(_link("end", "back"),)),
+        )
+    )
+    latex = convert_document(doc)
+    assert "".join(serialize_nodes(latex.body)) == (
+        "\\hyperref[sec-2]{see}\\ref{fig}lost\\par "
+        "\\subsection{Two}\\label{sec-2}"
+        "\\begin{figure}\\centering \\includegraphics{a.png}\\caption{Cap}\\label{fig}\\end{figure}"
+        "\\label{end}\\hyperref[end]{back}\\par "
+    )
+
+
+def test_internal_link_label_follows_table_caption():
+    table = HtmlElement(
+        tag="table",
+        attrs={"id": "t"},
+        children=(
+            HtmlElement(tag="caption", children=(HtmlText(text="Data"),)),
+            HtmlElement(
+                tag="tr", children=(HtmlElement(tag="td", children=(HtmlText(text="x"),)),)
+            ),
+        ),
+    )
+    body = convert_document(HtmlDocument(children=(table, _link("t", "T")))).body
+    environment = body[0]
+    assert [getattr(node, "name", None) for node in environment.children[:2]] == [
+        "caption",
+        "label",
+    ]
+
+
+def test_internal_links_without_targets_skip_anchor_index():
+    doc = HtmlDocument(children=(HtmlElement(tag="p", attrs={"id": "x"}), _link("y", "y")))
+    assert "".join(serialize_nodes(convert_document(doc).body)) == "\\par y"
@@ -0,0 +1,92 @@
+import os
+import struct
+
+import pytest
+
+from html2latex import Converter, ConvertOptions
+from html2latex.pipeline import clear_image_cache, probe_image_size
+from html2latex.pipeline.images import _probe
+
+
+def _png(width: int, height: int) -> bytes:
+    header = struct.pack(">II", width, height) + b"\x08\x06\x00\x00\x00"
+    return b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR" + header + b"\x00" * 100
+
+
+def _jpeg(width: int, height: int, prefix: bytes = b"") -> bytes:
+    app0 = b"\xff\xe0\x00\x10JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00"
+    frame = b"\xff\xc2\x00\x11\x08" + struct.pack(">HH", height, width) + b"\x03" + b"\x00" * 9
+    return b"\xff\xd8" + prefix + app0 + frame + b"\xff\xda" + b"\x00" * 100
+
+
+@pytest.mark.parametrize(
+    ("data", "expected"),
+    [
+        (_png(640, 480), (640, 480)),
+        (b"GIF89a" + struct.pack("<HH", 32, 16) + b"\x00" * 20, (32, 16)),
+        (b"GIF87a\x01\x00", None),
+        (_jpeg(1920, 1080), (1920, 1080)),
+        (_jpeg(800, 600, prefix=b"\xff\xff\xff\xd0"), (800, 600)),
+        (b"\xff\xd8\xff\xda\x00\x02", None),
+        (b"\xff\xd8\x00", None),
+        (b"\xff\xd8\xff", None),
+        (b"\xff\xd8\xff\xe0\x00", None),
+        (_png(0, 10), None),
+        (b"%PDF-1.7", None),
+    ],
+)
+def test_probe_image_size(tmp_path, data, expected):
+    path = tmp_path / "image"
+    path.write_bytes(data)
+    assert probe_image_size(path) == expected
+
+
+def test_probe_image_size_caches_by_mtime_and_size(tmp_path):
+    clear_image_cache()
+    path = tmp_path / "a.png"
+    path.write_bytes(_png(10, 20))
+    assert probe_image_size(path) == (10, 20)
+    assert probe_image_size(str(path)) == (10, 20)
+    assert _probe.cache_info().hits == 1
+    path.write_bytes(_png(30, 40))
+    os.utime(path, ns=(0, 0))
+    assert probe_image_size(path) == (30, 40)
+    assert probe_image_size(tmp_path / "missing.png") is None
+    assert probe_image_size(tmp_path) is None
+
+
+def test_converter_sizes_local_images(tmp_path):
+    (tmp_path / "img").mkdir()
+    (tmp_path / "img" / "photo 1.png").write_bytes(_png(4000, 3000))
+    html = (
+        '<img src="img/photo%201.png?v=2">'
+        '<img src="img/photo%201.png" width="100">'
+        '<img src="https://example.com/img/photo%201.png">'
+        '<img src="img/missing.png">'
+    )
+    body = Converter(ConvertOptions(image_root=str(tmp_path))).convert(html).body
+    assert (
+        "\\includegraphics[width=\\linewidth,height=2258.4375pt,keepaspectratio]{img/photo%201.png?v=2}"
+        in body.replace("\\%", "%")
+    )
+    assert "\\includegraphics[width=100px]{img/photo%201.png}" in body.replace("\\%", "%")
+    assert "\\includegraphics{https://example.com/img/photo%201.png}" in body.replace("\\%", "%")
+    assert "\\includegraphics{img/missing.png}" in body
+    assert "keepaspectratio" not in Converter().convert(html).body
+
+
+def test_converter_only_probes_images_inside_image_root(tmp_path):
+    root = tmp_path / "site"
+    (root / "img").mkdir(parents=True)
+    (root / "img" / "inside.png").write_bytes(_png(10, 20))
+    secret = tmp_path / "secret.png"
+    secret.write_bytes(_png(30, 40))
+    (root / "img" / "link.png").symlink_to(secret)
+    html = "".join(
+        f'<img src="{src}">'
+        for src in ("img/../img/inside.png", "../secret.png", secret.as_posix(), "img/link.png")
+    )
+    body = Converter(ConvertOptions(image_root=str(root / "img" / ".."))).convert(html).body
+    assert "height=15.0562pt" in body
+    assert "height=30.1125pt" not in body
+    assert body.count("keepaspectratio") == 1
@@ -0,0 +1,87 @@
+from html2latex.ast import HtmlDocument, HtmlElement, HtmlText
+from html2latex.latex import infer_packages, serialize_document
+from html2latex.pipeline import convert_document, convert_incremental, default_handlers
+
+
+def _paragraph(text: str, **attrs: str) -> HtmlElement:
+    return HtmlElement(tag="p", attrs=attrs, children=(HtmlText(text=text),))
+
+
+def _document(*blocks) -> HtmlDocument:
+    return HtmlDocument(children=tuple(blocks))
+
+
+def _body(blocks, *, formatted=False) -> str:
+    body = "".join(block.latex for block in blocks)
+    return body.rstrip() if formatted else body
+
+
+def test_convert_incremental_matches_full_conversion():
+    doc = _document(
+        HtmlElement(tag="style", children=(HtmlText(text=".x { color: red }"),)),
+        HtmlElement(tag="h2", attrs={"id": "top"}, children=(HtmlText(text="Title"),)),
+        HtmlElement(
+            tag="p",
+            children=(
+                HtmlElement(tag="span", attrs={"class": "x"}, children=(HtmlText(text="red"),)),
+            ),
+        ),
+        HtmlText(text="loose text"),
+        HtmlElement(
+            tag="ul",
+            children=(
+                HtmlElement(
+                    tag="li",
+                    children=(
+                        HtmlElement(
+                            tag="a", attrs={"href": "#top"}, children=(HtmlText(text="up"),)
+                        ),
+                    ),
+                ),
+            ),
+        ),
+        HtmlElement(tag="pre", children=(HtmlText(text="code\n  block"),)),
+    )
+    full = convert_document(doc)
+    for formatted in (False, True):
+        blocks = convert_incremental(doc, formatted=formatted)
+        assert len(blocks) == len(doc.children)
+        assert _body(blocks, formatted=formatted) == serialize_document(full, formatted=formatted)
+    packages = set().union(*(block.packages for block in blocks))
+    assert packages == infer_packages(full) == {"hyperref", "xcolor"}
+
+
+def test_convert_incremental_converts_only_changed_blocks():
+    blocks = [_paragraph(f"paragraph {index}") for index in range(5)]
+    first = convert_incremental(_document(*blocks))
+
+    blocks[2] = _paragraph("edited")
+    blocks.insert(0, _paragraph("paragraph 4"))
+    second = convert_incremental(_document(*blocks), first)
+    assert second[0] is first[4]
+    assert second[1:3] == first[:2]
+    assert second[3] not in first
+    assert second[4:] == first[3:]
+    assert _body(second) == serialize_document(convert_document(_document(*blocks)))
+
+
+def test_convert_incremental_converts_identical_new_blocks_once():
+    blocks = convert_incremental(_document(_paragraph("same"), _paragraph("same")))
+    assert blocks[0] is blocks[1]
+
+
+def test_convert_incremental_reconverts_when_document_state_changes():
+    link = HtmlElement(tag="a", attrs={"href": "#t"}, children=(HtmlText(text="go"),))
+    target = HtmlElement(tag="h2", attrs={"id": "t"}, children=(HtmlText(text="T"),))
+    first = convert_incremental(_document(target))
+    assert first[0].latex == "\\subsection{T}"
+
+    # Linking to the heading changes its output, so nothing is reused
+    second = convert_incremental(_document(target, _paragraph("x"), link), first)
+    assert second[0].latex == "\\subsection{T}\\label{t}"
+    style = HtmlElement(tag="style", children=(HtmlText(text="p { color: red }"),))
+    third = convert_incremental(_document(target, _paragraph("x"), link, style), second)
+    assert not set(third) & set(second)
+    assert convert_incremental(_document(target), first, formatted=True)[0] is not first[0]
+    handlers = default_handlers()
+    assert convert_incremental(_document(target), first, handlers=handlers)[0] is not first[0]
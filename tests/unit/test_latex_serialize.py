@@ -1,14 +1,24 @@
+import pytest
+
 from html2latex.latex import (
+    TRANSLITERATIONS,
     LatexCommand,
     LatexDocumentAst,
     LatexEnvironment,
     LatexGroup,
+    LatexMultiColumn,
+    LatexMultiRow,
     LatexRaw,
+    LatexTableCell,
+    LatexTableRow,
+    LatexTabular,
     LatexText,
     infer_packages,
     serialize_document,
+    serialize_nodes,
+    stream_tabular,
 )
-from html2latex.latex.serialize import _group_text, _serialize_node
+from html2latex.latex.serialize import _FragmentCache, _group_text, _serialize_node
 
 
 def test_serialize_text_escapes_special_chars():
@@ -94,3 +104,224 @@ def test_infer_packages_array_from_tabular_spec():
 def test_group_text_supports_latextext():
     group = LatexGroup(children=(LatexText(text=r">{\centering\arraybackslash}p{1cm}"),))
     assert _group_text(group) == r">{\centering\arraybackslash}p{1cm}"
+
+
+def test_fragment_cache_stores_only_repeated_node_objects():
+    shared_cmd = LatexCommand(name="textbf", args=(LatexGroup(children=(LatexText(text="x"),)),))
+    cache = _FragmentCache()
+    for node in (shared_cmd, LatexCommand(name="par"), shared_cmd, shared_cmd):
+        assert _serialize_node(node, cache) in {"\\textbf{x}", "\\par "}
+    assert cache.fragments == {id(shared_cmd): "\\textbf{x}"}
+
+
+def test_serialize_reuses_fragments_for_shared_nodes():
+    env = LatexEnvironment(name="quote", children=(LatexText(text="A&B"),))
+    doc = LatexDocumentAst(body=(env, env))
+    assert serialize_document(doc) == "\\begin{quote}A\\&B\\end{quote}" * 2
+    formatted = serialize_document(doc, formatted=True)
+    assert formatted.count("A\\&B") == 2
+
+
+def test_serialize_node_without_cache_serializes_groups():
+    group = LatexGroup(children=(LatexText(text="x"),))
+    assert _serialize_node(group) == "{x}"
+    assert _serialize_node(object()) == ""
+
+
+def _spanning_table() -> LatexTabular:
+    link = LatexCommand(
+        name="href",
+        args=(
+            LatexGroup(children=(LatexText(text="u"),)),
+            LatexGroup(children=(LatexText(text="l"),)),
+        ),
+    )
+    return LatexTabular(
+        column_spec=">{\\centering\\arraybackslash}p{1cm}l",
+        rows=(
+            LatexTableRow(
+                cells=(
+                    LatexTableCell(
+                        children=(LatexMultiRow(span=2, children=(LatexText(text="A&B"),)),)
+                    ),
+                    LatexTableCell(children=(LatexText(text="x"), LatexCommand(name="par"))),
+                )
+            ),
+            LatexTableRow(
+                cells=(
+                    LatexTableCell(),
+                    LatexTableCell(children=(link,)),
+                )
+            ),
+            LatexTableRow(
+                cells=(
+                    LatexTableCell(
+                        children=(
+                            LatexMultiColumn(span=2, align="r", children=(LatexText(text="w"),)),
+                        )
+                    ),
+                )
+            ),
+        ),
+    )
+
+
+def test_serialize_tabular_rows_and_spanning_cells():
+    doc = LatexDocumentAst(body=(_spanning_table(),))
+    assert serialize_document(doc) == (
+        "\\begin{tabular}{>{\\centering\\arraybackslash}p{1cm}l}"
+        "\\multirow{2}{*}{A\\&B} & x\\par \\\\"
+        " & \\href{u}{l} \\\\"
+        "\\multicolumn{2}{r}{w} \\\\"
+        "\\end{tabular}"
+    )
+    assert _serialize_node(LatexTableCell(children=(LatexText(text="a_b"),))) == "a\\_b"
+
+
+def test_serialize_tabular_formatted_keeps_rows_on_one_line():
+    table = _spanning_table()
+    quote = LatexEnvironment(name="table", children=(table,))
+    formatted = serialize_document(LatexDocumentAst(body=(quote,)), formatted=True)
+    assert formatted.splitlines() == [
+        "\\begin{table}",
+        "  \\begin{tabular}{>{\\centering\\arraybackslash}p{1cm}l}",
+        "    \\multirow{2}{*}{A\\&B} & x\\par \\\\",
+        "    & \\href{u}{l} \\\\",
+        "    \\multicolumn{2}{r}{w} \\\\",
+        "  \\end{tabular}",
+        "\\end{table}",
+    ]
+
+
+def test_serialize_tabular_nested_in_item_is_indented():
+    env = LatexEnvironment(
+        name="itemize",
+        children=(LatexCommand(name="item"), LatexText(text="A"), _spanning_table()),
+    )
+    formatted = serialize_document(LatexDocumentAst(body=(env,)), formatted=True)
+    assert "\n    \\begin{tabular}" in formatted
+
+
+def test_infer_packages_from_table_nodes():
+    doc = LatexDocumentAst(body=(_spanning_table(),))
+    assert infer_packages(doc) == {"array", "hyperref", "multirow"}
+    plain = LatexTabular(column_spec="l", rows=(LatexTableRow(cells=(LatexTableCell(),)),))
+    assert infer_packages(LatexDocumentAst(body=(plain,))) == set()
+
+
+def _text_row(text: str) -> LatexTableRow:
+    return LatexTableRow(cells=(LatexTableCell(children=(LatexText(text=text),)),))
+
+
+def test_serialize_longtable_head_variants():
+    caption = LatexCommand(name="caption", args=(LatexGroup(children=(LatexText(text="C"),)),))
+    header_only = LatexTabular(
+        column_spec="l", name="longtable", header_rows=(_text_row("H"),), rows=(_text_row("a"),)
+    )
+    assert serialize_document(LatexDocumentAst(body=(header_only,))) == (
+        "\\begin{longtable}{l}H \\\\\\endhead\na \\\\\\end{longtable}"
+    )
+    caption_only = LatexTabular(
+        column_spec="l", name="longtable", caption=caption, rows=(_text_row("a"),)
+    )
+    assert serialize_document(LatexDocumentAst(body=(caption_only,)), formatted=True) == (
+        "\\begin{longtable}{l}\n  \\caption{C} \\\\\n  a \\\\\n\\end{longtable}"
+    )
+    both = LatexTabular(
+        column_spec="l", name="longtable", caption=caption, header_rows=(_text_row("H"),)
+    )
+    assert serialize_document(LatexDocumentAst(body=(both,)), formatted=True).splitlines() == [
+        "\\begin{longtable}{l}",
+        "  \\caption{C} \\\\",
+        "  H \\\\",
+        "  \\endfirsthead",
+        "  H \\\\",
+        "  \\endhead",
+        "\\end{longtable}",
+    ]
+    assert infer_packages(LatexDocumentAst(body=(both,))) == {"longtable"}
+
+
+def test_stream_tabular_consumes_rows_lazily():
+    consumed: list[str] = []
+
+    def rows():
+        for text in ("b", "c"):
+            consumed.append(text)
+            yield _text_row(text)
+
+    chunks = stream_tabular(LatexTabular(column_spec="l", rows=(_text_row("a"),)), rows())
+    assert next(chunks) == "\\begin{tabular}{l}"
+    assert next(chunks) == "a \\\\"
+    assert consumed == []
+    assert list(chunks) == ["b \\\\", "c \\\\", "\\end{tabular}"]
+
+
+@pytest.mark.parametrize("formatted", [True, False])
+def test_serialize_nodes_from_a_generator_of_distinct_nodes(formatted):
+    # Each node is dropped once serialized, so CPython reuses the ids.
+    def nodes():
+        for index in range(2000):
+            yield LatexCommand(
+                name="textbf", args=(LatexGroup(children=(LatexText(text=str(index)),)),)
+            )
+
+    chunks = list(serialize_nodes(nodes(), formatted=formatted))
+    assert chunks == [f"\\textbf{{{index}}}" for index in range(2000)]
+
+
+def test_stream_tabular_formatted_matches_indented_serializer():
+    table = LatexTabular(column_spec="l", rows=(_text_row("a"),))
+    chunks = stream_tabular(table, iter([_text_row("b"), _text_row("c")]), formatted=True)
+    assert next(chunks) == "\\begin{tabular}{l}\n  a \\\\"
+    assert list(chunks) == ["\n  b \\\\", "\n  c \\\\", "\n\\end{tabular}"]
+    whole = LatexTabular(column_spec="l", rows=tuple(_text_row(t) for t in "abc"))
+    assert "".join(
+        stream_tabular(table, iter([_text_row("b"), _text_row("c")]), formatted=True)
+    ) == serialize_document(LatexDocumentAst(body=(whole,)), formatted=True)
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("“Café” \u2013 naïve", "``Caf\\'{e}'' -- na\\\"{\\i}ve"),
+        ("5\u00a0€ & 10\u202f%", "5~\\texteuro{} \\& 10\\,\\%"),
+        ("Łódź, Ærø, straße…", "\\L{}\\'{o}d\\'{z}, \\AE{}r\\o{}, stra\\ss{}e\\ldots{}"),
+        ("ǖ ṩ ĵ", '\\={\\"{u}} \\.{\\d{s}} \\^{\\j}'),
+        ("\u03b1 ≤ β, \u0391", "\\ensuremath{\\alpha} \\ensuremath{\\leq} \\ensuremath{\\beta}, A"),
+        ("soft\u00adhyphen\u200b", "soft\\-hyphen"),
+        ("汉字 ș", "汉字 ș"),
+        ("plain_text", "plain\\_text"),
+    ],
+)
+def test_serialize_ascii_latex_transliterates_text(text, expected):
+    doc = LatexDocumentAst(body=(LatexText(text=text),))
+    assert serialize_document(doc, encoding="ascii-latex") == expected
+    assert serialize_document(doc) == serialize_document(doc, encoding="utf8")
+
+
+def test_serialize_ascii_latex_covers_every_serializer():
+    cell = LatexTableCell(children=(LatexText(text="é"),))
+    table = LatexTabular(column_spec="l", rows=(LatexTableRow(cells=(cell,)),))
+    doc = LatexDocumentAst(
+        body=(
+            LatexCommand(name="textbf", args=(LatexGroup(children=(LatexText(text="—"),)),)),
+            LatexRaw(value="\\(é\\)"),
+            table,
+        )
+    )
+    assert serialize_document(doc, encoding="ascii-latex") == (
+        "\\textbf{---}\\(é\\)\\begin{tabular}{l}\\'{e} \\\\\\end{tabular}"
+    )
+    formatted = serialize_document(doc, formatted=True, encoding="ascii-latex")
+    assert "\\textbf{---}" in formatted
+    assert "\\'{e} \\\\" in formatted
+    assert "".join(stream_tabular(table, iter([table.rows[0]]), encoding="ascii-latex")) == (
+        "\\begin{tabular}{l}\\'{e} \\\\\\'{e} \\\\\\end{tabular}"
+    )
+    assert TRANSLITERATIONS["ñ"] == "\\~{n}"
+
+
+def test_serialize_rejects_unknown_encoding():
+    with pytest.raises(ValueError, match="ascii-latex"):
+        serialize_document(LatexDocumentAst(body=()), encoding="latin1")
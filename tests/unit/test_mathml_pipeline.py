@@ -0,0 +1,212 @@
+import pytest
+
+from html2latex import Converter
+from html2latex.adapters import parse_html
+from html2latex.ast import HtmlElement, HtmlText
+from html2latex.pipeline import clear_mathml_cache, convert_mathml
+from html2latex.pipeline.mathml import _render
+
+
+def _math(markup: str) -> HtmlElement:
+    document, _ = parse_html(f"<p><math>{markup}</math></p>")
+    return document.children[0].children[0]
+
+
+@pytest.mark.parametrize(
+    ("markup", "expected"),
+    [
+        ("<mi>x</mi><mo>+</mo><mn>1</mn>", "x+1"),
+        ("<mi>&alpha;</mi><mi>x</mi>", r"\alpha x"),
+        ("<mi>&alpha;x</mi>", r"\mathrm{\alpha x}"),
+        ("<mi>sin</mi><mi>&theta;</mi>", r"\sin\theta"),
+        ("<mi>speed</mi>", r"\mathrm{speed}"),
+        ('<mi mathvariant="double-struck">R</mi>', r"\mathbb{R}"),
+        ('<mi mathvariant="normal">d</mi><mi>x</mi>', r"\mathrm{d}x"),
+        ("<mi></mi><mo>&InvisibleTimes;</mo>", ""),
+        ("<mo>{</mo><mi>x</mi><mo>&minus;</mo><mn>5%</mn><mo>}</mo>", r"\{x-5\%\}"),
+        ("<mi>x</mi><mo>&le;</mo><mo>&infin;</mo>", r"x\leq\infty"),
+        ("<mtext>if x &gt; 0 &amp;</mtext>", r"\text{if x > 0 \&}"),
+        ("<mtext> </mtext><mtext></mtext>", r"\ "),
+        ("<ms>a_b</ms>", r'\text{"a\_b"}'),
+        ("<mfrac><mn>1</mn><mn>2</mn></mfrac>", r"\frac{1}{2}"),
+        ('<mfrac linethickness="0"><mi>n</mi><mi>k</mi></mfrac>', r"\genfrac{}{}{0pt}{}{n}{k}"),
+        ("<mfrac><mn>1</mn></mfrac>", "1"),
+        ("<msqrt><mi>x</mi><mo>+</mo><mn>1</mn></msqrt>", r"\sqrt{x+1}"),
+        ("<mroot><mi>x</mi><mn>3</mn></mroot>", r"\sqrt[3]{x}"),
+        ("<mroot><mi>x</mi></mroot>", r"\sqrt{x}"),
+        ("<msup><mi>x</mi><mn>2</mn></msup>", "x^{2}"),
+        ("<msup><mn>10</mn><mn>6</mn></msup>", "{10}^{6}"),
+        ("<msup><mi>f</mi><mo>&prime;</mo></msup>", "f'"),
+        ("<msub><mi>a</mi><mi>i</mi></msub>", "a_{i}"),
+        ("<msubsup><mi>x</mi><mi>i</mi><mn>2</mn></msubsup>", "x_{i}^{2}"),
+        (
+            "<msup><msub><mi>x</mi><mi>i</mi></msub><mn>2</mn></msup>",
+            "{x_{i}}^{2}",
+        ),
+        ("<msub><mi>x</mi></msub><msup></msup><msubsup></msubsup>", "x"),
+        (
+            (
+                "<munderover><mo>&sum;</mo><mrow><mi>i</mi><mo>=</mo><mn>1</mn></mrow>"
+                "<mi>n</mi></munderover>"
+            ),
+            r"\sum_{i=1}^{n}",
+        ),
+        (
+            "<munder><mi>lim</mi><mrow><mi>x</mi><mo>&rarr;</mo><mn>0</mn></mrow></munder>",
+            r"\lim_{x\to0}",
+        ),
+        ("<mover><mo>&int;</mo><mi>b</mi></mover>", r"\int^{b}"),
+        ("<mover><mi>v</mi><mo>&rarr;</mo></mover>", r"\vec{v}"),
+        ("<mover><mi>x</mi><mo>&macr;</mo></mover>", r"\overline{x}"),
+        ("<mover><mi>x</mi><mi>a</mi></mover>", r"\overset{a}{x}"),
+        ("<munder><mi>x</mi><mo>&#x23DF;</mo></munder>", r"\underbrace{x}"),
+        ("<munder><mi>x</mi><mi>a</mi></munder>", r"\underset{a}{x}"),
+        (
+            "<munderover><mi>x</mi><mi>a</mi><mi>b</mi></munderover>",
+            r"\overset{b}{\underset{a}{x}}",
+        ),
+        ("<munder><mi>x</mi></munder><mover></mover><munderover></munderover>", "x"),
+        (
+            (
+                "<mmultiscripts><mi>C</mi><mi>i</mi><none/><mprescripts/><mn>14</mn>"
+                "<mn>6</mn></mmultiscripts>"
+            ),
+            "{}_{14}^{6}C_{i}",
+        ),
+        ("<mmultiscripts><mi>R</mi><mi>i</mi><mi>j</mi></mmultiscripts>", "R_{i}^{j}"),
+        ("<mmultiscripts></mmultiscripts>", ""),
+        ("<mfenced><mi>a</mi><mi>b</mi><mi>c</mi></mfenced>", r"\left(a,b,c\right)"),
+        (
+            '<mfenced open="{" close="" separators=";|"><mi>a</mi><mi>b</mi><mi>c</mi></mfenced>',
+            r"\left\{a;b|c\right.",
+        ),
+        ('<mfenced open="[" separators=""><mi>a</mi><mi>b</mi></mfenced>', r"\left[ab\right)"),
+        (
+            (
+                "<mtable><mtr><mtd><mn>1</mn></mtd><mtd><mn>0</mn></mtd></mtr>"
+                "<mtr><mtd><mn>0</mn></mtd><mtd><mn>1</mn></mtd></mtr></mtable>"
+            ),
+            r"\begin{matrix}1 & 0 \\ 0 & 1\end{matrix}",
+        ),
+        (
+            (
+                "<mtable><mlabeledtr><mtd><mtext>(1)</mtext></mtd><mtd><mi>x</mi></mtd></mlabeledtr>"
+                "<mi>y</mi></mtable>"
+            ),
+            r"\begin{matrix}x \\ y\end{matrix}",
+        ),
+        ('<menclose notation="box"><mi>x</mi></menclose>', r"\boxed{x}"),
+        ('<menclose notation="top"><mi>x</mi></menclose>', r"\overline{x}"),
+        ('<menclose notation="bottom"><mi>x</mi></menclose>', r"\underline{x}"),
+        ("<menclose><mi>x</mi></menclose>", "x"),
+        ('<mi>a</mi><mspace width="1em"/><mi>b</mi><mspace/>', r"a\hspace{1em}b\,"),
+        ("<mphantom><mi>x</mi></mphantom>", r"\phantom{x}"),
+        ('<mstyle displaystyle="true"><mi>x</mi></mstyle>', r"{\displaystyle x}"),
+        ('<mstyle mathcolor="red" id="s1"><mi>x</mi></mstyle>', "x"),
+        (
+            (
+                '<semantics><mi>x</mi><annotation encoding="application/x-tex">\\mathcal{X}'
+                "</annotation></semantics>"
+            ),
+            r"\mathcal{X}",
+        ),
+        (
+            (
+                '<semantics><mi>x</mi><annotation encoding="text/plain">X</annotation>'
+                "<annotation-xml><mi>y</mi></annotation-xml></semantics>"
+            ),
+            "x",
+        ),
+        ("<semantics></semantics><maction></maction>", ""),
+        ("<maction><mi>x</mi><mi>y</mi></maction>", "x"),
+        ("<mrow>x<mo>=</mo> </mrow>", "x="),
+        ("<mi><mglyph/>x</mi>", "x"),
+        ("<mi>y</mi><annotation>Y</annotation>", "y"),
+    ],
+)
+def test_convert_mathml(markup, expected):
+    assert convert_mathml(_math(markup)).value == expected
+
+
+@pytest.mark.parametrize(
+    ("markup", "packages"),
+    [
+        ("<mi>x</mi><mo>+</mo><mn>1</mn>", ()),
+        ("<mfrac><mn>1</mn><mn>2</mn></mfrac><mtext>if</mtext>", ("amsmath",)),
+        ("<mi>&Ropf;</mi><mo>&nexist;</mo>", ("amssymb",)),
+        ('<mi mathvariant="fraktur">g</mi><mo>&Int;</mo>', ("amsmath", "amssymb")),
+        ("<mtable><mtr><mtd><mn>1</mn></mtd></mtr></mtable>", ("amsmath",)),
+        ('<menclose notation="box"><mi>x</mi></menclose>', ("amsmath",)),
+        ("<mover><mi>x</mi><mi>a</mi></mover>", ("amsmath",)),
+        (
+            '<semantics><mi>x</mi><annotation encoding="tex">\\binom{n}{k}</annotation></semantics>',
+            ("amsmath",),
+        ),
+        # Kernel commands that share a prefix with package ones
+        ("<mi>&ell;</mi><mtext>a</mtext>", ("amsmath",)),
+    ],
+)
+def test_convert_mathml_reports_packages(markup, packages):
+    assert convert_mathml(_math(markup)).packages == packages
+
+
+@pytest.mark.parametrize(
+    ("width", "expected"),
+    [
+        ("1em", r"\hspace{1em}"),
+        (" 0.5EX ", r"\hspace{0.5ex}"),
+        ("thinmathspace", r"\hspace{0.1667em}"),
+        ("negativeverythinmathspace", r"\hspace{-0.1111em}"),
+        ("-2pt", r"\hspace{-2pt}"),
+        ("24px", r"\hspace{18.0675pt}"),
+        (".5cm", r"\hspace{0.5cm}"),
+        ("0em", ""),
+        ("5", ""),
+        ("10%", ""),
+        ("3mu", ""),
+        ("1em}\\bad{", ""),
+        ("", ""),
+    ],
+)
+def test_mspace_width_becomes_latex_length(width, expected):
+    markup = f'<mi>a</mi><mspace width="{width}"/>'
+    assert convert_mathml(_math(markup)).value == f"a{expected}"
+
+
+def test_convert_mathml_falls_back_for_text_and_deep_nesting():
+    assert convert_mathml(_math("x+1")) is None
+    node = HtmlElement(tag="mi", children=(HtmlText(text="x"),))
+    for _ in range(200):
+        node = HtmlElement(tag="mrow", children=(node,))
+    assert convert_mathml(HtmlElement(tag="math", children=(node,))) is None
+
+
+def test_convert_mathml_shares_repeated_expressions():
+    clear_mathml_cache()
+    formula = "<msup><mi>x</mi><mn>2</mn></msup>"
+    convert_mathml(_math(f"<mfrac>{formula}<mn>2</mn></mfrac>"))
+    misses = _render.cache_info().misses
+    assert convert_mathml(_math(f'<mrow id="other">{formula}</mrow>')).value == "x^{2}"
+    # Only the new <math>/<mrow> wrappers are rendered; x^{2} is reused
+    assert _render.cache_info().misses == misses + 2
+
+
+def test_converter_renders_mathml_with_display_mode():
+    html = (
+        "<p>Let <math><mi>x</mi><mo>=</mo><mfrac><mn>1</mn><mn>2</mn></mfrac></math>.</p>"
+        '<math display="block"><msqrt><mi>x</mi></msqrt></math>'
+        "<p><math>y</math></p>"
+    )
+    body = Converter().convert(html).body
+    assert r"Let \(x=\frac{1}{2}\)." in body
+    assert r"\[\sqrt{x}\]" in body
+    assert r"\(y\)" in body
+
+
+def test_converter_loads_packages_of_mathml():
+    result = Converter().convert(
+        "<p><math><mfrac><mn>1</mn><mn>2</mn></mfrac><mtext>if</mtext><mi>&Ropf;</mi></math></p>"
+    )
+    assert result.body == r"\(\frac{1}{2}\text{if}\mathbb{R}\)\par"
+    assert result.packages == ("amsmath", "amssymb")
+    assert Converter().convert("<p><math><mi>x</mi></math></p>").packages == ()
@@ -1,5 +1,10 @@
+from html2latex import api
+from html2latex.adapters import parse_html
 from html2latex.api import Converter, convert
+from html2latex.ast import HtmlDocument, HtmlElement, HtmlText
+from html2latex.latex import LatexCommand, LatexGroup
 from html2latex.models import ConvertOptions, LatexDocument
+from html2latex.pipeline import convert_nodes, mark_normalized
 from tests.fixtures.harness import get_fixture_case, normalize_fixture_text
 
 
@@ -9,6 +14,15 @@ def test_convert_options_defaults():
     assert options.fragment is True
     assert options.template is None
     assert options.metadata == {}
+    assert options.assume_normalized is False
+    assert options.debug_normalize_sample == 0.0
+    assert options.table_strategy == "tabular"
+    assert options.longtable_threshold == 200
+    assert options.asset_dir is None
+    assert options.image_root is None
+    assert options.output_encoding == "utf8"
+    assert options.workers == 1
+    assert options.class_profiles == ()
 
 
 def test_latex_document_defaults():
@@ -38,3 +52,141 @@ def test_convert_helper_returns_document():
     fixture = get_fixture_case("blocks/paragraph/basic")
     doc = convert(fixture.html)
     assert normalize_fixture_text(doc.body) == normalize_fixture_text(fixture.tex)
+
+
+def test_converter_accepts_parsed_document():
+    fixture = get_fixture_case("blocks/paragraph/basic")
+    document, _ = parse_html(fixture.html)
+    doc = Converter().convert(document)
+    assert normalize_fixture_text(doc.body) == normalize_fixture_text(fixture.tex)
+
+
+def test_converter_skips_normalize_for_flagged_document():
+    # The stray whitespace would be trimmed if the normalize stage ran.
+    document = mark_normalized(
+        HtmlDocument(children=(HtmlElement(tag="p", children=(HtmlText(text=" a "),)),))
+    )
+    doc = Converter(ConvertOptions(formatted=False)).convert(document)
+    assert doc.body == " a \\par "
+
+
+def test_converter_assume_normalized_trusts_html_input():
+    options = ConvertOptions(formatted=False, assume_normalized=True)
+    assert Converter(options).convert("<p> a </p>").body == " a \\par "
+    assert Converter(ConvertOptions(formatted=False)).convert("<p> a </p>").body == "a\\par "
+
+
+def test_converter_debug_sample_validates_trusted_input():
+    options = ConvertOptions(
+        strict=False, formatted=False, assume_normalized=True, debug_normalize_sample=1.0
+    )
+    doc = Converter(options).convert("<p> a </p>")
+    assert doc.body == "a\\par "
+    assert [event.code for event in doc.diagnostics] == ["normalize-not-idempotent"]
+
+
+def test_converter_debug_sample_rate_is_probabilistic(monkeypatch):
+    options = ConvertOptions(formatted=False, assume_normalized=True, debug_normalize_sample=0.5)
+    monkeypatch.setattr(api.random, "random", lambda: 0.9)
+    assert Converter(options).convert("<p> a </p>").body == " a \\par "
+    monkeypatch.setattr(api.random, "random", lambda: 0.1)
+    assert Converter(options).convert("<p> a </p>").body == "a\\par "
+
+
+def _boxed_handler(node, context):
+    children = convert_nodes(node.children, context)
+    return [LatexCommand(name="fbox", args=(LatexGroup(children=children),))]
+
+
+def test_converter_register_handler_adds_tag_mapping():
+    converter = Converter(ConvertOptions(formatted=False))
+    converter.register_handler("KBD", _boxed_handler)
+    assert converter.convert("<kbd>Ctrl</kbd>").body == "\\fbox{Ctrl}"
+    # Other converters keep the built-in mapping
+    assert Converter(ConvertOptions(formatted=False)).convert("<kbd>Ctrl</kbd>").body == (
+        "\\texttt{Ctrl}"
+    )
+
+
+def test_converter_handlers_survive_with_options():
+    converter = Converter(handlers={"kbd": _boxed_handler})
+    updated = converter.with_options(formatted=False)
+    assert updated.convert("<kbd>Ctrl</kbd>").body == "\\fbox{Ctrl}"
+
+
+_SMALL_TABLE = "<table><thead><tr><th>H</th></tr></thead><tr><td>a</td></tr></table>"
+
+
+def test_converter_table_strategy_selects_longtable():
+    tabular = convert(_SMALL_TABLE)
+    assert "\\begin{tabular}" in tabular.body
+    assert "longtable" not in tabular.packages
+
+    longtable = convert(_SMALL_TABLE, options=ConvertOptions(table_strategy="longtable"))
+    assert "\\begin{longtable}" in longtable.body
+    assert "\\endhead" in longtable.body
+    assert "longtable" in longtable.packages
+
+    auto = ConvertOptions(table_strategy="auto", longtable_threshold=2)
+    assert "\\begin{tabular}" in convert(_SMALL_TABLE, options=auto).body
+    auto = ConvertOptions(table_strategy="auto", longtable_threshold=1)
+    assert "\\begin{longtable}" in convert(_SMALL_TABLE, options=auto).body
+
+
+def test_converter_convert_incremental_reuses_unchanged_blocks():
+    converter = Converter()
+    html = '<p>Intro</p><p>See <a href="#end">end</a>.</p><h1 id="end">End</h1>'
+    first = converter.convert_incremental(html)
+    assert first == converter.convert(html)
+    assert len(first.blocks) == 3
+
+    edited = html.replace("Intro", "Introduction")
+    second = converter.convert_incremental(edited, previous=first)
+    assert second.body == converter.convert(edited).body
+    assert second.packages == ("hyperref",)
+    assert second.blocks[0] is not first.blocks[0]
+    assert second.blocks[1:] == first.blocks[1:]
+    # Results of plain conversions carry no blocks to reuse
+    assert converter.convert_incremental(edited, converter.convert(html)) == second
+
+
+def test_converter_convert_split_writes_master_and_parts(tmp_path):
+    html = '<h1>A</h1><p>See <a href="#b">B</a>.</p><h1 id="b">B</h1><p>End</p>'
+    result = Converter().convert_split(html, tmp_path, include_only=["part-002"], master="book")
+    assert result.master == tmp_path / "book.tex"
+    assert [part.name for part in result.parts] == ["part-001", "part-002"]
+    assert result.packages == ("hyperref",)
+    master = result.master.read_text(encoding="utf-8")
+    assert "\\usepackage{hyperref}\n\\includeonly{part-002}" in master
+    assert "\\include{part-001}\n\\include{part-002}" in master
+    assert Converter().convert_split(html, tmp_path).master == tmp_path / "main.tex"
+
+
+def test_converter_convert_split_honors_formatted(tmp_path):
+    html = "<h1>A</h1><ul><li>x</li><li>y</li></ul><table><tr><td>1</td></tr></table>"
+    for formatted in (True, False):
+        converter = Converter(ConvertOptions(formatted=formatted))
+        (part,) = converter.convert_split(html, tmp_path / str(formatted)).parts
+        assert part.path.read_text(encoding="utf-8").rstrip() == converter.convert(html).body
+
+
+def test_converter_extracts_data_uri_images(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    options = ConvertOptions(asset_dir="img")
+    body = Converter(options).convert('<img src="data:image/gif;base64,R0lGODlh">').body
+    (path,) = (tmp_path / "img").iterdir()
+    assert path.read_bytes() == b"GIF89a"
+    assert f"\\includegraphics{{img/{path.name}}}" in body
+
+
+def test_converter_ascii_latex_output_in_every_mode(tmp_path):
+    html = "<p>Caf&eacute; &ndash; 5 &euro;</p><table><tr><td>na&iuml;ve</td></tr></table>"
+    converter = Converter(ConvertOptions(output_encoding="ascii-latex", formatted=False))
+    body = converter.convert(html).body
+    assert "Caf\\'{e} -- 5 \\texteuro{}" in body
+    assert 'na\\"{\\i}ve' in body
+    assert converter.convert_incremental(html).body == body
+    assert converter.with_options(workers=2).convert(html).body == body
+    split = converter.with_options(table_strategy="longtable").convert_split(html, tmp_path)
+    assert 'na\\"{\\i}ve' in split.parts[0].path.read_text(encoding="utf-8")
+    assert "Café" in Converter().convert(html).body
@@ -1,6 +1,19 @@
+from pydantic import TypeAdapter
+
 from html2latex.ast import HtmlDocument, HtmlElement, HtmlText
-from html2latex.pipeline import normalize_document
-from html2latex.pipeline.normalize import _normalize_children, _trim_boundary_breaks
+from html2latex.diagnostics import diagnostic_context
+from html2latex.pipeline import mark_normalized, normalize_document, validate_normalized
+from html2latex.pipeline.normalize import (
+    _BLOCK,
+    _INLINE,
+    _LINE_BREAK,
+    _PRESERVE,
+    _TEXT,
+    _classify_children,
+    _collapse_whitespace,
+    _normalize_children,
+    _trim_boundary_breaks,
+)
 
 
 def test_normalize_merges_text_and_collapses_whitespace():
@@ -136,7 +149,7 @@ def test_normalize_trims_boundary_breaks_in_blocks():
 
 
 def test_trim_boundary_breaks_empty_children():
-    assert _trim_boundary_breaks(()) == ()
+    assert _trim_boundary_breaks((), []) == ()
 
 
 def test_normalize_preserves_whitespace_in_inline_context():
@@ -156,3 +169,141 @@ def test_normalize_preserves_whitespace_in_inline_context():
     # The whitespace between <b> and <i> should be preserved
     assert len(normalized_span.children) == 3
     assert normalized_span.children[1].text == " "
+
+
+def test_normalize_reuses_already_normalized_nodes():
+    text = HtmlText(text="Hello world")
+    paragraph = HtmlElement(tag="p", children=(text,))
+    normalized = normalize_document(HtmlDocument(children=(paragraph,)))
+    assert normalized.children[0] is paragraph
+    assert normalized.children[0].children[0] is text
+
+
+def test_normalize_rebuilds_nodes_that_need_collapsing():
+    text = HtmlText(text="Hello \n  world")
+    paragraph = HtmlElement(tag="p", children=(text,))
+    normalized = normalize_document(HtmlDocument(children=(paragraph,)))
+    assert normalized.children[0] is not paragraph
+    assert normalized.children[0].children[0].text == "Hello world"
+
+
+def test_normalize_reuses_text_when_trim_is_noop():
+    text = HtmlText(text="Hello ")
+    emphasis = HtmlElement(tag="em", children=(HtmlText(text="world"),))
+    paragraph = HtmlElement(tag="p", children=(text, emphasis))
+    normalized = normalize_document(HtmlDocument(children=(paragraph,)))
+    assert normalized.children[0].children[0] is text
+
+
+def test_normalize_collapses_across_sibling_text_run():
+    paragraph = HtmlElement(
+        tag="p",
+        children=(HtmlText(text="Hello "), HtmlText(text="  "), HtmlText(text=" world")),
+    )
+    normalized = normalize_document(HtmlDocument(children=(paragraph,)))
+    assert [child.text for child in normalized.children[0].children] == ["Hello world"]
+
+
+def test_collapse_whitespace_fast_path_returns_same_object():
+    text = "already normalized text"
+    assert _collapse_whitespace(text) is text
+    assert _collapse_whitespace("tab\there") == "tab here"
+    assert _collapse_whitespace("non\u00a0breaking") == "non breaking"
+
+
+def test_classify_children_computes_flags_once_per_sibling():
+    children = (
+        HtmlText(text="a"),
+        HtmlElement(tag="P"),
+        HtmlElement(tag="span"),
+        HtmlElement(tag="BR"),
+        HtmlElement(tag="pre"),
+        object(),
+    )
+    kinds = _classify_children(children, {"pre"})
+    assert kinds[0] & _TEXT
+    assert kinds[1] & _BLOCK
+    assert not kinds[1] & _INLINE
+    assert kinds[2] & _INLINE
+    assert kinds[3] & _INLINE
+    assert kinds[3] & _LINE_BREAK
+    assert kinds[4] & _BLOCK
+    assert kinds[4] & _PRESERVE
+    assert kinds[5] == 0
+
+
+def test_trim_boundary_breaks_returns_same_tuple_when_unchanged():
+    children = (HtmlText(text="a"), HtmlElement(tag="br"), HtmlText(text="b"))
+    kinds = _classify_children(children, set())
+    assert _trim_boundary_breaks(children, kinds) is children
+
+
+def test_normalize_drops_whitespace_between_inline_and_block():
+    paragraph = HtmlElement(
+        tag="div",
+        children=(
+            HtmlElement(tag="span", children=(HtmlText(text="a"),)),
+            HtmlText(text="\n  "),
+            HtmlElement(tag="p", children=(HtmlText(text="b"),)),
+        ),
+    )
+    normalized = normalize_document(HtmlDocument(children=(paragraph,)))
+    assert [child.tag for child in normalized.children[0].children] == ["span", "p"]
+
+
+def test_normalize_shares_single_space_node_between_inline_elements():
+    paragraph = HtmlElement(
+        tag="p",
+        children=(
+            HtmlElement(tag="b", children=(HtmlText(text="a"),)),
+            HtmlText(text="\n  "),
+            HtmlElement(tag="i", children=(HtmlText(text="b"),)),
+            HtmlText(text="\t"),
+            HtmlElement(tag="u", children=(HtmlText(text="c"),)),
+        ),
+    )
+    normalized = normalize_document(HtmlDocument(children=(paragraph,)))
+    children = normalized.children[0].children
+    assert children[1].text == " "
+    assert children[1] is children[3]
+
+
+def test_normalize_document_flags_result_as_normalized():
+    doc = HtmlDocument(children=(HtmlText(text="Hi"),))
+    assert doc.normalized is False
+    assert normalize_document(doc).normalized is True
+
+
+def test_mark_normalized_flags_without_rewriting():
+    text = HtmlText(text="  untouched  ")
+    doc = HtmlDocument(children=(text,), doctype="html")
+    marked = mark_normalized(doc)
+    assert marked.normalized is True
+    assert marked.children[0] is text
+    assert marked.doctype == "html"
+    assert mark_normalized(marked) is marked
+
+
+def test_normalized_flag_survives_serialization_round_trip():
+    adapter = TypeAdapter(HtmlDocument)
+    doc = normalize_document(
+        HtmlDocument(children=(HtmlElement(tag="p", children=(HtmlText(text="Hi"),)),))
+    )
+    restored = adapter.validate_json(adapter.dump_json(doc))
+    assert restored == doc
+    assert restored.normalized is True
+
+
+def test_validate_normalized_accepts_fixed_point():
+    doc = normalize_document(HtmlDocument(children=(HtmlText(text="a  b"),)))
+    with diagnostic_context(enabled=True) as events:
+        assert validate_normalized(doc) is doc
+    assert events == []
+
+
+def test_validate_normalized_reports_and_repairs_untrue_flag():
+    doc = mark_normalized(HtmlDocument(children=(HtmlText(text=" a  b "),)))
+    with diagnostic_context(enabled=True) as events:
+        repaired = validate_normalized(doc)
+    assert repaired.children[0].text == "a b"
+    assert [event.code for event in events] == ["normalize-not-idempotent"]
@@ -0,0 +1,97 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from html2latex import Converter, ConvertOptions
+from html2latex.ast import HtmlDocument, HtmlElement, HtmlText
+from html2latex.latex import infer_packages, serialize_document
+from html2latex.pipeline import (
+    convert_document,
+    convert_parallel,
+    default_handlers,
+    partition_blocks,
+)
+
+
+def _paragraph(text: str) -> HtmlElement:
+    return HtmlElement(tag="p", children=(HtmlText(text=text),))
+
+
+def _report(blocks: int) -> HtmlDocument:
+    children = []
+    for index in range(blocks):
+        children.append(HtmlElement(tag="h2", children=(HtmlText(text=f"Part {index}"),)))
+        children.append(_paragraph("x" * 40_000 + f" {index}"))
+        link = HtmlElement(tag="a", attrs={"href": "https://example.com"}, children=())
+        children.append(
+            HtmlElement(tag="ul", children=(HtmlElement(tag="li", children=(link,)),)),
+        )
+    return HtmlDocument(children=tuple(children))
+
+
+def test_partition_blocks_balances_sizes_in_order():
+    blocks = tuple(_paragraph("x" * size) for size in (10, 10, 10, 10, 40, 10, 10))
+    chunks = partition_blocks(blocks, 3)
+    assert [block for chunk in chunks for block in chunk] == list(blocks)
+    assert [len(chunk) for chunk in chunks] == [3, 2, 2]
+
+
+def test_partition_blocks_respects_minimum_weight():
+    blocks = tuple(_paragraph("x") for _ in range(10))
+    assert partition_blocks(blocks, 4, min_weight=1_000) == [blocks]
+    assert partition_blocks((), 4) == []
+
+
+def test_partition_blocks_keeps_huge_block_whole():
+    blocks = (_paragraph("x" * 1_000), _paragraph("y"), _paragraph("z"))
+    chunks = partition_blocks(blocks, 3)
+    assert chunks == [blocks[:1], blocks[1:]]
+
+
+def test_convert_parallel_matches_serial_output():
+    doc = _report(8)
+    latex = convert_document(doc)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        for formatted in (False, True):
+            body, packages = convert_parallel(doc, formatted=formatted, workers=2, executor=pool)
+            assert body == serialize_document(latex, formatted=formatted)
+            assert packages == infer_packages(latex) == {"hyperref"}
+
+
+def test_convert_parallel_small_document_runs_inline():
+    doc = HtmlDocument(children=(_paragraph("hi"),))
+    handlers = default_handlers()
+    assert convert_parallel(doc, handlers=handlers, workers=4) == ("hi\\par ", set())
+
+
+def test_converter_workers_use_process_pool():
+    html = "".join(f"<p>{'x' * 40_000} {index}</p>" for index in range(8))
+    serial = Converter(ConvertOptions(formatted=False)).convert(html)
+    parallel = Converter(ConvertOptions(formatted=False, workers=2)).convert(html)
+    assert parallel.body == serial.body
+    assert parallel.packages == serial.packages
+
+
+def test_convert_parallel_applies_stylesheet_to_every_chunk():
+    style = HtmlElement(tag="style", children=(HtmlText(text=".b { font-weight: 700 }"),))
+    bold = HtmlElement(tag="span", attrs={"class": "b"}, children=(HtmlText(text="end"),))
+    doc = HtmlDocument(
+        children=(style, *_report(8).children, HtmlElement(tag="p", children=(bold,)))
+    )
+    latex = convert_document(doc)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        body, _ = convert_parallel(doc, workers=2, executor=pool)
+    assert body == serialize_document(latex)
+    assert body.endswith("\\textbf{end}\\par ")
+
+
+def test_convert_parallel_resolves_links_across_chunks():
+    target = HtmlElement(tag="h1", attrs={"id": "end"}, children=(HtmlText(text="End"),))
+    link = HtmlElement(tag="a", attrs={"href": "#end"}, children=(HtmlText(text="to end"),))
+    doc = HtmlDocument(
+        children=(HtmlElement(tag="p", children=(link,)), *_report(8).children, target)
+    )
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        body, packages = convert_parallel(doc, workers=2, executor=pool)
+    assert packages == {"hyperref"}
+    assert body == serialize_document(convert_document(doc))
+    assert body.startswith("\\hyperref[end]{to end}")
+    assert body.endswith("\\section{End}\\label{end}")
@@ -8,6 +8,7 @@ def test_public_api_exports():
     assert "Converter" in exported
     assert "ConvertOptions" in exported
     assert "LatexDocument" in exported
+    assert "SplitDocument" in exported
     assert "html2latex" in exported
     assert "render" in exported
 
@@ -0,0 +1,51 @@
+import pytest
+
+from html2latex.adapters import parse_html
+from html2latex.pipeline import normalize_document, stream_convert, write_parts
+
+
+def _document(html: str):
+    document, _ = parse_html(html)
+    return normalize_document(document)
+
+
+def test_write_parts_splits_at_top_level_headings(tmp_path):
+    doc = _document(
+        '<style>.x{}</style><h1 id="a">A</h1><p>See <a href="#b">B</a>.</p>'
+        '<h2>A.1</h2><p>Text</p><h1 id="b">B</h1><p>End</p>'
+    )
+    parts = write_parts(doc, tmp_path / "out")
+    assert [part.name for part in parts] == ["part-001", "part-002"]
+    assert [part.path for part in parts] == [tmp_path / "out" / f"part-00{i}.tex" for i in (1, 2)]
+    texts = [part.path.read_text(encoding="utf-8") for part in parts]
+    assert texts[0].startswith("\\section{A}\\label{a}")
+    assert "\\hyperref[b]{B}" in texts[0]
+    assert "\\subsection{A.1}" in texts[0]
+    assert texts[1].startswith("\\section{B}\\label{b}")
+    assert "".join(text[:-1] for text in texts) == "".join(stream_convert(doc))
+    assert parts[0].packages == {"hyperref"}
+    assert parts[1].packages == frozenset()
+
+
+def test_write_parts_level_and_front_matter(tmp_path):
+    doc = _document("<p>Preface</p><h1>A</h1><h2>A.1</h2><h3>A.1.1</h3>")
+    parts = write_parts(doc, tmp_path, level=2, prefix="chapter")
+    assert [part.name for part in parts] == ["chapter-001", "chapter-002", "chapter-003"]
+    assert parts[0].path.read_text(encoding="utf-8").startswith("Preface")
+    assert "\\subsubsection{A.1.1}" in parts[2].path.read_text(encoding="utf-8")
+    assert write_parts(_document("<style>p{}</style>"), tmp_path / "empty") == ()
+
+
+def test_write_parts_collects_streamed_longtable_packages(tmp_path):
+    rows = "".join(f"<tr><td>r{i}</td></tr>" for i in range(3))
+    doc = _document(
+        f'<h1>T</h1><table><tr><td><a href="https://example.com">x</a></td></tr>{rows}</table>'
+    )
+    (part,) = write_parts(doc, tmp_path, longtable_threshold=0)
+    assert part.packages == {"longtable", "hyperref"}
+    assert "\\begin{longtable}" in part.path.read_text(encoding="utf-8")
+
+
+def test_write_parts_rejects_bad_level(tmp_path):
+    with pytest.raises(ValueError, match="between 1 and 6"):
+        write_parts(_document("<h1>A</h1>"), tmp_path, level=7)
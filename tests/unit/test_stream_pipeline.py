@@ -1,6 +1,8 @@
 from html2latex.ast import HtmlDocument, HtmlElement, HtmlText
-from html2latex.latex import serialize_document
-from html2latex.pipeline import convert_document, stream_convert
+from html2latex.latex import LatexText, serialize_document, serialize_fragment
+from html2latex.pipeline import convert, convert_document, default_handlers, stream_convert
+from html2latex.pipeline.convert import _render_cell_content
+from html2latex.styles import QUILL_PROFILE
 
 
 def test_stream_convert_matches_serialized_output():
@@ -8,3 +10,160 @@ def test_stream_convert_matches_serialized_output():
     chunks = list(stream_convert(doc))
     assert "".join(chunks) == serialize_document(convert_document(doc))
     assert len(chunks) >= 2
+
+
+def _row(tag: str, text: str) -> HtmlElement:
+    return HtmlElement(tag="tr", children=(HtmlElement(tag=tag, children=(HtmlText(text=text),)),))
+
+
+def _long_table_document(rows: int) -> HtmlDocument:
+    table = HtmlElement(
+        tag="table",
+        children=(
+            HtmlText(text=" "),
+            HtmlElement(tag="caption", children=(HtmlText(text="Data"),)),
+            HtmlElement(tag="thead", children=(_row("th", "Head"),)),
+            HtmlElement(tag="tbody", children=tuple(_row("td", f"r{i}") for i in range(rows))),
+        ),
+    )
+    paragraph = HtmlElement(tag="p", children=(HtmlText(text="After"),))
+    return HtmlDocument(children=(table, paragraph))
+
+
+def test_stream_convert_emits_longtable_one_row_per_chunk():
+    doc = _long_table_document(5)
+    chunks = list(stream_convert(doc, longtable_threshold=3))
+    expected = serialize_document(convert_document(doc, longtable_threshold=3))
+    assert "".join(chunks) == expected
+    assert chunks[0] == (
+        "\\begin{longtable}{l}\\caption{Data} \\\\"
+        "\\textbf{Head} \\\\\\endfirsthead\n\\textbf{Head} \\\\\\endhead\n"
+    )
+    assert chunks[1:6] == [f"r{i} \\\\" for i in range(5)]
+    assert chunks[6] == "\\end{longtable}"
+
+
+def test_stream_convert_formatted_matches_formatted_serialization():
+    items = tuple(HtmlElement(tag="li", children=(HtmlText(text=t),)) for t in "ab")
+    doc = HtmlDocument(
+        children=(*_long_table_document(3).children, HtmlElement(tag="ul", children=items))
+    )
+    chunks = list(stream_convert(doc, longtable_threshold=0, formatted=True))
+    body = convert_document(doc, longtable_threshold=0).body
+    assert "".join(chunks) == serialize_fragment(body, formatted=True)
+    assert chunks[1:4] == [f"\n  r{i} \\\\" for i in range(3)]
+    assert chunks[4] == "\n\\end{longtable}"
+
+
+def test_stream_convert_converts_longtable_rows_lazily(monkeypatch):
+    converted: list[str] = []
+    original = _render_cell_content
+
+    def spy(cell, context):
+        converted.append(cell.children[0].text)
+        return original(cell, context)
+
+    monkeypatch.setattr(convert, "_render_cell_content", spy)
+    chunks = stream_convert(_long_table_document(1000), longtable_threshold=0)
+    next(chunks)
+    next(chunks)
+    # Header plus the first body row only; the remaining rows are untouched.
+    assert converted == ["Head", "r0"]
+
+
+def _table_marker_handler(node, context):
+    return [LatexText(text=f"{node.tag}:{context.list_level}:{context.quote_level}")]
+
+
+def test_stream_convert_keeps_short_and_custom_tables_whole():
+    doc = _long_table_document(2)
+    chunks = list(stream_convert(doc, longtable_threshold=10))
+    assert chunks[0].startswith("\\begin{table}")
+    assert "".join(chunks) == serialize_document(convert_document(doc))
+    assert list(stream_convert(doc)) == chunks
+
+    handlers = default_handlers()
+    handlers["table"] = _table_marker_handler
+    chunks = list(stream_convert(doc, handlers=handlers, longtable_threshold=0))
+    assert chunks[0] == "table:0:0"
+
+
+def test_stream_convert_skips_math_and_empty_tables():
+    math = HtmlElement(tag="table", attrs={"data-math": "x"}, children=())
+    doc = HtmlDocument(children=(HtmlText(text="a"), math, HtmlElement(tag="table")))
+    chunks = list(stream_convert(doc, longtable_threshold=0))
+    assert "".join(chunks) == serialize_document(convert_document(doc, longtable_threshold=0))
+
+
+def test_stream_convert_yields_each_block_before_visiting_the_next():
+    visited: list[str] = []
+    handlers = default_handlers()
+    paragraph = handlers["p"]
+
+    def spy(node, context):
+        visited.append(node.children[0].text)
+        return paragraph(node, context)
+
+    handlers["p"] = spy
+    doc = HtmlDocument(
+        children=tuple(
+            HtmlElement(tag="p", children=(HtmlText(text=f"p{index}"),)) for index in range(100)
+        )
+    )
+    chunks = stream_convert(doc, handlers=handlers)
+    assert next(chunks) == "p0"
+    assert visited == ["p0"]
+
+
+def test_stream_convert_reuses_repeated_blocks():
+    def block(text: str) -> HtmlElement:
+        return HtmlElement(
+            tag="p", children=(HtmlElement(tag="b", children=(HtmlText(text=text),)),)
+        )
+
+    visited: list[str] = []
+    handlers = default_handlers()
+    bold = handlers["b"]
+
+    def spy(node, context):
+        visited.append(node.children[0].text)
+        return bold(node, context)
+
+    handlers["b"] = spy
+    doc = HtmlDocument(children=(block("x"), block("y"), block("x"), block("x")))
+    chunks = list(stream_convert(doc, handlers=handlers))
+    # The first copy is converted before the repeat is known; later ones share.
+    assert visited == ["x", "y", "x"]
+    assert "".join(chunks) == serialize_document(convert_document(doc))
+
+
+def test_stream_convert_applies_class_profiles():
+    para = HtmlElement(tag="p", attrs={"class": "ql-align-right"}, children=(HtmlText(text="x"),))
+    doc = HtmlDocument(children=(para,))
+    chunks = list(stream_convert(doc, class_profiles=(QUILL_PROFILE,)))
+    assert "".join(chunks) == serialize_document(
+        convert_document(doc, class_profiles=(QUILL_PROFILE,))
+    )
+    assert "flushright" in "".join(chunks)
+
+
+def test_stream_convert_longtable_rows_do_not_share_fragments_by_id():
+    # Lazily built rows are freed after serialization; later rows often reuse
+    # their ids, which must not return an earlier row's text.
+    doc = _long_table_document(200)
+    chunks = list(stream_convert(doc, longtable_threshold=3))
+    assert chunks[1:201] == [f"r{i} \\\\" for i in range(200)]
+
+
+def test_stream_convert_labels_every_anchor():
+    # Streaming cannot look ahead, so all ids get labels and all #links resolve.
+    link = HtmlElement(tag="a", attrs={"href": "#later"}, children=(HtmlText(text="go"),))
+    target = HtmlElement(tag="p", attrs={"id": "later"}, children=(HtmlText(text="x"),))
+    chunks = list(stream_convert(HtmlDocument(children=(link, target))))
+    assert "".join(chunks) == "\\hyperref[later]{go}\\label{later}x\\par "
+
+
+def test_stream_convert_ascii_latex_encoding():
+    doc = HtmlDocument(children=(HtmlElement(tag="p", children=(HtmlText(text="Café"),)),))
+    chunks = stream_convert(doc, encoding="ascii-latex")
+    assert "".join(chunks) == serialize_document(convert_document(doc), encoding="ascii-latex")
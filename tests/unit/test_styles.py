@@ -0,0 +1,373 @@
+import pytest
+
+from html2latex import Converter, ConvertOptions
+from html2latex.api import convert
+from html2latex.ast import HtmlDocument, HtmlElement, HtmlText
+from html2latex.latex import LatexGroup, LatexText, serialize_document
+from html2latex.pipeline import convert_document
+from html2latex.styles import (
+    CLASS_PROFILES,
+    EMPTY_CLASSES,
+    EMPTY_STYLE,
+    QUILL_PROFILE,
+    ClassProfile,
+    InlineStyle,
+    InlineWrapper,
+    Stylesheet,
+    clear_style_cache,
+    compile_class_profiles,
+    parse_class_attribute,
+    parse_inline_style,
+    parse_stylesheet,
+    style_cache_info,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_style_cache()
+    yield
+    clear_style_cache()
+
+
+def test_parse_inline_style_record():
+    style = parse_inline_style(
+        "Font-Weight: 700; font-style: oblique; text-decoration: underline, line-through;"
+        " TEXT-ALIGN: Center; width: 50% ; height:2em"
+    )
+    assert style.text_align == "center"
+    assert style.width == "50%"
+    assert style.height == "2em"
+    assert [wrapper.command for wrapper in style.wrappers] == [
+        "textbf",
+        "textit",
+        "underline",
+        "sout",
+    ]
+    assert style.declarations["font-weight"] == "700"
+    with pytest.raises(TypeError):
+        style.declarations["color"] = "red"  # type: ignore[index]
+
+
+def test_parse_inline_style_empty_and_plain():
+    assert parse_inline_style("") is EMPTY_STYLE
+    assert parse_inline_style("font-weight: 400; :; color:") == InlineStyle(
+        declarations=parse_inline_style("font-weight: 400").declarations,
+    )
+
+
+def test_style_cache_parses_each_string_once():
+    first = parse_inline_style("font-weight: 700;")
+    for _ in range(9):
+        assert parse_inline_style("font-weight: 700;") is first
+    parse_inline_style("")
+    info = style_cache_info()
+    assert (info.hits, info.misses, info.size) == (9, 1, 1)
+    assert info.max_size > 0
+    assert info.hit_rate == pytest.approx(0.9)
+
+
+def test_style_cache_is_shared_across_conversions():
+    html = '<p><span style="font-style: italic">a</span></p>'
+    convert(html)
+    convert(html)
+    info = style_cache_info()
+    assert info.misses == 1
+    assert info.hits >= 1
+
+
+def test_style_cache_info_hit_rate_when_unused():
+    assert style_cache_info().hit_rate == 0.0
+
+
+def _color_wrapper(command: str, color: str, *options: str) -> InlineWrapper:
+    group = LatexGroup(children=(LatexText(text=color),))
+    return InlineWrapper(command=command, args=(group,), options=options)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("red", _color_wrapper("textcolor", "red")),
+        ("navy", _color_wrapper("textcolor", "000080", "HTML")),
+        ("#0af", _color_wrapper("textcolor", "00AAFF", "HTML")),
+        ("#A0B1C2", _color_wrapper("textcolor", "A0B1C2", "HTML")),
+        ("rgb(10, 300, 0)", _color_wrapper("textcolor", "10,255,0", "RGB")),
+        ("rgba(1,2,3,0.5)", _color_wrapper("textcolor", "1,2,3", "RGB")),
+    ],
+)
+def test_color_compiles_to_textcolor(value, expected):
+    assert parse_inline_style(f"color: {value}").wrappers == (expected,)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "transparent",
+        "inherit",
+        "rgba(1, 2, 3, 0)",
+        "rgba(1, 2, 3, .0)",
+        "#12",
+        "hsl(0, 100%, 50%)",
+        "rgba(0,0,0,.)",
+        "rgba(1,2,3,1.2.3)",
+    ],
+)
+def test_unsupported_colors_are_dropped(value):
+    assert parse_inline_style(f"color: {value}").wrappers == ()
+
+
+def test_convert_ignores_malformed_rgba_alpha():
+    assert convert('<span style="color: rgba(0,0,0,.)">x</span>').body == "x"
+    assert parse_inline_style("color: rgba(1,2,3,.5)").wrappers == (
+        _color_wrapper("textcolor", "1,2,3", "RGB"),
+    )
+
+
+@pytest.mark.parametrize(
+    ("value", "switch"),
+    [
+        ("x-small", "scriptsize"),
+        ("xx-large", "LARGE"),
+        ("10px", "scriptsize"),
+        ("12px", "footnotesize"),
+        ("18px", "large"),
+        ("24pt", "huge"),
+        ("1.5em", "Large"),
+        ("80%", "footnotesize"),
+        ("0.5rem", "tiny"),
+    ],
+)
+def test_font_size_compiles_to_nearest_switch(value, switch):
+    assert parse_inline_style(f"font-size: {value}").wrappers == (
+        InlineWrapper(command=switch, switch=True),
+    )
+
+
+@pytest.mark.parametrize("value", ["medium", "16px", "12pt", "100%", "0px", "calc(1em)"])
+def test_normal_or_unknown_font_size_adds_nothing(value):
+    assert parse_inline_style(f"font-size: {value}").wrappers == ()
+
+
+@pytest.mark.parametrize(
+    ("value", "bold"),
+    [("bold", True), ("bolder", True), ("600", True), ("normal", False), ("lighter", False)],
+)
+def test_font_weight_keywords(value, bold):
+    wrappers = parse_inline_style(f"font-weight: {value}").wrappers
+    assert wrappers == ((InlineWrapper(command="textbf"),) if bold else ())
+
+
+def test_font_family_monospace_and_wrapper_order():
+    style = parse_inline_style(
+        "background-color: yellow; color: red; font-size: large; font-weight: 700;"
+        " font-family: 'Courier New', monospace"
+    )
+    assert [wrapper.command for wrapper in style.wrappers] == [
+        "texttt",
+        "textbf",
+        "large",
+        "textcolor",
+        "colorbox",
+    ]
+    assert parse_inline_style("font-family: Arial, sans-serif").wrappers == ()
+    assert parse_inline_style("font-style: normal").wrappers == ()
+
+
+def test_convert_applies_compiled_wrappers():
+    result = convert(
+        '<span style="font-family: monospace; font-size: small; color: #f00;'
+        ' background-color: yellow">x</span>'
+    )
+    assert result.body == "\\colorbox{yellow}{\\textcolor[HTML]{FF0000}{{\\small \\texttt{x}}}}"
+    assert result.packages == ("xcolor",)
+
+
+def test_parse_class_attribute_tokenizes_once_per_string():
+    parsed = parse_class_attribute("ql-size-large  math-tex ql-size-large")
+    assert parsed.tokens == {"ql-size-large", "math-tex"}
+    assert parsed.math
+    assert not parsed.display_math
+    # Equal raw strings share one cached record and interned tokens.
+    again = parse_class_attribute("ql-size-large  math-tex ql-size-large")
+    assert again is parsed
+    other = parse_class_attribute("ql-size-large")
+    assert next(iter(other.tokens)) is next(t for t in parsed.tokens if t == "ql-size-large")
+
+
+def test_parse_class_attribute_flags_and_empty_values():
+    assert parse_class_attribute(None) is EMPTY_CLASSES
+    assert parse_class_attribute("") is EMPTY_CLASSES
+    assert parse_class_attribute("   ") is EMPTY_CLASSES
+    display = parse_class_attribute("math-display")
+    assert display.math
+    assert display.display_math
+    assert not parse_class_attribute("ql-font-serif").math
+
+
+def test_parse_stylesheet_keeps_simple_selectors():
+    sheet = parse_stylesheet(
+        """
+        <!-- /* comment { p { color: red } */
+        @import url("print.css");
+        @media print { .note { color: blue } }
+        p, .note , span.red#x, * { color: red !important }
+        div p, a:hover, [lang], , p { }
+        #a#b, #a#a { font-style: italic }
+        } stray
+        -->
+        """
+    )
+    selectors = [(rule.tag, set(rule.classes), rule.element_id) for rule in sheet.rules]
+    assert selectors == [
+        ("p", set(), None),
+        (None, {"note"}, None),
+        ("span", {"red"}, "x"),
+        (None, set(), None),
+        (None, set(), "a"),
+    ]
+    assert len(sheet) == 5
+    assert sheet.rules[0].declarations == {"color": "red"}
+    assert [rule.specificity for rule in sheet.rules] == [
+        (0, 0, 1),
+        (0, 1, 0),
+        (1, 1, 1),
+        (0, 0, 0),
+        (1, 0, 0),
+    ]
+
+
+def test_stylesheet_match_uses_cascade_order():
+    sheet = parse_stylesheet(
+        ".b { font-weight: 700 } span { color: red } * { color: blue }"
+        " #x { color: green } span.b.c { color: white } .c { color: black }"
+    )
+    attrs = {"class": "c b", "id": "x"}
+    matched = sheet.match("SPAN", attrs)
+    assert [rule.order for rule in matched] == [2, 1, 0, 5, 4, 3]
+    assert sheet.match("em", {"class": "c"}) == (sheet.rules[2], sheet.rules[5])
+    assert Stylesheet().match("p", {}) == ()
+
+
+def test_stylesheet_resolve_merges_inline_style_last():
+    sheet = parse_stylesheet(".b { font-weight: 700; color: red } p { text-align: center }")
+    style = sheet.resolve("span", {"class": "b", "style": "color: blue; font-style: italic"})
+    assert dict(style.declarations) == {
+        "font-weight": "700",
+        "color": "blue",
+        "font-style": "italic",
+    }
+    assert [w.command for w in style.wrappers] == ["textbf", "textit", "textcolor"]
+    # Elements matching the same rules with the same style share one record.
+    assert sheet.resolve("em", {"class": "b", "style": "color: blue; font-style: italic"}) is style
+    assert sheet.resolve("p", {}).text_align == "center"
+    assert sheet.resolve("td", {"style": "width: 2em"}) is parse_inline_style("width: 2em")
+
+
+def test_convert_applies_document_stylesheet():
+    result = convert(
+        "<style>.c1 { font-weight: 700 } .c2 { text-align: right } em { color: red }"
+        " img.wide { width: 5cm }</style>"
+        '<p class="c2"><span class="c1">Bold</span> <em style="color: blue">x</em></p>'
+        '<table><col class="c2"><tr><td>a</td><td class="c2">b</td></tr></table>'
+        '<img class="wide" src="a.png">'
+    )
+    assert "font-weight" not in result.body
+    assert "\\begin{flushright}" in result.body
+    assert "\\textbf{Bold}" in result.body
+    assert "\\textcolor{blue}{\\textit{x}}" in result.body
+    assert "\\begin{tabular}{rr}" in result.body
+    assert "\\includegraphics[width=5cm]{a.png}" in result.body
+
+
+@pytest.mark.parametrize(
+    ("html", "body"),
+    [
+        (
+            '<p class="note">x <em>y</em></p>',
+            "{\\bfseries \\color{red}x \\textit{y}}\\par",
+        ),
+        (
+            '<div class="quote"><p>a</p><p>b</p></div>',
+            "{\\itshape a\\par\nb\\par\n}\\par",
+        ),
+        (
+            '<p class="mark">a <b>b</b></p>',
+            "{\\large \\underline{a \\textbf{b}}}\\par",
+        ),
+        (
+            '<section class="mark"><p>a</p></section>',
+            "{\\large a\\par\n}",
+        ),
+    ],
+)
+def test_convert_applies_stylesheet_rules_on_block_elements(html, body):
+    result = convert(
+        "<style>p.note { font-weight: 700; color: red } .quote { font-style: italic }"
+        " .mark { text-decoration: underline; font-size: large }</style>" + html
+    )
+    assert result.body == body
+    assert ("xcolor" in result.packages) == ("color" in body)
+
+
+def test_style_reads_dimensions_by_exact_property_name():
+    style = parse_inline_style("max-width: 100%; line-height: 2; border-width: 1px")
+    assert (style.width, style.height, style.text_align) == (None, None, None)
+    style = parse_inline_style("min-height: 1em; height: 3cm; text-align: CENTER !important")
+    assert (style.width, style.height, style.text_align) == (None, "3cm", "center")
+    assert parse_inline_style("text-align: justify").text_align is None
+    sheet = parse_stylesheet("* { line-height: 2 } img { max-width: 100%; border-width: 0 }")
+    style = sheet.resolve("img", {"style": "text-indent: 1em"})
+    assert (style.width, style.height) == (None, None)
+
+
+def test_convert_ignores_size_like_properties_of_rules():
+    for css in ("* { line-height: 2 }", "img { max-width: 100% }"):
+        result = convert(f"<style>{css}</style><p><img src='a.png'></p>")
+        assert "\\includegraphics{a.png}" in result.body
+
+
+def test_convert_ignores_style_without_usable_rules():
+    assert convert("<style>a:hover { color: red }</style><p>x</p>").body == "x\\par"
+
+
+def test_compile_class_profiles_builds_class_lookup_once():
+    profiles = tuple(CLASS_PROFILES.values())
+    rules = compile_class_profiles(profiles)
+    assert compile_class_profiles(profiles) is rules
+    assert compile_class_profiles(()) == ()
+    assert compile_class_profiles((ClassProfile(name="empty", classes={"x": "bogus"}),)) == ()
+    sheet = Stylesheet(rules)
+    assert sheet.match("p", {"class": "ql-align-center unknown"}) == (
+        next(rule for rule in rules if rule.classes == {"ql-align-center"}),
+    )
+    assert sheet.resolve("p", {"class": "ql-indent-2"}).indent == "6em"
+    assert [w.command for w in sheet.resolve("span", {"class": "ql-size-huge"}).wrappers] == [
+        "Huge"
+    ]
+
+
+def test_convert_applies_editor_classes_when_profiles_are_named():
+    html = (
+        '<p class="ql-align-center">A <span class="ql-size-large">big</span></p>'
+        '<p class="ql-indent-1">B <span class="text-big marker-yellow">C</span></p>'
+    )
+    options = ConvertOptions(formatted=False, class_profiles=("quill", "ckeditor"))
+    result = Converter(options).convert(html)
+    assert result.body == (
+        "\\begin{center}A {\\Large big}\\end{center}"
+        "{\\leftskip=3em B \\colorbox[HTML]{FDFD77}{{\\Large C}}\\par }"
+    )
+    # Off by default: classes that merely share an editor's names are ignored.
+    plain = Converter(ConvertOptions(formatted=False)).convert(html)
+    assert plain.body == "A big\\par B C\\par "
+
+
+def test_document_stylesheet_overrides_class_profiles():
+    style = HtmlElement(
+        tag="style", children=(HtmlText(text=".ql-size-large { font-size: 10px }"),)
+    )
+    span = HtmlElement(tag="span", attrs={"class": "ql-size-large"}, children=(HtmlText(text="x"),))
+    doc = HtmlDocument(children=(style, span))
+    latex = convert_document(doc, class_profiles=(QUILL_PROFILE,))
+    assert serialize_document(latex) == "{\\scriptsize x}"